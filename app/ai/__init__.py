@@ -15,11 +15,12 @@ The AI is a financial assistant that NEVER:
 - Bypasses validation gates
 """
 
-from app.ai.graph import create_graph
+from app.ai.graph import create_graph, get_graph
 from app.ai.state import AIGraphState, Intent
 
 __all__ = [
     "create_graph",
+    "get_graph",
     "AIGraphState",
     "Intent",
 ]
@@ -0,0 +1,277 @@
+"""One conversation turn: load state, run the graph, commit.
+
+Shared by the synchronous /ai/message endpoint, the batch endpoint and
+the inbound stream workers, so every path locks, persists and reports a
+turn the same way.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from app.ai.graph import get_graph
+from app.ai.state import AIGraphState, ConfirmationStatus
+from app.ai.timing import timed
+from app.config.settings import get_settings
+from app.infrastructure.providers.llm_resilience import latency_budget
+from app.infrastructure.redis.conversation_lock import (
+    ConversationBusyError,
+    ConversationLease,
+    StaleConversationWriteError,
+)
+from app.infrastructure.redis.conversation_state import (
+    ConversationCommit,
+    ConversationStateStore,
+)
+
+
+@dataclass(frozen=True)
+class MessageTurn:
+    """Outcome of one user message."""
+
+    state: AIGraphState
+    pending_confirmation: dict[str, Any] | None
+    # message_id was already applied: state is as committed, graph not run
+    replayed: bool = False
+
+    @property
+    def requires_confirmation(self) -> bool:
+        return self.pending_confirmation is not None
+
+
+@dataclass(frozen=True)
+class BatchMessage:
+    """One message of a process_messages() batch."""
+
+    tenant_id: str
+    text: str
+    conversation_id: str | None = None
+
+
+# Inbound message ids remembered per conversation (redelivery dedupe)
+RECENT_MESSAGE_IDS = 20
+
+# Placeholder until a batch message's turn has run
+_NOT_RUN = RuntimeError("message was not processed")
+
+
+async def process_message(
+    store: ConversationStateStore,
+    tenant_id: str,
+    text: str,
+    conversation_id: str | None = None,
+    message_id: str | None = None,
+) -> MessageTurn:
+    """Run one message through the AI graph and persist the result.
+
+    Continues conversation_id if its state is still in Redis, otherwise
+    starts a new conversation (under that id, or a fresh one). Runs of
+    the same conversation are serialized by the store's lock.
+
+    message_id (inbound stream) is recorded with the committed state; a
+    redelivered message returns that state as a replayed turn instead of
+    running the graph again.
+
+    Raises:
+        ConversationBusyError: An earlier run held the conversation too long
+        StaleConversationWriteError: The lock expired before the commit
+    """
+    if conversation_id is None:
+        # Nobody else knows this id yet: nothing to lock
+        return await _run_turn(store, None, tenant_id, text, str(uuid4()))
+
+    async with store.conversation_lock(conversation_id) as lease:
+        return await _run_turn(store, lease, tenant_id, text, conversation_id, message_id)
+
+
+async def process_messages(
+    store: ConversationStateStore,
+    messages: Sequence[BatchMessage],
+    concurrency: int = 8,
+) -> list[MessageTurn | Exception]:
+    """Run a batch of messages through the AI graph.
+
+    Locks every named conversation at once, loads their states in one
+    round trip, runs the graphs concurrently (at most `concurrency` at a
+    time; messages of the same conversation in order) and commits the
+    final state of each conversation in one transaction. A conversation
+    still held by another run is left out of the batch; the others are
+    locked again without it.
+
+    Returns:
+        Per message, in order: its turn, or the exception that failed it
+        (ConversationBusyError if its conversation stayed held by another
+        run, StaleConversationWriteError if its commit was fenced off)
+    """
+    # Messages without an id each start their own (unlocked) conversation
+    conversation_ids = [message.conversation_id or str(uuid4()) for message in messages]
+    groups: dict[str, list[int]] = {}
+    for index, conversation_id in enumerate(conversation_ids):
+        groups.setdefault(conversation_id, []).append(index)
+    known = sorted({m.conversation_id for m in messages if m.conversation_id})
+
+    results: list[MessageTurn | Exception] = [_NOT_RUN] * len(messages)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    busy: dict[str, ConversationBusyError] = {}
+
+    async with AsyncExitStack() as stack:
+        # Locks are all-or-nothing: retry without each busy conversation
+        while True:
+            held = [conversation_id for conversation_id in known if conversation_id not in busy]
+            try:
+                leases = await stack.enter_async_context(store.conversation_locks(held))
+                break
+            except ConversationBusyError as e:
+                if e.conversation_id not in held:
+                    raise
+                busy[e.conversation_id] = e
+
+        for conversation_id, error in busy.items():
+            for index in groups.pop(conversation_id):
+                results[index] = error
+
+        states: dict[str, AIGraphState | None] = {}
+        if held:
+            with timed("redis.load_states"):
+                states = await store.load_states(held, leases)
+
+        async def run_group(conversation_id: str, indexes: list[int]) -> MessageTurn | None:
+            state = states.get(conversation_id)
+            last = None
+            async with semaphore:
+                for index in indexes:
+                    message = messages[index]
+                    try:
+                        final_state = await _run_graph(
+                            _next_state(state, conversation_id, message.tenant_id, message.text)
+                        )
+                    except Exception as e:
+                        results[index] = e
+                        continue
+                    state = final_state
+                    last = results[index] = MessageTurn(
+                        state=final_state,
+                        pending_confirmation=_pending_for(final_state, message.tenant_id),
+                    )
+            return last
+
+        lasts = await asyncio.gather(
+            *(run_group(conversation_id, indexes) for conversation_id, indexes in groups.items())
+        )
+
+        # Last turn of each conversation wins; earlier pending
+        # confirmations were superseded within the batch
+        commits = [
+            ConversationCommit(
+                conversation_id=conversation_id,
+                state=turn.state,
+                pending_confirmation=turn.pending_confirmation,
+                clear_confirmation=True,
+                lease=leases.get(conversation_id),
+            )
+            for conversation_id, turn in zip(groups, lasts, strict=True)
+            if turn is not None
+        ]
+        with timed("redis.commit_conversations"):
+            committed = await store.commit_conversations(commits)
+
+    for commit, ok in zip(commits, committed, strict=True):
+        if ok:
+            continue
+        token = commit.lease.token if commit.lease and commit.lease.token else 0
+        for index in groups[commit.conversation_id]:
+            if isinstance(results[index], MessageTurn):
+                results[index] = StaleConversationWriteError(commit.conversation_id, token)
+
+    return results
+
+
+async def _run_turn(
+    store: ConversationStateStore,
+    lease: ConversationLease | None,
+    tenant_id: str,
+    text: str,
+    conversation_id: str,
+    message_id: str | None = None,
+) -> MessageTurn:
+    state = None
+    if lease is not None:
+        with timed("redis.load_state"):
+            state = await store.load_state(conversation_id, lease)
+
+    if message_id is not None and state is not None and message_id in state.message_ids:
+        return MessageTurn(
+            state=state,
+            pending_confirmation=_pending_for(state, tenant_id),
+            replayed=True,
+        )
+
+    final_state = await _run_graph(_next_state(state, conversation_id, tenant_id, text))
+    if message_id is not None:
+        final_state = final_state.with_field(
+            "message_ids",
+            (*final_state.message_ids, message_id)[-RECENT_MESSAGE_IDS:],
+            count_step=False,
+        )
+
+    # Save state plus pending confirmation data if needed; a new
+    # message supersedes any earlier pending confirmation
+    pending = _pending_for(final_state, tenant_id)
+    with timed("redis.commit_conversation"):
+        await store.commit_conversation(
+            final_state.conversation_id,
+            final_state,
+            pending_confirmation=pending,
+            clear_confirmation=True,
+            lease=lease,
+        )
+
+    return MessageTurn(state=final_state, pending_confirmation=pending)
+
+
+def _next_state(
+    state: AIGraphState | None, conversation_id: str, tenant_id: str, text: str
+) -> AIGraphState:
+    if state is None:
+        # Expired, not found or new - create
+        return AIGraphState(
+            conversation_id=conversation_id,
+            tenant_id=tenant_id,
+            user_input=text,
+        )
+    # Update with new input
+    return state.with_updates(
+        user_input=text,
+        response=None,
+        tool_result=None,
+        tool_error=None,
+    )
+
+
+async def resume_graph(state: AIGraphState) -> AIGraphState:
+    """Continue a stopped run (e.g. a confirmed action) from its checkpoint.
+
+    Raises:
+        NotResumableError: The state has no resumable checkpoint
+    """
+    return await _run_graph(state, start_at=get_graph().resume_point(state))
+
+
+async def _run_graph(state: AIGraphState, start_at: str | None = None) -> AIGraphState:
+    # LLM calls share one latency budget
+    graph = get_graph()
+    with latency_budget(get_settings().ai_latency_budget_seconds):
+        return await graph.run(state, start_at=start_at)
+
+
+def _pending_for(state: AIGraphState, tenant_id: str) -> dict[str, Any] | None:
+    if state.confirmation_status != ConfirmationStatus.PENDING:
+        return None
+    return {
+        "intent": state.intent.value if state.intent else None,
+        "entities": state.entities.to_dict(),
+        "tenant_id": tenant_id,
+    }
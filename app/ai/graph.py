@@ -1,72 +1,219 @@
 """AI Graph definition.
 
-Wires all nodes together in a deterministic flow.
-Nodes execute in strict order - no skipping allowed.
+Wires all nodes together in a deterministic flow, declared as a
+transition table and compiled once per process.
+
+Flow:
+    normalize_input → classify_by_rules
+        ─ rule hit ─────────────────────────────→ validate_request
+        ─ otherwise → classify_intent → extract_entities → validate_request
+                      (or classify_and_extract in combined mode)
+    validate_request
+        ─ monetary intent → check_confirmation → execute_tool
+        ─ otherwise ──────────────────────────→ execute_tool
+    execute_tool → generate_response → END
+
+Conditional edges skip nodes that cannot apply (no entity extraction
+for intents without required entities, no confirmation gate for
+non-monetary intents). Any node can stop the flow by setting a response.
+Runs can resume from a recorded checkpoint (e.g. straight to
+execute_tool on confirm).
 
 Observability:
 - correlation_id per request
-- Structured logging for node transitions
+- Structured logging of the path taken
+- Per-node/per-run timing histograms and a per-request breakdown
+  (see app.ai.timing)
 - No PII in logs
 """
 
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from uuid import uuid4
 
 from app.ai.nodes import (
-    classify_intent,
     check_confirmation,
+    classify_and_extract,
+    classify_by_rules,
+    classify_intent,
     execute_tool,
     extract_entities,
     generate_response,
     normalize_input,
     validate_request,
 )
-from app.ai.state import AIGraphState
+from app.ai.nodes.validation_gate import ENTITY_FREE_INTENTS
+from app.ai.state import AIGraphState, ConfirmationStatus, Intent
+from app.ai.timing import collect_timings, record, run_outcome, timed
 from app.config.logging import get_logger
+from app.config.settings import get_settings
 
 logger = get_logger("ai.graph")
 
+Node = Callable[[AIGraphState], Awaitable[AIGraphState]]
+Condition = Callable[[AIGraphState], bool]
+
+END = "__end__"
+
+# A run stopped at the confirmation gate (the confirm handler marks it
+# CONFIRMED before resuming)
+_AWAITING_CONFIRMATION = frozenset({ConfirmationStatus.PENDING, ConfirmationStatus.CONFIRMED})
+
+
+class NotResumableError(ValueError):
+    """The state has no checkpoint this graph can resume from."""
 
-class AIGraph:
-    """AI Orchestration Graph.
 
-    Executes nodes in strict order:
-    1. Input Normalization
-    2. Intent Classification
-    3. Entity Extraction
-    4. Validation Gate
-    5. Confirmation Gate
-    6. Tool Execution
-    7. Response Generation
+@dataclass(frozen=True)
+class Edge:
+    """Transition to `target`, taken when `condition` holds (None = always)."""
 
-    Each node can stop the flow by setting a response.
+    target: str
+    condition: Condition | None = None
+
+
+def _resolved_by_rules(state: AIGraphState) -> bool:
+    return state.intent_source == "rules"
+
+
+def _needs_no_entities(state: AIGraphState) -> bool:
+    return state.intent is None or state.intent in ENTITY_FREE_INTENTS
+
+
+def _needs_confirmation(state: AIGraphState) -> bool:
+    return state.intent is not None and Intent.requires_confirmation(state.intent)
+
+
+def _definition(combined_extraction: bool) -> tuple[dict[str, Node], dict[str, tuple[Edge, ...]]]:
+    """Nodes and edges; the first edge whose condition holds is taken."""
+    nodes: dict[str, Node] = {
+        "normalize_input": normalize_input,
+        "classify_by_rules": classify_by_rules,
+        "validate_request": validate_request,
+        "check_confirmation": check_confirmation,
+        "execute_tool": execute_tool,
+        "generate_response": generate_response,
+    }
+    edges: dict[str, tuple[Edge, ...]] = {
+        "normalize_input": (Edge("classify_by_rules"),),
+        "validate_request": (
+            Edge("check_confirmation", _needs_confirmation),
+            Edge("execute_tool"),
+        ),
+        "check_confirmation": (Edge("execute_tool"),),
+        "execute_tool": (Edge("generate_response"),),
+        "generate_response": (Edge(END),),
+    }
+
+    if combined_extraction:
+        nodes["classify_and_extract"] = classify_and_extract
+        edges["classify_by_rules"] = (
+            Edge("validate_request", _resolved_by_rules),
+            Edge("classify_and_extract"),
+        )
+        edges["classify_and_extract"] = (Edge("validate_request"),)
+    else:
+        nodes["classify_intent"] = classify_intent
+        nodes["extract_entities"] = extract_entities
+        edges["classify_by_rules"] = (
+            Edge("validate_request", _resolved_by_rules),
+            Edge("classify_intent"),
+        )
+        edges["classify_intent"] = (
+            Edge("validate_request", _needs_no_entities),
+            Edge("extract_entities"),
+        )
+        edges["extract_entities"] = (Edge("validate_request"),)
+
+    return nodes, edges
+
+
+class AIGraph:
+    """AI Orchestration Graph, compiled to a transition table.
+
+    Stateless after construction: one instance serves every request
+    (see get_graph()).
 
     Observability:
     - correlation_id injected at start
     - All logs include tenant_id, conversation_id
-    - Node transitions logged
+    - Path taken logged once per run (node enter/exit at debug)
     - No PII logged
     """
 
-    def __init__(self) -> None:
-        self._nodes = [
-            ("normalize_input", normalize_input),
-            ("classify_intent", classify_intent),
-            ("extract_entities", extract_entities),
-            ("validate_request", validate_request),
-            ("check_confirmation", check_confirmation),
-            ("execute_tool", execute_tool),
-            ("generate_response", generate_response),
-        ]
-
-    async def run(self, state: AIGraphState) -> AIGraphState:
+    ENTRY = "normalize_input"
+
+    def __init__(self, combined_extraction: bool = False) -> None:
+        nodes, edges = _definition(combined_extraction)
+        self._compile(nodes, edges)
+        self.combined_extraction = combined_extraction
+
+    def _compile(self, nodes: dict[str, Node], edges: dict[str, tuple[Edge, ...]]) -> None:
+        """Validate the definition and freeze it into lookup tables."""
+        for name in nodes:
+            if not edges.get(name):
+                raise ValueError(f"Graph node has no outgoing edge: {name}")
+            for edge in edges[name]:
+                if edge.target != END and edge.target not in nodes:
+                    raise ValueError(f"Edge {name} → unknown node {edge.target}")
+            if edges[name][-1].condition is not None:
+                raise ValueError(f"Graph node needs an unconditional edge last: {name}")
+
+        self._nodes: dict[str, Node] = dict(nodes)
+        self._edges: dict[str, tuple[Edge, ...]] = {name: edges[name] for name in nodes}
+
+    @property
+    def node_names(self) -> list[str]:
+        """Node names in definition order."""
+        return list(self._nodes)
+
+    def _next(self, node_name: str, state: AIGraphState) -> str:
+        for edge in self._edges[node_name]:
+            if edge.condition is None or edge.condition(state):
+                return edge.target
+        return END  # unreachable: last edge is unconditional
+
+    def resume_point(self, state: AIGraphState) -> str:
+        """Node to resume a stopped run at: the successor of its checkpoint.
+
+        States saved before runs recorded checkpoints have none; if they
+        were stopped for confirmation they resume at execute_tool.
+
+        Raises:
+            NotResumableError: If the state has no checkpoint of this
+                graph, or its run had already finished
+        """
+        checkpoint = state.last_completed_node
+        if checkpoint is None and state.confirmation_status in _AWAITING_CONFIRMATION:
+            return "execute_tool"
+        if checkpoint not in self._nodes:
+            raise NotResumableError(f"No resumable checkpoint: {checkpoint}")
+        node_name = self._next(checkpoint, state)
+        if node_name == END:
+            raise NotResumableError(f"Run already finished at: {checkpoint}")
+        return node_name
+
+    async def run(self, state: AIGraphState, start_at: str | None = None) -> AIGraphState:
         """Execute the graph.
 
         Args:
             state: Initial graph state
+            start_at: Resume from this node instead of the entry node
+                (e.g. "execute_tool" after a confirmation)
 
         Returns:
-            Final state with response
+            Final state with response; last_completed_node records
+            the checkpoint to resume from, timings the ms spent per
+            node/provider call plus "total"
+
+        Raises:
+            ValueError: If start_at is not a node of this graph
         """
+        node_name = start_at or self.ENTRY
+        if node_name not in self._nodes:
+            raise ValueError(f"Unknown graph node: {node_name}")
+
         # Inject correlation_id if not present
         if state.correlation_id is None:
             state = state.with_updates(correlation_id=str(uuid4())[:8])
@@ -77,57 +224,97 @@ class AIGraph:
             conversation_id=state.conversation_id,
             tenant_id=state.tenant_id,
             input_length=len(state.user_input) if state.user_input else 0,
+            start_at=start_at,
         )
 
+        with collect_timings() as timings:
+            start = time.perf_counter()
+            current_state, path, stopped_early = await self._walk(state, node_name)
+            total_ms = (time.perf_counter() - start) * 1000
+
+            intent = current_state.intent.value if current_state.intent else "none"
+            outcome = run_outcome(current_state)
+            record(f"intent.{intent}", total_ms)
+            record(f"outcome.{outcome}", total_ms)
+            timings.add("total", total_ms)
+            current_state = current_state.with_field("timings", timings.as_dict(), count_step=False)
+
+        logger.info(
+            "graph_run_complete",
+            correlation_id=current_state.correlation_id,
+            conversation_id=current_state.conversation_id,
+            tenant_id=current_state.tenant_id,
+            steps=current_state.step_count,
+            path=path,
+            stopped_early=stopped_early,
+            intent=current_state.intent.value if current_state.intent else None,
+            outcome=outcome,
+            duration_ms=round(total_ms, 2),
+            has_response=current_state.response is not None,
+        )
+
+        return current_state
+
+    async def _walk(
+        self, state: AIGraphState, node_name: str
+    ) -> tuple[AIGraphState, list[str], bool]:
+        """Follow edges from node_name until END or a stop condition."""
         current_state = state
+        path: list[str] = []
+        stopped_early = False
 
-        for node_name, node_func in self._nodes:
-            logger.info(
+        while node_name != END:
+            logger.debug(
                 "graph_node_enter",
                 correlation_id=current_state.correlation_id,
-                conversation_id=current_state.conversation_id,
-                tenant_id=current_state.tenant_id,
                 node=node_name,
                 step=current_state.step_count,
             )
 
-            current_state = await node_func(current_state)
+            with timed(f"node.{node_name}"):
+                current_state = await self._nodes[node_name](current_state)
+            current_state = current_state.with_field(
+                "last_completed_node", node_name, count_step=False
+            )
+            path.append(node_name)
 
-            logger.info(
+            logger.debug(
                 "graph_node_exit",
                 correlation_id=current_state.correlation_id,
-                conversation_id=current_state.conversation_id,
-                tenant_id=current_state.tenant_id,
                 node=node_name,
                 step=current_state.step_count,
                 has_response=current_state.response is not None,
             )
 
-            # Check if we should stop
             if current_state.should_stop():
-                logger.info(
-                    "graph_early_stop",
-                    correlation_id=current_state.correlation_id,
-                    conversation_id=current_state.conversation_id,
-                    tenant_id=current_state.tenant_id,
-                    node=node_name,
-                    reason="response_set" if current_state.response else "error",
-                )
+                stopped_early = node_name != "generate_response"
                 break
 
-        logger.info(
-            "graph_run_complete",
-            correlation_id=current_state.correlation_id,
-            conversation_id=current_state.conversation_id,
-            tenant_id=current_state.tenant_id,
-            steps=current_state.step_count,
-            intent=current_state.intent.value if current_state.intent else None,
-            has_response=current_state.response is not None,
-        )
+            node_name = self._next(node_name, current_state)
 
-        return current_state
+        return current_state, path, stopped_early
+
+
+def create_graph(combined_extraction: bool | None = None) -> AIGraph:
+    """Compile a new AI graph.
+
+    combined_extraction defaults to the ai_combined_extraction setting.
+    Request handlers should use get_graph() instead.
+    """
+    if combined_extraction is None:
+        combined_extraction = get_settings().ai_combined_extraction
+    return AIGraph(combined_extraction=combined_extraction)
+
+
+# Compiled graphs, one per mode (process-wide)
+_graphs: dict[bool, AIGraph] = {}
 
 
-def create_graph() -> AIGraph:
-    """Factory function to create the AI graph."""
-    return AIGraph()
+def get_graph(combined_extraction: bool | None = None) -> AIGraph:
+    """Get the process-wide compiled graph, compiling it on first use."""
+    if combined_extraction is None:
+        combined_extraction = get_settings().ai_combined_extraction
+    graph = _graphs.get(combined_extraction)
+    if graph is None:
+        graph = _graphs[combined_extraction] = AIGraph(combined_extraction)
+    return graph
@@ -8,18 +8,36 @@ Each node is a pure function that:
 Nodes are ordered and cannot be skipped.
 """
 
+from app.ai.nodes import entity_extraction as _entity_extraction
+from app.ai.nodes import intent_classification as _intent_classification
+from app.ai.nodes.combined_extraction import classify_and_extract
+from app.ai.nodes.confirmation_gate import check_confirmation
+from app.ai.nodes.entity_extraction import extract_entities
 from app.ai.nodes.input_normalization import normalize_input
 from app.ai.nodes.intent_classification import classify_intent
-from app.ai.nodes.entity_extraction import extract_entities
-from app.ai.nodes.validation_gate import validate_request
-from app.ai.nodes.confirmation_gate import check_confirmation
-from app.ai.nodes.tool_execution import execute_tool
 from app.ai.nodes.response_generation import generate_response
+from app.ai.nodes.rule_classification import classify_by_rules
+from app.ai.nodes.tool_execution import execute_tool
+from app.ai.nodes.validation_gate import validate_request
+from app.application.ports.providers.llm import LLMProviderPort
+
+
+def configure_llm_provider(provider: LLMProviderPort) -> None:
+    """Use `provider` for every LLM-backed node.
+
+    The combined node shares the intent classification provider.
+    """
+    _intent_classification.set_llm_provider(provider)
+    _entity_extraction.set_llm_provider(provider)
+
 
 __all__ = [
+    "configure_llm_provider",
     "normalize_input",
+    "classify_by_rules",
     "classify_intent",
     "extract_entities",
+    "classify_and_extract",
     "validate_request",
     "check_confirmation",
     "execute_tool",
@@ -0,0 +1,111 @@
+"""Combined intent + entity node.
+
+Classifies intent and extracts entities with one LLM call.
+Falls back to the two-step nodes when the combined call fails or is
+not confident, so accuracy matches the two-call path. Shares the
+intent classification node's provider.
+"""
+
+from app.ai.nodes.entity_extraction import extract_entities
+from app.ai.nodes.intent_classification import (
+    CONFIDENCE_THRESHOLD,
+    LLM_ERROR_RESPONSE,
+    classify_intent,
+    get_llm_provider,
+)
+from app.ai.nodes.validation_gate import ENTITY_FREE_INTENTS
+from app.ai.state import AIGraphState, ExtractedEntities, Intent
+from app.ai.timing import timed
+from app.application.ports.providers.llm import LLMErrorCode
+from app.config.logging import get_logger
+
+logger = get_logger("ai.combined_extraction")
+
+# Failures a second LLM call cannot fix (breaker open, no time left)
+NO_FALLBACK_CODES = frozenset({LLMErrorCode.CIRCUIT_OPEN, LLMErrorCode.BUDGET_EXHAUSTED})
+
+
+async def classify_and_extract(state: AIGraphState) -> AIGraphState:
+    """Classify intent and extract entities in a single LLM call.
+
+    Input: Normalized text
+    Output: Intent enum + confidence score + extracted entities
+
+    Failure modes:
+    - Circuit open / budget exhausted → unknown intent, no fallback
+    - Other LLM error → two-step fallback
+    - Low confidence → two-step fallback
+    """
+    if state.normalized_input is None:
+        return state
+
+    if state.should_stop():
+        return state
+
+    # Already resolved by the rule-based fast path
+    if state.intent_source == "rules":
+        return state
+
+    logger.info(
+        "classify_and_extract_start",
+        conversation_id=state.conversation_id,
+    )
+
+    provider = get_llm_provider()
+    with timed("llm.classify_and_extract"):
+        result = await provider.classify_and_extract(state.normalized_input)
+
+    if not result.success and result.error_code in NO_FALLBACK_CODES:
+        logger.warning(
+            "classify_and_extract_unavailable",
+            conversation_id=state.conversation_id,
+            error_code=result.error_code,
+        )
+        return state.with_updates(
+            intent=Intent.UNKNOWN,
+            intent_confidence=0.0,
+            response=LLM_ERROR_RESPONSE,
+        )
+
+    if not result.success or result.confidence < CONFIDENCE_THRESHOLD:
+        logger.info(
+            "classify_and_extract_fallback",
+            conversation_id=state.conversation_id,
+            success=result.success,
+            confidence=result.confidence,
+        )
+        state = await classify_intent(state)
+        # Same condition as the graph's classify_intent → extract_entities edge
+        if state.intent is None or state.intent in ENTITY_FREE_INTENTS:
+            return state
+        return await extract_entities(state)
+
+    intent = Intent.from_label(result.intent)
+
+    entities = ExtractedEntities()
+    if result.entities is not None:
+        entities = ExtractedEntities(
+            contact_name=result.entities.contact_name,
+            contact_phone=result.entities.contact_phone,
+            amount_cents=result.entities.amount_cents,
+            due_date=result.entities.due_date,
+            boleto_id=result.entities.boleto_id,
+            message_content=result.entities.message_content,
+            raw={"llm_extracted": True, "combined": True},
+        )
+
+    logger.info(
+        "classify_and_extract_complete",
+        conversation_id=state.conversation_id,
+        intent=intent.value,
+        confidence=result.confidence,
+        has_contact=entities.contact_name is not None,
+        has_amount=entities.amount_cents is not None,
+        has_date=entities.due_date is not None,
+    )
+
+    return state.with_updates(
+        intent=intent,
+        intent_confidence=result.confidence,
+        entities=entities,
+    )
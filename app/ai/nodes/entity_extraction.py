@@ -5,6 +5,7 @@ Validation gate checks completeness - this node just extracts.
 """
 
 from app.ai.state import AIGraphState, ExtractedEntities
+from app.ai.timing import timed
 from app.application.ports.providers.llm import LLMProviderPort
 from app.config.logging import get_logger
 
@@ -24,6 +25,7 @@ def get_llm_provider() -> LLMProviderPort:
     """Get the configured LLM provider."""
     if _llm_provider is None:
         from app.infrastructure.providers.llm_stub import StubLLMProvider
+
         return StubLLMProvider()
     return _llm_provider
 
@@ -46,6 +48,10 @@ async def extract_entities(state: AIGraphState) -> AIGraphState:
     if state.should_stop():
         return state
 
+    # Already resolved by the rule-based fast path
+    if state.intent_source == "rules":
+        return state
+
     logger.info(
         "extract_entities_start",
         conversation_id=state.conversation_id,
@@ -53,10 +59,11 @@ async def extract_entities(state: AIGraphState) -> AIGraphState:
     )
 
     provider = get_llm_provider()
-    result = await provider.extract_entities(
-        state.normalized_input or "",
-        state.intent.value,
-    )
+    with timed("llm.extract_entities"):
+        result = await provider.extract_entities(
+            state.normalized_input or "",
+            state.intent.value,
+        )
 
     if not result.success:
         logger.warning(
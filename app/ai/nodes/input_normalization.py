@@ -4,7 +4,7 @@ Normalizes user input to standard text format.
 Handles text and audio inputs.
 """
 
-from app.ai.state import AIGraphState
+from app.ai.state import AIGraphState, ConfirmationStatus
 from app.config.logging import get_logger
 
 logger = get_logger("ai.input_normalization")
@@ -53,4 +53,10 @@ async def normalize_input(state: AIGraphState) -> AIGraphState:
         length=len(normalized),
     )
 
-    return state.with_updates(normalized_input=normalized)
+    # New turn: nothing resolved or awaiting confirmation yet
+    return state.with_updates(
+        normalized_input=normalized,
+        intent_source=None,
+        confirmation_status=ConfirmationStatus.NOT_REQUIRED,
+        confirmation_message=None,
+    )
@@ -5,6 +5,7 @@ Returns confidence score for decision making.
 """
 
 from app.ai.state import AIGraphState, Intent
+from app.ai.timing import timed
 from app.application.ports.providers.llm import LLMProviderPort
 from app.config.logging import get_logger
 
@@ -13,6 +14,8 @@ logger = get_logger("ai.intent_classification")
 # Confidence threshold for accepting classification
 CONFIDENCE_THRESHOLD = 0.7
 
+LLM_ERROR_RESPONSE = "Desculpe, tive um problema ao entender sua mensagem. Pode repetir?"
+
 # Module-level provider (injected via set_llm_provider)
 _llm_provider: LLMProviderPort | None = None
 
@@ -27,6 +30,7 @@ def get_llm_provider() -> LLMProviderPort:
     """Get the configured LLM provider."""
     if _llm_provider is None:
         from app.infrastructure.providers.llm_stub import StubLLMProvider
+
         return StubLLMProvider()
     return _llm_provider
 
@@ -50,13 +54,18 @@ async def classify_intent(state: AIGraphState) -> AIGraphState:
     if state.should_stop():
         return state
 
+    # Already resolved by the rule-based fast path
+    if state.intent_source == "rules":
+        return state
+
     logger.info(
         "classify_intent_start",
         conversation_id=state.conversation_id,
     )
 
     provider = get_llm_provider()
-    result = await provider.classify_intent(state.normalized_input)
+    with timed("llm.classify_intent"):
+        result = await provider.classify_intent(state.normalized_input)
 
     if not result.success:
         logger.warning(
@@ -67,10 +76,10 @@ async def classify_intent(state: AIGraphState) -> AIGraphState:
         return state.with_updates(
             intent=Intent.UNKNOWN,
             intent_confidence=0.0,
-            response="Desculpe, tive um problema ao entender sua mensagem. Pode repetir?",
+            response=LLM_ERROR_RESPONSE,
         )
 
-    intent = _map_intent(result.intent)
+    intent = Intent.from_label(result.intent)
     confidence = result.confidence
 
     if confidence < CONFIDENCE_THRESHOLD:
@@ -105,20 +114,3 @@ async def classify_intent(state: AIGraphState) -> AIGraphState:
         intent=intent,
         intent_confidence=confidence,
     )
-
-
-def _map_intent(intent_str: str | None) -> Intent:
-    """Map LLM intent string to Intent enum."""
-    if intent_str is None:
-        return Intent.UNKNOWN
-
-    mapping = {
-        "create_boleto": Intent.CREATE_BOLETO,
-        "cancel_boleto": Intent.CANCEL_BOLETO,
-        "check_status": Intent.CHECK_STATUS,
-        "send_message": Intent.SEND_MESSAGE,
-        "list_boletos": Intent.LIST_BOLETOS,
-        "general_question": Intent.GENERAL_QUESTION,
-    }
-
-    return mapping.get(intent_str.lower(), Intent.UNKNOWN)
@@ -0,0 +1,47 @@
+"""Rule-based classification node.
+
+Deterministic fast path between input normalization and the LLM.
+Formulaic messages get intent and entities from precompiled rules,
+and the LLM classification/extraction nodes are skipped for them.
+"""
+
+from app.ai.rules import rule_classifier
+from app.ai.state import AIGraphState
+from app.config.logging import get_logger
+
+logger = get_logger("ai.rule_classification")
+
+
+async def classify_by_rules(state: AIGraphState) -> AIGraphState:
+    """Resolve intent and entities with deterministic rules.
+
+    Input: Normalized text
+    Output: Intent (confidence 1.0) + entities when a rule matches
+
+    Failure modes:
+    - No rule matches → state unchanged, LLM nodes run
+    """
+    if state.normalized_input is None:
+        return state
+
+    if state.should_stop():
+        return state
+
+    match = rule_classifier.match(state.normalized_input)
+
+    if match is None:
+        return state
+
+    logger.info(
+        "classify_by_rules_hit",
+        conversation_id=state.conversation_id,
+        rule=match.rule,
+        intent=match.intent.value,
+    )
+
+    return state.with_updates(
+        intent=match.intent,
+        intent_confidence=1.0,
+        intent_source="rules",
+        entities=match.entities,
+    )
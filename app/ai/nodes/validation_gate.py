@@ -20,6 +20,11 @@ REQUIRED_ENTITIES: dict[Intent, list[str]] = {
     Intent.UNKNOWN: [],
 }
 
+# Intents whose tools take no entities: extraction cannot apply
+ENTITY_FREE_INTENTS = frozenset(
+    intent for intent, required in REQUIRED_ENTITIES.items() if not required
+)
+
 # Human-readable field names for messages
 FIELD_NAMES: dict[str, str] = {
     "contact_name": "nome do contato",
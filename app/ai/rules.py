@@ -0,0 +1,207 @@
+"""Deterministic rule-based classifier.
+
+Resolves formulaic messages ("status do boleto <uuid>",
+"cobrar R$ 150 do João dia 10") and their entities with precompiled
+patterns, so the LLM is only called for free-form text.
+
+Rules run against normalized (lowercased, stripped) input and must
+match the whole message; anything else falls through to the LLM.
+"""
+
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from app.ai.state import ExtractedEntities, Intent
+
+_UUID = r"(?P<boleto_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+_LETTER = r"[a-zàáâãçéêíóôõúü]"
+# The second name word must not be the due-date keyword that follows it
+_NAME = rf"(?P<name>{_LETTER}+(?:\s+(?!(?:dia|vencimento|em|para)\b){_LETTER}+)?)"
+_AMOUNT = r"r\$\s*(?P<amount>\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:,\d{1,2})?)"
+_DAY = r"(?P<day>\d{1,2})(?:/(?P<month>\d{1,2})(?:/(?P<year>\d{2}|\d{4}))?)?"
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    """Intent and entities resolved by a rule."""
+
+    rule: str
+    intent: Intent
+    entities: ExtractedEntities
+
+
+@dataclass(frozen=True)
+class _Rule:
+    name: str
+    intent: Intent
+    pattern: re.Pattern[str]
+    build: Callable[[re.Match[str], date], ExtractedEntities | None]
+
+
+def parse_amount_cents(amount: str) -> int:
+    """Parse a pt-BR amount ("1.500,50", "150") into cents."""
+    reais, _, centavos = amount.replace(".", "").partition(",")
+    return int(reais) * 100 + int(centavos.ljust(2, "0"))
+
+
+def resolve_due_date(day: int, month: int | None, year: int | None, today: date) -> date | None:
+    """Resolve "dia 10" / "10/03" / "10/03/26" to a date.
+
+    A bare day means its next occurrence (this month if not yet past,
+    otherwise next month). Returns None for impossible dates.
+    """
+    try:
+        if month is None:
+            candidate = date(today.year, today.month, day)
+            if candidate >= today:
+                return candidate
+            if today.month == 12:
+                return date(today.year + 1, 1, day)
+            return date(today.year, today.month + 1, day)
+
+        if year is None:
+            candidate = date(today.year, month, day)
+            return candidate if candidate >= today else date(today.year + 1, month, day)
+
+        if year < 100:
+            year += 2000
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _boleto_id_entities(match: re.Match[str], _today: date) -> ExtractedEntities:
+    return ExtractedEntities(boleto_id=match.group("boleto_id"))
+
+
+def _no_entities(_match: re.Match[str], _today: date) -> ExtractedEntities:
+    return ExtractedEntities()
+
+
+def _create_boleto_entities(match: re.Match[str], today: date) -> ExtractedEntities | None:
+    month = match.group("month")
+    year = match.group("year")
+    due_date = resolve_due_date(
+        int(match.group("day")),
+        int(month) if month else None,
+        int(year) if year else None,
+        today,
+    )
+    if due_date is None:
+        return None
+
+    return ExtractedEntities(
+        contact_name=match.group("name").title(),
+        amount_cents=parse_amount_cents(match.group("amount")),
+        due_date=due_date.isoformat(),
+    )
+
+
+RULES: tuple[_Rule, ...] = (
+    _Rule(
+        name="check_status_by_id",
+        intent=Intent.CHECK_STATUS,
+        pattern=re.compile(
+            rf"^(?:qual\s+(?:[eé]\s+)?o\s+)?(?:status|situa[cç][aã]o)\s+"
+            rf"(?:do\s+)?boleto\s+{_UUID}\s*\??$"
+        ),
+        build=_boleto_id_entities,
+    ),
+    _Rule(
+        name="cancel_boleto_by_id",
+        intent=Intent.CANCEL_BOLETO,
+        pattern=re.compile(rf"^(?:cancelar|cancela|anular)\s+(?:o\s+)?boleto\s+{_UUID}$"),
+        build=_boleto_id_entities,
+    ),
+    _Rule(
+        name="create_boleto_amount_name_day",
+        intent=Intent.CREATE_BOLETO,
+        pattern=re.compile(
+            rf"^(?:cobrar|gerar\s+boleto\s+de|criar\s+boleto\s+de)\s+{_AMOUNT}\s+"
+            rf"(?:d[oae]|para(?:\s+[oa])?)\s+{_NAME}\s+"
+            rf"(?:(?:para\s+o\s+)?dia|vencimento(?:\s+em)?|em)\s+{_DAY}$"
+        ),
+        build=_create_boleto_entities,
+    ),
+    _Rule(
+        name="list_boletos",
+        intent=Intent.LIST_BOLETOS,
+        pattern=re.compile(
+            r"^(?:listar|mostrar|ver|quais\s+s[aã]o)\s+(?:os\s+)?(?:meus\s+)?boletos\??$"
+        ),
+        build=_no_entities,
+    ),
+)
+
+
+class RuleClassifier:
+    """Matches normalized input against RULES, counting hits per rule."""
+
+    def __init__(
+        self, rules: tuple[_Rule, ...] = RULES, timezone: str = "America/Sao_Paulo"
+    ) -> None:
+        self._rules = rules
+        self._timezone = ZoneInfo(timezone)
+        self._lock = threading.Lock()
+        self._evaluated = 0
+        self._hits = {rule.name: 0 for rule in rules}
+
+    def match(self, text: str, today: date | None = None) -> RuleMatch | None:
+        """Return the first matching rule's intent and entities."""
+        today = today or datetime.now(self._timezone).date()
+        result: RuleMatch | None = None
+
+        for rule in self._rules:
+            m = rule.pattern.match(text)
+            if m is None:
+                continue
+            entities = rule.build(m, today)
+            if entities is None:
+                continue
+            result = RuleMatch(
+                rule=rule.name,
+                intent=rule.intent,
+                entities=replace(entities, raw={"rule": rule.name}),
+            )
+            break
+
+        with self._lock:
+            self._evaluated += 1
+            if result is not None:
+                self._hits[result.rule] += 1
+
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Evaluations, per-rule hits and hit rates."""
+        with self._lock:
+            evaluated = self._evaluated
+            hits = dict(self._hits)
+
+        total_hits = sum(hits.values())
+        return {
+            "evaluated": evaluated,
+            "hits": total_hits,
+            "hit_rate": round(total_hits / evaluated, 4) if evaluated else 0.0,
+            "rules": {
+                name: {
+                    "hits": count,
+                    "hit_rate": round(count / evaluated, 4) if evaluated else 0.0,
+                }
+                for name, count in hits.items()
+            },
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._evaluated = 0
+            self._hits = {rule.name: 0 for rule in self._rules}
+
+
+# Process-wide classifier (counters are per process)
+rule_classifier = RuleClassifier()
@@ -4,14 +4,14 @@ Defines the state that flows through the AI graph.
 State is ephemeral (Redis) - only audit logs are persisted.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from enum import Enum
+from dataclasses import dataclass, field, fields
+from datetime import UTC, datetime
+from enum import StrEnum
 from typing import Any
 from uuid import uuid4
 
 
-class Intent(str, Enum):
+class Intent(StrEnum):
     """Allowed user intents.
 
     The AI can only classify into these categories.
@@ -31,8 +31,18 @@ class Intent(str, Enum):
         """Check if intent requires explicit user confirmation."""
         return intent in {cls.CREATE_BOLETO, cls.CANCEL_BOLETO}
 
+    @classmethod
+    def from_label(cls, label: str | None) -> "Intent":
+        """Map an LLM intent label (any case) to Intent; UNKNOWN if not allowed."""
+        if not label:
+            return cls.UNKNOWN
+        try:
+            return cls(label.lower())
+        except ValueError:
+            return cls.UNKNOWN
+
 
-class ValidationResult(str, Enum):
+class ValidationResult(StrEnum):
     """Validation gate results."""
 
     PASS = "pass"
@@ -40,7 +50,7 @@ class ValidationResult(str, Enum):
     CLARIFY = "clarify"
 
 
-class ConfirmationStatus(str, Enum):
+class ConfirmationStatus(StrEnum):
     """Confirmation gate status."""
 
     PENDING = "pending"
@@ -49,11 +59,12 @@ class ConfirmationStatus(str, Enum):
     NOT_REQUIRED = "not_required"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExtractedEntities:
     """Entities extracted from user input.
 
     All fields are optional - validation gate checks required ones.
+    Immutable: build a new instance (dataclasses.replace) to change one.
     """
 
     contact_name: str | None = None
@@ -77,11 +88,14 @@ class ExtractedEntities:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AIGraphState:
     """State that flows through the AI graph.
 
-    Immutable pattern: each node returns a new state.
+    Immutable pattern: each node returns a new state. Instances are
+    frozen and slotted; updates copy field references only, so
+    unchanged values (entities, lists, dicts) are shared between a
+    state and its successors and must never be mutated in place.
     """
 
     # Identifiers
@@ -97,6 +111,7 @@ class AIGraphState:
     # Intent classification
     intent: Intent | None = None
     intent_confidence: float = 0.0
+    intent_source: str | None = None  # this turn only: "rules" | None
 
     # Entity extraction
     entities: ExtractedEntities = field(default_factory=ExtractedEntities)
@@ -118,39 +133,61 @@ class AIGraphState:
     response: str | None = None
 
     # Metadata
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     step_count: int = 0
     correlation_id: str | None = None
+    last_completed_node: str | None = None  # resume checkpoint
+    timings: dict[str, float] = field(default_factory=dict)  # last run, ms
+    message_ids: tuple[str, ...] = ()  # recent inbound messages applied, oldest first
+
+    # Fields changed since the state was loaded/saved (None = never
+    # persisted: the store writes every field)
+    dirty_fields: frozenset[str] | None = field(default=None, compare=False, repr=False)
 
     def with_updates(self, **kwargs: Any) -> "AIGraphState":
-        """Create a new state with updates.
+        """Create a new state with updates, counting one step.
 
-        Immutable pattern - returns new instance.
+        Immutable pattern - returns new instance sharing unchanged fields.
         """
-        current = {
-            "conversation_id": self.conversation_id,
-            "tenant_id": self.tenant_id,
-            "user_id": self.user_id,
-            "user_input": self.user_input,
-            "input_type": self.input_type,
-            "normalized_input": self.normalized_input,
-            "intent": self.intent,
-            "intent_confidence": self.intent_confidence,
-            "entities": self.entities,
-            "validation_result": self.validation_result,
-            "validation_errors": self.validation_errors,
-            "confirmation_status": self.confirmation_status,
-            "confirmation_message": self.confirmation_message,
-            "tool_name": self.tool_name,
-            "tool_result": self.tool_result,
-            "tool_error": self.tool_error,
-            "response": self.response,
-            "created_at": self.created_at,
-            "step_count": self.step_count + 1,
-            "correlation_id": self.correlation_id,
-        }
-        current.update(kwargs)
-        return AIGraphState(**current)
+        new = self._clone()
+        _set_field(new, "step_count", self.step_count + 1)
+        for name, value in kwargs.items():
+            if name not in _FIELD_NAMES:
+                raise TypeError(f"AIGraphState has no field {name!r}")
+            _set_field(new, name, value)
+        if self.dirty_fields is not None:
+            _set_field(new, "dirty_fields", self.dirty_fields.union(kwargs, _STEP))
+        return new
+
+    def with_field(self, name: str, value: Any, count_step: bool = True) -> "AIGraphState":
+        """Create a new state with a single field changed.
+
+        Fast path for with_updates(name=value); with count_step=False the
+        step counter is left alone (bookkeeping such as checkpoints).
+        """
+        if name not in _FIELD_NAMES:
+            raise TypeError(f"AIGraphState has no field {name!r}")
+        new = self._clone()
+        if count_step:
+            _set_field(new, "step_count", self.step_count + 1)
+        _set_field(new, name, value)
+        if self.dirty_fields is not None:
+            changed = (name, "step_count") if count_step else (name,)
+            _set_field(new, "dirty_fields", self.dirty_fields.union(changed))
+        return new
+
+    def clean(self) -> "AIGraphState":
+        """Same state with no pending changes (as loaded from / saved to the store)."""
+        new = self._clone()
+        _set_field(new, "dirty_fields", frozenset())
+        return new
+
+    def _clone(self) -> "AIGraphState":
+        """Shallow copy that bypasses __init__ and the frozen __setattr__."""
+        new = object.__new__(AIGraphState)
+        for name in _FIELD_ORDER:
+            _set_field(new, name, getattr(self, name))
+        return new
 
     def should_stop(self) -> bool:
         """Check if graph should stop execution."""
@@ -158,6 +195,10 @@ class AIGraphState:
             return True
         if self.tool_error is not None:
             return True
-        if self.confirmation_status == ConfirmationStatus.REJECTED:
-            return True
-        return False
+        return self.confirmation_status == ConfirmationStatus.REJECTED
+
+
+_FIELD_ORDER: tuple[str, ...] = tuple(f.name for f in fields(AIGraphState))
+_FIELD_NAMES: frozenset[str] = frozenset(_FIELD_ORDER)
+_set_field = object.__setattr__  # bypasses the frozen guard
+_STEP = ("step_count",)
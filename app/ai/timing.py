@@ -0,0 +1,117 @@
+"""Graph timing.
+
+Monotonic timings of graph nodes and provider calls, aggregated into
+process-wide histograms (exposed at /metrics/ai-graph) and collected
+per request into a compact breakdown attached to the final state.
+
+Histogram names are "<kind>.<name>":
+- node.<node>       one graph node
+- llm.<call_type>   one LLM provider call (cache and breaker included)
+- redis.<operation> one conversation state store call
+- intent.<intent>   a whole graph run, by final intent
+- outcome.<outcome> a whole graph run, by outcome
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.ai.state import AIGraphState, ConfirmationStatus
+from app.infrastructure.observability import HistogramRegistry
+
+# Most nodes are sub-millisecond; LLM calls take seconds
+GRAPH_BUCKETS_MS: tuple[float, ...] = (
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+# Process-wide graph histograms (exposed at /metrics/ai-graph)
+graph_latency = HistogramRegistry(GRAPH_BUCKETS_MS)
+
+
+class RunTimings:
+    """Per-request timings in ms, summed per name."""
+
+    __slots__ = ("_spans",)
+
+    def __init__(self) -> None:
+        self._spans: dict[str, float] = {}
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self._spans[name] = self._spans.get(name, 0.0) + elapsed_ms
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(ms, 2) for name, ms in self._spans.items()}
+
+
+_current: ContextVar[RunTimings | None] = ContextVar("ai_run_timings", default=None)
+
+
+def current_timings() -> RunTimings | None:
+    """Timings of the request being handled, None outside a run."""
+    return _current.get()
+
+
+@contextmanager
+def collect_timings() -> Iterator[RunTimings]:
+    """Collect timings of everything timed inside this block.
+
+    Reuses the enclosing collector, so a handler can open one around
+    its store calls and the graph run adds to the same breakdown.
+    """
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+
+    timings = RunTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Time the block into the `name` histogram and the current breakdown."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def record(name: str, elapsed_ms: float) -> None:
+    """Record an elapsed time measured elsewhere."""
+    graph_latency.observe(name, elapsed_ms)
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, elapsed_ms)
+
+
+def run_outcome(state: AIGraphState) -> str:
+    """Classify how a graph run ended, for outcome histograms."""
+    if state.tool_error is not None:
+        return "tool_error"
+    if state.confirmation_status == ConfirmationStatus.PENDING:
+        return "confirmation_pending"
+    if state.confirmation_status == ConfirmationStatus.REJECTED:
+        return "rejected"
+    if state.tool_name is not None:
+        return "executed"
+    return "clarify"
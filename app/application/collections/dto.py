@@ -1,7 +1,7 @@
 """DTOs for Collections use cases."""
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 
 
 @dataclass(frozen=True)
@@ -23,9 +23,15 @@ class MarkOverdueInput:
 
 @dataclass(frozen=True)
 class ApplyInterestInput:
-    """Input for ApplyInterest use case (batch)."""
+    """Input for ApplyInterest use case (one chunk).
 
-    batch_size: int = 100
+    accrual_date defaults to today (UTC); after_boleto_id is the keyset
+    cursor returned by the previous chunk.
+    """
+
+    batch_size: int = 1000
+    accrual_date: date | None = None
+    after_boleto_id: str | None = None
 
 
 @dataclass(frozen=True)
@@ -1,13 +1,19 @@
 """ApplyInterest use case.
 
-Applies interest to overdue boletos based on tenant policy.
+Accrues interest on overdue boletos based on tenant policy.
 This is called by a scheduled job.
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 from app.application.collections.dto import ApplyInterestInput
+from app.application.ports.repositories.collections import (
+    InterestAccrualEntry,
+    InterestAccrualRepositoryPort,
+)
+from app.domain.billing.value_objects.boleto_id import BoletoId
+from app.domain.collections.entities.interest_policy import compute_interest_batch
 
 
 @dataclass
@@ -18,28 +24,79 @@ class ApplyInterestResult:
     interest_applied: int
     total_interest_cents: int
     timestamp: datetime
+    last_boleto_id: str | None = None
 
 
 class ApplyInterestUseCase:
-    """Use case for applying interest to overdue boletos.
+    """Use case for accruing interest on overdue boletos.
 
-    Finds OVERDUE boletos and applies interest based on tenant policy.
-    Deterministic - tracks interest already applied.
+    Processes one chunk of OVERDUE boletos joined to the tenant's active
+    policy, computes interest for the whole chunk at once and records it
+    in the interest ledger. Deterministic and idempotent per accrual date.
 
-    Note: For MVP, interest application is logged but does not
-    modify the original boleto amount. Full implementation
-    requires an interest_applications audit table.
+    Note: The ledger is the record of interest owed; the original boleto
+    amount is not modified.
     """
 
+    def __init__(self, accrual_repository: InterestAccrualRepositoryPort) -> None:
+        self._accrual_repository = accrual_repository
+
     async def execute(self, input_dto: ApplyInterestInput) -> ApplyInterestResult:
-        """Execute the ApplyInterest use case.
+        """Execute the ApplyInterest use case for a single chunk.
 
-        MVP: Returns placeholder result. Full implementation
-        requires additional infrastructure.
+        Returns:
+            Result with last_boleto_id set to the cursor for the next chunk,
+            or None when the chunk was empty.
         """
+        now = datetime.now(UTC)
+        accrual_date = input_dto.accrual_date or now.date()
+        after = (
+            BoletoId.from_string(input_dto.after_boleto_id) if input_dto.after_boleto_id else None
+        )
+
+        chunk = await self._accrual_repository.get_overdue_chunk(
+            accrual_date=accrual_date,
+            after_boleto_id=after,
+            limit=input_dto.batch_size,
+        )
+
+        if len(chunk) == 0:
+            return ApplyInterestResult(
+                processed=0,
+                interest_applied=0,
+                total_interest_cents=0,
+                timestamp=now,
+            )
+
+        days_overdue = [(accrual_date - due.date()).days for due in chunk.due_dates]
+        interest = compute_interest_batch(
+            chunk.principal_cents,
+            days_overdue,
+            chunk.grace_period_days,
+            chunk.daily_interest_rate_bps,
+            chunk.fixed_penalty_cents,
+        )
+
+        entries = [
+            InterestAccrualEntry(
+                tenant_id=chunk.tenant_ids[i],
+                boleto_id=chunk.boleto_ids[i],
+                policy_id=chunk.policy_ids[i],
+                accrual_date=accrual_date,
+                days_overdue=days_overdue[i],
+                principal_cents=chunk.principal_cents[i],
+                interest_cents=amount,
+            )
+            for i, amount in enumerate(interest)
+            if amount > 0
+        ]
+
+        inserted = await self._accrual_repository.record_accruals(entries)
+
         return ApplyInterestResult(
-            processed=0,
-            interest_applied=0,
-            total_interest_cents=0,
-            timestamp=datetime.now(timezone.utc),
+            processed=len(chunk),
+            interest_applied=inserted,
+            total_interest_cents=sum(entry.interest_cents for entry in entries),
+            timestamp=now,
+            last_boleto_id=str(chunk.boleto_ids[-1]),
         )
@@ -4,12 +4,12 @@ Marks SENT boletos as OVERDUE when due date has passed.
 This is called by a scheduled job.
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 
 from app.application.collections.dto import MarkOverdueInput
 from app.application.ports.repositories.billing import BoletoRepositoryPort
-from app.domain.billing.value_objects.boleto_status import BoletoStatus
+from app.domain.billing.events import BoletoOverdueMarked
 
 
 @dataclass
@@ -19,6 +19,7 @@ class MarkOverdueResult:
     processed: int
     marked_overdue: int
     timestamp: datetime
+    events: list[BoletoOverdueMarked] = field(default_factory=list)
 
 
 class MarkOverdueUseCase:
@@ -26,20 +27,37 @@ class MarkOverdueUseCase:
 
     Finds SENT boletos past due date and marks them as OVERDUE.
     Deterministic - safe to run multiple times.
+
+    Works on one chunk per call with a set-based update; the caller
+    commits and publishes the returned events, then calls again until
+    nothing is left.
     """
 
     def __init__(self, boleto_repository: BoletoRepositoryPort) -> None:
         self._boleto_repository = boleto_repository
 
     async def execute(self, input_dto: MarkOverdueInput) -> MarkOverdueResult:
-        """Execute the MarkOverdue use case.
+        """Execute the MarkOverdue use case for a single chunk."""
+        now = datetime.now(UTC)
+
+        marked = await self._boleto_repository.mark_overdue_batch(
+            now=now,
+            limit=input_dto.batch_size,
+        )
+
+        events = [
+            BoletoOverdueMarked(
+                boleto_id=marking.boleto_id,
+                tenant_id=str(marking.tenant_id),
+                due_date=marking.due_date.date().isoformat(),
+                occurred_at=now,
+            )
+            for marking in marked
+        ]
 
-        Note: This requires a specialized repository method to query
-        boletos by status and due_date. For MVP, we'll implement
-        the logic in the Celery task directly with raw queries.
-        """
         return MarkOverdueResult(
-            processed=0,
-            marked_overdue=0,
-            timestamp=datetime.now(timezone.utc),
+            processed=len(marked),
+            marked_overdue=len(marked),
+            timestamp=now,
+            events=events,
         )
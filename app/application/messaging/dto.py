@@ -31,3 +31,13 @@ class MarkMessageFailedInput:
     item_id: str
     error: str
     should_retry: bool = True
+
+
+@dataclass(frozen=True)
+class DeliverOutboxInput:
+    """Input for DeliverOutbox use case (one batch)."""
+
+    worker_id: str
+    batch_size: int = 50
+    per_tenant_limit: int | None = None
+    lease_seconds: int = 300
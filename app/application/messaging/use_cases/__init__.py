@@ -1,9 +1,15 @@
 """Messaging use cases."""
 
+from app.application.messaging.use_cases.deliver_outbox import DeliverOutboxUseCase
 from app.application.messaging.use_cases.mark_message_failed import (
     MarkMessageFailedUseCase,
 )
 from app.application.messaging.use_cases.mark_message_sent import MarkMessageSentUseCase
 from app.application.messaging.use_cases.queue_message import QueueMessageUseCase
 
-__all__ = ["QueueMessageUseCase", "MarkMessageSentUseCase", "MarkMessageFailedUseCase"]
+__all__ = [
+    "QueueMessageUseCase",
+    "MarkMessageSentUseCase",
+    "MarkMessageFailedUseCase",
+    "DeliverOutboxUseCase",
+]
@@ -0,0 +1,213 @@
+"""DeliverOutbox use case.
+
+Delivers a batch of pending outbox items through the messaging provider.
+
+Invariants enforced:
+- Opted-out or missing contacts are never messaged
+- At most `concurrency` provider calls in flight
+- Tenants are served round-robin so one bulk send cannot starve others
+- Items are leased to one worker, so concurrent workers never overlap
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from app.application.messaging.dto import DeliverOutboxInput
+from app.application.ports.providers.messaging import MessagingProviderPort
+from app.application.ports.repositories.contacts import ContactRepositoryPort
+from app.application.ports.repositories.messaging import OutboxRepositoryPort
+from app.config.logging import get_logger
+from app.domain.contacts.entities.contact import Contact
+from app.domain.contacts.value_objects.contact_id import ContactId
+from app.domain.messaging.entities.outbox_item import MessageOutboxItem
+
+logger = get_logger("messaging.deliver_outbox")
+
+MAX_RETRIES = 5
+
+
+@dataclass
+class DeliverOutboxResult:
+    """Result from DeliverOutbox use case."""
+
+    processed: int
+    sent: int
+    failed: int
+    skipped: int
+    timestamp: datetime
+
+
+def interleave_by_tenant(items: Sequence[MessageOutboxItem]) -> list[MessageOutboxItem]:
+    """Order items round-robin across tenants.
+
+    Preserves each tenant's own order (oldest first); tenants take turns
+    in order of their first item.
+    """
+    queues: OrderedDict[str, deque[MessageOutboxItem]] = OrderedDict()
+    for item in items:
+        queues.setdefault(str(item.tenant_id), deque()).append(item)
+
+    ordered: list[MessageOutboxItem] = []
+    while queues:
+        for tenant in list(queues):
+            queue = queues[tenant]
+            ordered.append(queue.popleft())
+            if not queue:
+                del queues[tenant]
+    return ordered
+
+
+class DeliverOutboxUseCase:
+    """Use case for delivering a batch of outbox messages concurrently."""
+
+    def __init__(
+        self,
+        outbox_repository: OutboxRepositoryPort,
+        contact_repository: ContactRepositoryPort,
+        messaging_provider: MessagingProviderPort,
+        concurrency: int = 10,
+    ) -> None:
+        self._outbox_repository = outbox_repository
+        self._contact_repository = contact_repository
+        self._provider = messaging_provider
+        self._concurrency = max(concurrency, 1)
+
+    async def execute(self, input_dto: DeliverOutboxInput) -> DeliverOutboxResult:
+        """Execute the DeliverOutbox use case.
+
+        Items are claimed, sent with bounded parallelism, then all status
+        changes are written back in one bulk update. The caller commits.
+        Callers that want row locks released during sends should call
+        claim(), commit, then deliver().
+        """
+        items = await self.claim(input_dto)
+        return await self.deliver(items, input_dto.worker_id)
+
+    async def claim(self, input_dto: DeliverOutboxInput) -> list[MessageOutboxItem]:
+        """Lease a batch of due items to input_dto.worker_id."""
+        items = await self._outbox_repository.claim_pending(
+            worker_id=input_dto.worker_id,
+            lease_seconds=input_dto.lease_seconds,
+            limit=input_dto.batch_size,
+            per_tenant_limit=input_dto.per_tenant_limit,
+        )
+        logger.info(
+            "outbox_batch_claimed",
+            worker_id=input_dto.worker_id,
+            claimed=len(items),
+        )
+        return items
+
+    async def deliver(
+        self, items: Sequence[MessageOutboxItem], worker_id: str
+    ) -> DeliverOutboxResult:
+        """Deliver items leased to worker_id and persist their new status."""
+        logger.info(
+            "processing_outbox_batch",
+            pending_count=len(items),
+            concurrency=self._concurrency,
+        )
+
+        if not items:
+            return DeliverOutboxResult(
+                processed=0,
+                sent=0,
+                failed=0,
+                skipped=0,
+                timestamp=datetime.now(UTC),
+            )
+
+        contacts = {
+            contact.id: contact
+            for contact in await self._contact_repository.get_by_ids(
+                list({item.contact_id for item in items})
+            )
+        }
+
+        counts = {"sent": 0, "failed": 0, "skipped": 0}
+        queue = iter(interleave_by_tenant(items))
+
+        async def worker() -> None:
+            # Single event loop: next() on the shared iterator is race-free
+            for item in queue:
+                outcome = await self._deliver_one(item, contacts)
+                counts[outcome] += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(self._concurrency, len(items)))))
+
+        saved = await self._outbox_repository.save_many(items, worker_id)
+        if saved < len(items):
+            # Lease lapsed mid-batch; another worker re-claimed those rows
+            logger.warning(
+                "outbox_lease_lost",
+                worker_id=worker_id,
+                lost=len(items) - saved,
+            )
+
+        return DeliverOutboxResult(
+            processed=len(items),
+            sent=counts["sent"],
+            failed=counts["failed"],
+            skipped=counts["skipped"],
+            timestamp=datetime.now(UTC),
+        )
+
+    async def _deliver_one(
+        self,
+        item: MessageOutboxItem,
+        contacts: dict[ContactId, Contact],
+    ) -> str:
+        """Send one item and update it in place. Returns outcome bucket."""
+        contact = contacts.get(item.contact_id)
+
+        if contact is None or contact.opted_out:
+            logger.info(
+                "skipping_opted_out_contact",
+                item_id=str(item.id),
+                contact_id=str(item.contact_id),
+            )
+            item.mark_as_failed("Contact opted out or not found")
+            return "skipped"
+
+        try:
+            result = await self._provider.send(
+                recipient_phone=contact.phone_number.value,
+                message_type=item.message_type.value,
+                payload=item.payload,
+            )
+            error = None if result.success else (result.error or "Unknown error")
+        except Exception as e:
+            logger.exception(
+                "message_delivery_error",
+                item_id=str(item.id),
+                error=str(e),
+            )
+            error = str(e)
+            result = None
+
+        if error is None:
+            item.increment_attempt()
+            item.mark_as_sent()
+            logger.info(
+                "message_sent",
+                item_id=str(item.id),
+                provider_message_id=result.provider_message_id if result else None,
+            )
+            return "sent"
+
+        if item.attempt_count + 1 < MAX_RETRIES:
+            item.mark_for_retry(error)
+        else:
+            item.increment_attempt()
+            item.mark_as_failed(error)
+
+        logger.warning(
+            "message_delivery_failed",
+            item_id=str(item.id),
+            attempt=item.attempt_count,
+            error=error,
+        )
+        return "failed"
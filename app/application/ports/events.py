@@ -0,0 +1,21 @@
+"""Domain event publisher port.
+
+Defines the contract for handing domain events to downstream consumers.
+Publishing happens after the producing transaction commits.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+
+class EventPublisherPort(ABC):
+    """Port for publishing domain events."""
+
+    @abstractmethod
+    async def publish_many(self, events: Sequence[object]) -> None:
+        """Publish a batch of domain events.
+
+        Args:
+            events: Frozen domain event dataclasses, in occurrence order
+        """
+        ...
@@ -6,11 +6,11 @@ All implementations must return structured JSON - no prose.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
 
-class LLMErrorCode(str, Enum):
+class LLMErrorCode(StrEnum):
     """Error codes from LLM providers."""
 
     INVALID_INPUT = "invalid_input"
@@ -18,6 +18,8 @@ class LLMErrorCode(str, Enum):
     RATE_LIMITED = "rate_limited"
     API_ERROR = "api_error"
     PARSE_ERROR = "parse_error"
+    CIRCUIT_OPEN = "circuit_open"
+    BUDGET_EXHAUSTED = "budget_exhausted"
     UNKNOWN = "unknown"
 
 
@@ -64,6 +66,21 @@ class ExtractedEntitiesResult:
         }
 
 
+@dataclass(frozen=True)
+class IntentWithEntitiesResult:
+    """Result from combined intent classification + entity extraction.
+
+    Returns structured data - no prose.
+    """
+
+    success: bool
+    intent: str | None = None
+    confidence: float = 0.0
+    entities: ExtractedEntitiesResult | None = None
+    error_code: LLMErrorCode | None = None
+    error_message: str | None = None
+
+
 class LLMProviderPort(ABC):
     """Port for LLM operations.
 
@@ -96,9 +113,7 @@ class LLMProviderPort(ABC):
         ...
 
     @abstractmethod
-    async def extract_entities(
-        self, text: str, intent: str
-    ) -> ExtractedEntitiesResult:
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
         """Extract structured entities from text.
 
         Args:
@@ -115,3 +130,31 @@ class LLMProviderPort(ABC):
         - send_message: contact_name, message_content
         """
         ...
+
+    async def classify_and_extract(self, text: str) -> IntentWithEntitiesResult:
+        """Classify intent and extract entities in one call.
+
+        Providers that can do both in a single structured-output request
+        should override this. The default runs the two calls in sequence.
+
+        Args:
+            text: Normalized user input
+
+        Returns:
+            IntentWithEntitiesResult with intent, confidence and entities
+        """
+        intent_result = await self.classify_intent(text)
+        if not intent_result.success:
+            return IntentWithEntitiesResult(
+                success=False,
+                error_code=intent_result.error_code,
+                error_message=intent_result.error_message,
+            )
+
+        entities = await self.extract_entities(text, intent_result.intent or "unknown")
+        return IntentWithEntitiesResult(
+            success=True,
+            intent=intent_result.intent,
+            confidence=intent_result.confidence,
+            entities=entities if entities.success else None,
+        )
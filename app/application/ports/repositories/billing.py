@@ -1,6 +1,9 @@
 """Repository ports for Billing bounded context."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
 
 from app.domain.billing.entities.boleto import Boleto
 from app.domain.billing.entities.payment import Payment
@@ -8,6 +11,15 @@ from app.domain.billing.value_objects.boleto_id import BoletoId
 from app.domain.identity.value_objects.tenant_id import TenantId
 
 
+@dataclass(frozen=True)
+class OverdueMarking:
+    """A boleto flipped from SENT to OVERDUE by a bulk update."""
+
+    boleto_id: BoletoId
+    tenant_id: TenantId
+    due_date: datetime
+
+
 class BoletoRepositoryPort(ABC):
     """Port for Boleto persistence operations."""
 
@@ -16,6 +28,11 @@ class BoletoRepositoryPort(ABC):
         """Retrieve a boleto by its ID."""
         ...
 
+    @abstractmethod
+    async def get_by_ids(self, boleto_ids: Sequence[BoletoId]) -> list[Boleto]:
+        """Retrieve many boletos in a single query (missing IDs are omitted)."""
+        ...
+
     @abstractmethod
     async def get_by_provider_reference(self, provider_reference: str) -> Boleto | None:
         """Retrieve a boleto by its Paytime provider reference."""
@@ -27,12 +44,18 @@ class BoletoRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def exists_by_idempotency_key(
-        self, tenant_id: TenantId, idempotency_key: str
-    ) -> bool:
+    async def exists_by_idempotency_key(self, tenant_id: TenantId, idempotency_key: str) -> bool:
         """Check if a boleto with given idempotency key exists in tenant."""
         ...
 
+    @abstractmethod
+    async def mark_overdue_batch(self, now: datetime, limit: int) -> list[OverdueMarking]:
+        """Flip up to `limit` SENT boletos past due to OVERDUE in one statement.
+
+        Returns the boletos that were marked (empty when nothing is left).
+        """
+        ...
+
 
 class PaymentRepositoryPort(ABC):
     """Port for Payment persistence operations."""
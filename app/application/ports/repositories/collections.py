@@ -1,6 +1,9 @@
 """Repository ports for Collections bounded context."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
 
 from app.domain.billing.value_objects.boleto_id import BoletoId
 from app.domain.collections.entities.interest_policy import InterestPolicy
@@ -51,3 +54,71 @@ class ReminderScheduleRepositoryPort(ABC):
     async def cancel_for_boleto(self, boleto_id: BoletoId) -> int:
         """Cancel all pending reminders for a boleto. Returns count cancelled."""
         ...
+
+    @abstractmethod
+    async def mark_sent_many(self, schedule_ids: Sequence[ReminderScheduleId]) -> int:
+        """Mark pending reminders as sent and bump attempts in one statement."""
+        ...
+
+    @abstractmethod
+    async def cancel_many(self, schedule_ids: Sequence[ReminderScheduleId]) -> int:
+        """Cancel pending reminders in one statement. Returns count cancelled."""
+        ...
+
+
+@dataclass
+class OverdueInterestChunk:
+    """Column-oriented chunk of OVERDUE boletos joined to their active policy.
+
+    All lists are aligned by position.
+    """
+
+    boleto_ids: list[BoletoId] = field(default_factory=list)
+    tenant_ids: list[TenantId] = field(default_factory=list)
+    policy_ids: list[InterestPolicyId] = field(default_factory=list)
+    principal_cents: list[int] = field(default_factory=list)
+    due_dates: list[datetime] = field(default_factory=list)
+    grace_period_days: list[int] = field(default_factory=list)
+    daily_interest_rate_bps: list[int] = field(default_factory=list)
+    fixed_penalty_cents: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.boleto_ids)
+
+
+@dataclass(frozen=True)
+class InterestAccrualEntry:
+    """Interest ledger entry: total interest owed as of accrual_date."""
+
+    tenant_id: TenantId
+    boleto_id: BoletoId
+    policy_id: InterestPolicyId
+    accrual_date: date
+    days_overdue: int
+    principal_cents: int
+    interest_cents: int
+
+
+class InterestAccrualRepositoryPort(ABC):
+    """Port for the interest ledger and its batch source query."""
+
+    @abstractmethod
+    async def get_overdue_chunk(
+        self,
+        accrual_date: date,
+        after_boleto_id: BoletoId | None = None,
+        limit: int = 1000,
+    ) -> OverdueInterestChunk:
+        """Get OVERDUE boletos with an active policy, not yet accrued for the date.
+
+        Keyset-paginated by boleto id (ascending), starting after `after_boleto_id`.
+        """
+        ...
+
+    @abstractmethod
+    async def record_accruals(self, entries: Sequence[InterestAccrualEntry]) -> int:
+        """Insert ledger entries, ignoring (boleto_id, accrual_date) duplicates.
+
+        Returns count of entries actually inserted.
+        """
+        ...
@@ -5,6 +5,7 @@ Infrastructure layer provides concrete implementations.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from app.domain.contacts.entities.contact import Contact
 from app.domain.contacts.value_objects.contact_id import ContactId
@@ -32,9 +33,19 @@ class ContactRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def get_by_phone(
-        self, tenant_id: TenantId, phone_number: PhoneNumber
-    ) -> Contact | None:
+    async def get_by_ids(self, contact_ids: Sequence[ContactId]) -> list[Contact]:
+        """Retrieve many contacts in a single query.
+
+        Args:
+            contact_ids: The contact identifiers
+
+        Returns:
+            Contacts found (missing IDs are omitted, order not guaranteed)
+        """
+        ...
+
+    @abstractmethod
+    async def get_by_phone(self, tenant_id: TenantId, phone_number: PhoneNumber) -> Contact | None:
         """Retrieve a contact by phone number within a tenant.
 
         Args:
@@ -71,9 +82,7 @@ class ContactRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def phone_exists_in_tenant(
-        self, tenant_id: TenantId, phone_number: PhoneNumber
-    ) -> bool:
+    async def phone_exists_in_tenant(self, tenant_id: TenantId, phone_number: PhoneNumber) -> bool:
         """Check if a phone number is already registered in a tenant.
 
         Args:
@@ -1,6 +1,7 @@
 """Repository ports for Messaging bounded context."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from app.domain.identity.value_objects.tenant_id import TenantId
 from app.domain.messaging.entities.outbox_item import MessageOutboxItem
@@ -20,16 +21,56 @@ class OutboxRepositoryPort(ABC):
         """Persist an outbox item (create or update)."""
         ...
 
+    @abstractmethod
+    async def add_many(self, items: Sequence[MessageOutboxItem]) -> int:
+        """Insert new items in one statement.
+
+        Items whose (tenant_id, idempotency_key) already exists are skipped.
+        Returns count of items actually inserted.
+        """
+        ...
+
+    @abstractmethod
+    async def save_many(self, items: Sequence[MessageOutboxItem], worker_id: str) -> int:
+        """Persist delivery state of leased items in one bulk statement.
+
+        Only rows still leased to worker_id are written (and released);
+        a row re-claimed after the lease lapsed belongs to its new owner.
+        Returns count of items actually written.
+        """
+        ...
+
     @abstractmethod
     async def get_pending(
-        self, tenant_id: TenantId | None = None, limit: int = 100
+        self,
+        tenant_id: TenantId | None = None,
+        limit: int = 100,
+        per_tenant_limit: int | None = None,
     ) -> list[MessageOutboxItem]:
-        """Get pending items ready for delivery."""
+        """Get pending items ready for delivery.
+
+        per_tenant_limit caps how many items a single tenant contributes,
+        so one tenant's backlog cannot fill the whole batch.
+        """
+        ...
+
+    @abstractmethod
+    async def claim_pending(
+        self,
+        worker_id: str,
+        lease_seconds: int,
+        limit: int = 100,
+        per_tenant_limit: int | None = None,
+    ) -> list[MessageOutboxItem]:
+        """Lease due items to one worker.
+
+        Rows locked by a concurrent claim are skipped, and rows whose
+        lease has expired (worker died mid-batch) are claimed again.
+        The lease is released by save_many.
+        """
         ...
 
     @abstractmethod
-    async def exists_by_idempotency_key(
-        self, tenant_id: TenantId, idempotency_key: str
-    ) -> bool:
+    async def exists_by_idempotency_key(self, tenant_id: TenantId, idempotency_key: str) -> bool:
         """Check if an item with given idempotency key exists."""
         ...
@@ -44,12 +44,13 @@ class BoletoPaid:
 @dataclass(frozen=True)
 class BoletoOverdueMarked:
     """Event raised when a boleto is marked as overdue by scheduled job.
-    
+
     Note: This is applied by a background job in the Collections context,
     not by real-time due date checking.
     """
 
     boleto_id: BoletoId
+    tenant_id: str
     due_date: str
     occurred_at: datetime
 
@@ -1,12 +1,67 @@
 """InterestPolicy entity."""
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 
 from app.domain.collections.value_objects.interest_policy_id import InterestPolicyId
 from app.domain.identity.value_objects.tenant_id import TenantId
 
 
+def compute_interest_cents(
+    principal_cents: int,
+    days_overdue: int,
+    grace_period_days: int,
+    daily_interest_rate_bps: int,
+    fixed_penalty_cents: int,
+) -> int:
+    """Interest rule shared by single and batch calculation.
+
+    Simple daily interest on the principal for days past the grace period,
+    plus a fixed penalty. Integer math only - rounds down to the cent.
+    """
+    if days_overdue <= grace_period_days:
+        return 0
+
+    effective_days = days_overdue - grace_period_days
+    interest = principal_cents * daily_interest_rate_bps * effective_days // 10000
+
+    return interest + fixed_penalty_cents
+
+
+def compute_interest_batch(
+    principal_cents: Sequence[int],
+    days_overdue: Sequence[int],
+    grace_period_days: Sequence[int],
+    daily_interest_rate_bps: Sequence[int],
+    fixed_penalty_cents: Sequence[int],
+) -> list[int]:
+    """Apply compute_interest_cents element-wise over equally sized columns.
+
+    Each position may carry a different tenant policy.
+    """
+    if not (
+        len(principal_cents)
+        == len(days_overdue)
+        == len(grace_period_days)
+        == len(daily_interest_rate_bps)
+        == len(fixed_penalty_cents)
+    ):
+        raise ValueError("Interest batch columns must have the same length")
+
+    return [
+        compute_interest_cents(principal, days, grace, bps, penalty)
+        for principal, days, grace, bps, penalty in zip(
+            principal_cents,
+            days_overdue,
+            grace_period_days,
+            daily_interest_rate_bps,
+            fixed_penalty_cents,
+            strict=True,
+        )
+    ]
+
+
 @dataclass
 class InterestPolicy:
     """InterestPolicy entity.
@@ -25,8 +80,8 @@ class InterestPolicy:
     daily_interest_rate_bps: int
     fixed_penalty_cents: int
     is_active: bool = True
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
 
     def __post_init__(self) -> None:
         self._validate()
@@ -68,15 +123,13 @@ class InterestPolicy:
         Returns:
             Interest amount in cents
         """
-        if days_overdue <= self.grace_period_days:
-            return 0
-
-        effective_days = days_overdue - self.grace_period_days
-
-        daily_rate = self.daily_interest_rate_bps / 10000
-        interest = int(principal_cents * daily_rate * effective_days)
-
-        return interest + self.fixed_penalty_cents
+        return compute_interest_cents(
+            principal_cents,
+            days_overdue,
+            self.grace_period_days,
+            self.daily_interest_rate_bps,
+            self.fixed_penalty_cents,
+        )
 
     def deactivate(self) -> None:
         """Deactivate this policy."""
@@ -85,7 +138,7 @@ class InterestPolicy:
 
     def _touch(self) -> None:
         """Update the updated_at timestamp."""
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = datetime.now(UTC)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, InterestPolicy):
@@ -10,6 +10,11 @@ celery_app = Celery(
     "iris",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
+    include=[
+        "app.infrastructure.celery.tasks.billing",
+        "app.infrastructure.celery.tasks.collections",
+        "app.infrastructure.celery.tasks.messaging",
+    ],
 )
 
 celery_app.conf.update(
@@ -26,4 +31,11 @@ celery_app.conf.update(
     task_reject_on_worker_lost=True,
 )
 
-celery_app.conf.beat_schedule = {}
+# Outbox delivery is triggered by the outbox dispatcher (LISTEN/NOTIFY);
+# this low-frequency poll only catches scheduled items and missed wakeups.
+celery_app.conf.beat_schedule = {
+    "deliver-outbox-safety-net": {
+        "task": "messaging.deliver_outbox_messages",
+        "schedule": float(settings.outbox_poll_interval_seconds),
+    },
+}
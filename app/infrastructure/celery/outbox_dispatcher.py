@@ -0,0 +1,151 @@
+"""Outbox dispatcher.
+
+Long-lived process that LISTENs on the outbox notification channel and
+enqueues a delivery task as soon as due messages are committed, so
+interactive sends do not wait for the next beat poll.
+
+Run with:
+    python -m app.infrastructure.celery.outbox_dispatcher
+"""
+
+import asyncio
+import contextlib
+import signal
+from collections.abc import Callable
+from typing import Any
+
+import asyncpg
+
+from app.config.logging import configure_logging, get_logger
+from app.config.settings import Settings, get_settings
+from app.infrastructure.db.repositories.messaging import OUTBOX_NOTIFY_CHANNEL
+
+logger = get_logger("outbox_dispatcher")
+
+# How often an idle listener checks that its connection is still alive
+HEALTH_CHECK_SECONDS = 30.0
+RECONNECT_DELAY_SECONDS = 5.0
+
+
+def listener_dsn(database_url: str) -> str:
+    """Convert the SQLAlchemy URL into a plain asyncpg DSN."""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class OutboxDispatcher:
+    """Turns outbox NOTIFY events into delivery task runs.
+
+    Notifications arriving within `debounce_seconds` of each other are
+    coalesced into one trigger. A trigger is also fired on every
+    (re)connect to catch up on anything committed while disconnected.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        trigger: Callable[[], Any],
+        debounce_seconds: float = 0.2,
+        channel: str = OUTBOX_NOTIFY_CHANNEL,
+    ) -> None:
+        self._dsn = dsn
+        self._trigger = trigger
+        self._debounce_seconds = debounce_seconds
+        self._channel = channel
+        self._wake = asyncio.Event()
+        self.notifications = 0
+        self.dispatches = 0
+
+    def _on_notify(self, *_: Any) -> None:
+        self.notifications += 1
+        self._wake.set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Listen until `stop` is set, reconnecting on connection loss."""
+        while not stop.is_set():
+            try:
+                conn = await asyncpg.connect(self._dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("outbox_listener_connect_failed", error=str(e))
+                await self._sleep_or_stop(stop, RECONNECT_DELAY_SECONDS)
+                continue
+
+            try:
+                await conn.add_listener(self._channel, self._on_notify)
+                logger.info("outbox_listener_started", channel=self._channel)
+                self._wake.set()
+                await self._dispatch_loop(conn, stop)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("outbox_listener_lost", error=str(e))
+                await self._sleep_or_stop(stop, RECONNECT_DELAY_SECONDS)
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+    async def _dispatch_loop(self, conn: asyncpg.Connection, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=HEALTH_CHECK_SECONDS)
+            except TimeoutError:
+                await conn.execute("SELECT 1")
+                continue
+
+            # Let a burst of commits land before triggering once
+            await asyncio.sleep(self._debounce_seconds)
+            self._wake.clear()
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        try:
+            self._trigger()
+            self.dispatches += 1
+        except Exception as e:
+            # Broker hiccup: the beat poll still delivers eventually
+            logger.exception("outbox_dispatch_failed", error=str(e))
+            return
+        logger.debug(
+            "outbox_dispatched",
+            notifications=self.notifications,
+            dispatches=self.dispatches,
+        )
+
+    @staticmethod
+    async def _sleep_or_stop(stop: asyncio.Event, seconds: float) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), timeout=seconds)
+
+
+def _enqueue_delivery() -> None:
+    from app.infrastructure.celery.tasks.messaging import deliver_outbox_messages
+
+    deliver_outbox_messages.delay()
+
+
+async def run_dispatcher(settings: Settings | None = None) -> None:
+    """Run the dispatcher until SIGINT/SIGTERM."""
+    settings = settings or get_settings()
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    dispatcher = OutboxDispatcher(
+        dsn=listener_dsn(settings.database_url),
+        trigger=_enqueue_delivery,
+        debounce_seconds=settings.outbox_dispatch_debounce_ms / 1000,
+    )
+    await dispatcher.run(stop)
+    logger.info(
+        "outbox_dispatcher_stopped",
+        notifications=dispatcher.notifications,
+        dispatches=dispatcher.dispatches,
+    )
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(run_dispatcher())
+
+
+if __name__ == "__main__":
+    main()
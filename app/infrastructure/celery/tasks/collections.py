@@ -5,28 +5,16 @@ and reminder scheduling.
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import UTC, datetime
 
 from celery import shared_task
-from sqlalchemy import select, update
 
 from app.config.logging import get_logger
-from app.domain.billing.value_objects.boleto_status import BoletoStatus
-from app.infrastructure.db.models.billing import BoletoModel
-from app.infrastructure.db.models.collections import (
-    InterestPolicyModel,
-    ReminderScheduleModel,
-)
-from app.infrastructure.db.repositories.collections import (
-    InterestPolicyRepository,
-    ReminderScheduleRepository,
-)
-from app.infrastructure.db.repositories.messaging import OutboxRepository
 from app.domain.messaging.entities.outbox_item import MessageOutboxItem
 from app.domain.messaging.value_objects.message_type import MessageType
-from app.domain.identity.value_objects.tenant_id import TenantId
-from app.domain.contacts.value_objects.contact_id import ContactId
-
+from app.infrastructure.db.repositories.collections import ReminderScheduleRepository
+from app.infrastructure.db.repositories.messaging import OutboxRepository
 
 logger = get_logger("collections_tasks")
 
@@ -37,45 +25,81 @@ logger = get_logger("collections_tasks")
     max_retries=3,
     default_retry_delay=60,
 )
-def mark_overdue_boletos(self, batch_size: int = 100) -> dict:
+def mark_overdue_boletos(
+    self,  # noqa: ARG001
+    batch_size: int = 1000,
+    time_budget_seconds: float = 120.0,
+) -> dict:
     """Mark SENT boletos as OVERDUE when due date has passed.
 
+    Set-based: each chunk is a single UPDATE ... RETURNING committed on its
+    own. Chunks repeat until the backlog is drained or the time budget is
+    spent; leftovers are picked up by the next beat tick.
+
     Idempotency: Safe to run multiple times - only marks SENT boletos.
     """
     return asyncio.get_event_loop().run_until_complete(
-        _mark_overdue_async(batch_size)
+        _mark_overdue_async(batch_size, time_budget_seconds)
     )
 
 
-async def _mark_overdue_async(batch_size: int) -> dict:
+async def _mark_overdue_async(batch_size: int, time_budget_seconds: float) -> dict:
     """Async implementation of mark_overdue."""
+    from app.application.collections.dto import MarkOverdueInput
+    from app.application.collections.use_cases.mark_overdue import MarkOverdueUseCase
+    from app.infrastructure.db.repositories.billing import BoletoRepository
     from app.infrastructure.db.session import async_session_factory
+    from app.infrastructure.providers.event_publisher_stub import StubEventPublisher
+
+    publisher = StubEventPublisher()
+    started = time.monotonic()
+    deadline = started + time_budget_seconds
 
     marked_count = 0
-    now = datetime.now(timezone.utc)
+    chunks = 0
+    drained = False
 
-    async with async_session_factory() as session:
-        result = await session.execute(
-            select(BoletoModel)
-            .where(
-                BoletoModel.status == "sent",
-                BoletoModel.due_date < now,
-            )
-            .limit(batch_size)
+    while True:
+        async with async_session_factory() as session:
+            use_case = MarkOverdueUseCase(boleto_repository=BoletoRepository(session))
+            result = await use_case.execute(MarkOverdueInput(batch_size=batch_size))
+            await session.commit()
+
+        if result.marked_overdue == 0:
+            drained = True
+            break
+
+        # Publish only after the chunk is committed
+        await publisher.publish_many(result.events)
+
+        chunks += 1
+        marked_count += result.marked_overdue
+
+        logger.info(
+            "mark_overdue_chunk_complete",
+            chunk=chunks,
+            marked_overdue=result.marked_overdue,
         )
-        boletos = result.scalars().all()
 
-        for boleto in boletos:
-            boleto.status = "overdue"
-            boleto.updated_at = now
-            marked_count += 1
+        if result.marked_overdue < batch_size:
+            drained = True
+            break
 
-        await session.commit()
+        if time.monotonic() >= deadline:
+            logger.warning(
+                "mark_overdue_time_budget_exhausted",
+                chunks=chunks,
+                marked_overdue=marked_count,
+            )
+            break
 
     summary = {
-        "processed": len(boletos) if boletos else 0,
+        "processed": marked_count,
         "marked_overdue": marked_count,
-        "timestamp": now.isoformat(),
+        "chunks": chunks,
+        "drained": drained,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "timestamp": datetime.now(UTC).isoformat(),
     }
 
     logger.info("mark_overdue_complete", **summary)
@@ -88,71 +112,85 @@ async def _mark_overdue_async(batch_size: int) -> dict:
     max_retries=3,
     default_retry_delay=60,
 )
-def apply_interest(self, batch_size: int = 100) -> dict:
-    """Apply interest to overdue boletos based on tenant policy.
-
-    Idempotency: Tracks applied interest per boleto (future: audit table).
-    MVP: Logs interest calculation but does not modify boleto amount.
+def apply_interest(
+    self,  # noqa: ARG001
+    batch_size: int = 1000,
+    time_budget_seconds: float = 200.0,
+) -> dict:
+    """Accrue interest on overdue boletos based on tenant policy.
+
+    Walks OVERDUE boletos in keyset-paginated chunks (one joined query and
+    one bulk insert per chunk) until drained or the time budget is spent.
+
+    Idempotency: Ledger is keyed by (boleto_id, accrual_date) - already
+    accrued boletos are skipped, so re-runs on the same day are no-ops.
     """
     return asyncio.get_event_loop().run_until_complete(
-        _apply_interest_async(batch_size)
+        _apply_interest_async(batch_size, time_budget_seconds)
     )
 
 
-async def _apply_interest_async(batch_size: int) -> dict:
+async def _apply_interest_async(batch_size: int, time_budget_seconds: float) -> dict:
     """Async implementation of apply_interest."""
+    from app.application.collections.dto import ApplyInterestInput
+    from app.application.collections.use_cases.apply_interest import ApplyInterestUseCase
+    from app.infrastructure.db.repositories.collections import InterestAccrualRepository
     from app.infrastructure.db.session import async_session_factory
 
+    started = time.monotonic()
+    deadline = started + time_budget_seconds
+    accrual_date = datetime.now(UTC).date()
+
     processed = 0
+    accrued = 0
     total_interest = 0
-    now = datetime.now(timezone.utc)
-
-    async with async_session_factory() as session:
-        result = await session.execute(
-            select(BoletoModel)
-            .where(BoletoModel.status == "overdue")
-            .limit(batch_size)
-        )
-        boletos = result.scalars().all()
-
-        for boleto in boletos:
-            policy_result = await session.execute(
-                select(InterestPolicyModel).where(
-                    InterestPolicyModel.tenant_id == boleto.tenant_id,
-                    InterestPolicyModel.is_active == True,
+    chunks = 0
+    cursor: str | None = None
+    drained = False
+
+    while True:
+        async with async_session_factory() as session:
+            use_case = ApplyInterestUseCase(accrual_repository=InterestAccrualRepository(session))
+            result = await use_case.execute(
+                ApplyInterestInput(
+                    batch_size=batch_size,
+                    accrual_date=accrual_date,
+                    after_boleto_id=cursor,
                 )
             )
-            policy = policy_result.scalar_one_or_none()
-
-            if policy is None:
-                continue
-
-            days_overdue = (now.date() - boleto.due_date.date()).days
-            if days_overdue <= policy.grace_period_days:
-                continue
-
-            effective_days = days_overdue - policy.grace_period_days
-            daily_rate = policy.daily_interest_rate_bps / 10000
-            interest = int(boleto.amount_cents * daily_rate * effective_days)
-            interest += policy.fixed_penalty_cents
-
-            total_interest += interest
-            processed += 1
-
-            logger.info(
-                "interest_calculated",
-                boleto_id=str(boleto.id),
-                principal=boleto.amount_cents,
-                days_overdue=days_overdue,
-                interest=interest,
+            await session.commit()
+
+        if result.processed == 0:
+            drained = True
+            break
+
+        chunks += 1
+        processed += result.processed
+        accrued += result.interest_applied
+        total_interest += result.total_interest_cents
+        cursor = result.last_boleto_id
+
+        if result.processed < batch_size:
+            drained = True
+            break
+
+        if time.monotonic() >= deadline:
+            logger.warning(
+                "apply_interest_time_budget_exhausted",
+                chunks=chunks,
+                processed=processed,
             )
-
-        await session.commit()
+            break
 
     summary = {
         "processed": processed,
+        "interest_applied": accrued,
         "total_interest_cents": total_interest,
-        "timestamp": now.isoformat(),
+        "chunks": chunks,
+        "drained": drained,
+        "accrual_date": accrual_date.isoformat(),
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "timestamp": datetime.now(UTC).isoformat(),
     }
 
     logger.info("apply_interest_complete", **summary)
@@ -165,74 +203,86 @@ async def _apply_interest_async(batch_size: int) -> dict:
     max_retries=3,
     default_retry_delay=60,
 )
-def schedule_reminders(self, batch_size: int = 50) -> dict:
+def schedule_reminders(self, batch_size: int = 50) -> dict:  # noqa: ARG001
     """Process pending reminders and queue them via Messaging.
 
     Idempotency: Uses reminder schedule status to track sent reminders.
     """
-    return asyncio.get_event_loop().run_until_complete(
-        _schedule_reminders_async(batch_size)
-    )
+    return asyncio.get_event_loop().run_until_complete(_schedule_reminders_async(batch_size))
 
 
 async def _schedule_reminders_async(batch_size: int) -> dict:
-    """Async implementation of schedule_reminders."""
-    from app.infrastructure.db.session import async_session_factory
+    """Async implementation of schedule_reminders.
+
+    Fixed number of round trips per batch regardless of size: pending
+    schedules, boletos (IN), contacts (IN), one bulk outbox insert and one
+    bulk status update per target status.
+    """
+    from app.infrastructure.db.repositories.billing import BoletoRepository
     from app.infrastructure.db.repositories.contacts import ContactRepository
+    from app.infrastructure.db.session import async_session_factory
 
-    sent_count = 0
-    skipped_count = 0
-    now = datetime.now(timezone.utc)
+    now = datetime.now(UTC)
 
     async with async_session_factory() as session:
         reminder_repo = ReminderScheduleRepository(session)
         outbox_repo = OutboxRepository(session)
+        boleto_repo = BoletoRepository(session)
         contact_repo = ContactRepository(session)
 
         pending = await reminder_repo.get_pending(limit=batch_size)
 
-        for schedule in pending:
-            boleto_result = await session.execute(
-                select(BoletoModel).where(BoletoModel.id == schedule.boleto_id.value)
+        boletos = {
+            boleto.id: boleto
+            for boleto in await boleto_repo.get_by_ids([schedule.boleto_id for schedule in pending])
+        }
+        contacts = {
+            contact.id: contact
+            for contact in await contact_repo.get_by_ids(
+                list({boleto.contact_id for boleto in boletos.values()})
             )
-            boleto = boleto_result.scalar_one_or_none()
+        }
+
+        outbox_items: list[MessageOutboxItem] = []
+        sent_ids = []
+        cancelled_ids = []
 
-            if boleto is None or boleto.status in ("paid", "cancelled"):
-                schedule.cancel()
-                await reminder_repo.save(schedule)
-                skipped_count += 1
+        for schedule in pending:
+            boleto = boletos.get(schedule.boleto_id)
+            if boleto is None or boleto.is_paid() or boleto.is_cancelled():
+                cancelled_ids.append(schedule.id)
                 continue
 
-            contact = await contact_repo.get_by_id(schedule.boleto_id)
+            contact = contacts.get(boleto.contact_id)
             if contact is None or contact.opted_out:
-                schedule.cancel()
-                await reminder_repo.save(schedule)
-                skipped_count += 1
+                cancelled_ids.append(schedule.id)
                 continue
 
-            outbox_item = MessageOutboxItem.create(
-                tenant_id=schedule.tenant_id,
-                contact_id=ContactId(value=boleto.contact_id),
-                message_type=MessageType.REMINDER,
-                payload={
-                    "boleto_id": str(schedule.boleto_id),
-                    "amount_cents": boleto.amount_cents,
-                    "due_date": boleto.due_date.isoformat(),
-                },
-                idempotency_key=f"reminder_{schedule.id}_{schedule.attempt_count}",
+            outbox_items.append(
+                MessageOutboxItem.create(
+                    tenant_id=schedule.tenant_id,
+                    contact_id=boleto.contact_id,
+                    message_type=MessageType.REMINDER,
+                    payload={
+                        "boleto_id": str(schedule.boleto_id),
+                        "amount_cents": boleto.amount.amount_cents,
+                        "due_date": boleto.due_date.value.isoformat(),
+                    },
+                    idempotency_key=f"reminder_{schedule.id}_{schedule.attempt_count}",
+                )
             )
+            sent_ids.append(schedule.id)
 
-            await outbox_repo.save(outbox_item)
-
-            schedule.mark_as_sent()
-            await reminder_repo.save(schedule)
-            sent_count += 1
+        queued_count = await outbox_repo.add_many(outbox_items)
+        sent_count = await reminder_repo.mark_sent_many(sent_ids)
+        skipped_count = await reminder_repo.cancel_many(cancelled_ids)
 
         await session.commit()
 
     summary = {
         "processed": len(pending),
         "sent": sent_count,
+        "queued": queued_count,
         "skipped": skipped_count,
         "timestamp": now.isoformat(),
     }
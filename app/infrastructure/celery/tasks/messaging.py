@@ -4,23 +4,24 @@ Implements the Outbox Pattern delivery worker.
 """
 
 import asyncio
-from datetime import datetime, timezone
+import os
+import socket
+from uuid import uuid4
 
 from celery import shared_task
 
+from app.application.messaging.dto import DeliverOutboxInput
+from app.application.messaging.use_cases.deliver_outbox import DeliverOutboxUseCase
 from app.config.logging import get_logger
+from app.config.settings import get_settings
 from app.infrastructure.db.repositories.contacts import ContactRepository
 from app.infrastructure.db.repositories.messaging import OutboxRepository
-from app.infrastructure.db.session import get_sync_session
 from app.infrastructure.providers.messaging_stub import StubMessagingProvider
 
-
 logger = get_logger("messaging_tasks")
 
 
 MAX_BATCH_SIZE = 50
-MAX_RETRIES = 5
-RETRY_BACKOFF_SECONDS = [60, 300, 900, 3600, 7200]
 
 
 @shared_task(
@@ -29,10 +30,12 @@ RETRY_BACKOFF_SECONDS = [60, 300, 900, 3600, 7200]
     max_retries=3,
     default_retry_delay=60,
 )
-def deliver_outbox_messages(self, batch_size: int = MAX_BATCH_SIZE) -> dict:
+def deliver_outbox_messages(self, batch_size: int = MAX_BATCH_SIZE) -> dict:  # noqa: ARG001
     """Deliver pending messages from the outbox.
 
-    Fetches pending items and delivers them using the messaging provider.
+    Claims a leased batch (SKIP LOCKED, so parallel workers get disjoint
+    rows), commits the claim, then delivers using the messaging provider
+    with bounded concurrency and per-tenant round-robin.
     Respects opt-out preferences and retry logic.
 
     Args:
@@ -41,100 +44,53 @@ def deliver_outbox_messages(self, batch_size: int = MAX_BATCH_SIZE) -> dict:
     Returns:
         Summary of processed messages
     """
-    return asyncio.get_event_loop().run_until_complete(
-        _deliver_outbox_messages_async(batch_size)
-    )
+    return asyncio.get_event_loop().run_until_complete(_deliver_outbox_messages_async(batch_size))
+
+
+def _lease_owner() -> str:
+    """Token owning one claim's leases.
+
+    Unique per claim, so a later claim by the same process never passes
+    the save_many fence for rows an earlier, lapsed claim lost.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex}"
 
 
 async def _deliver_outbox_messages_async(batch_size: int) -> dict:
     """Async implementation of outbox delivery."""
-    from sqlalchemy.ext.asyncio import AsyncSession
     from app.infrastructure.db.session import async_session_factory
 
-    sent_count = 0
-    failed_count = 0
-    skipped_count = 0
+    settings = get_settings()
 
-    async with async_session_factory() as session:
-        outbox_repo = OutboxRepository(session)
-        contact_repo = ContactRepository(session)
-        provider = StubMessagingProvider()
+    worker_id = _lease_owner()
 
-        pending_items = await outbox_repo.get_pending(limit=batch_size)
-
-        logger.info(
-            "processing_outbox_batch",
-            pending_count=len(pending_items),
-            batch_size=batch_size,
+    async with async_session_factory() as session:
+        use_case = DeliverOutboxUseCase(
+            outbox_repository=OutboxRepository(session),
+            contact_repository=ContactRepository(session),
+            messaging_provider=StubMessagingProvider(),
+            concurrency=settings.outbox_delivery_concurrency,
         )
+        items = await use_case.claim(
+            DeliverOutboxInput(
+                worker_id=worker_id,
+                batch_size=batch_size,
+                per_tenant_limit=settings.outbox_per_tenant_batch_limit,
+                lease_seconds=settings.outbox_lease_seconds,
+            )
+        )
+        # Persist the lease and drop row locks before the provider calls
+        await session.commit()
 
-        for item in pending_items:
-            try:
-                contact = await contact_repo.get_by_id(item.contact_id)
-
-                if contact is None or contact.opted_out:
-                    logger.info(
-                        "skipping_opted_out_contact",
-                        item_id=str(item.id),
-                        contact_id=str(item.contact_id),
-                    )
-                    item.mark_as_failed("Contact opted out or not found")
-                    await outbox_repo.save(item)
-                    skipped_count += 1
-                    continue
-
-                item.increment_attempt()
-
-                result = await provider.send(
-                    recipient_phone=contact.phone_number.value,
-                    message_type=item.message_type.value,
-                    payload=item.payload,
-                )
-
-                if result.success:
-                    item.mark_as_sent()
-                    await outbox_repo.save(item)
-                    sent_count += 1
-                    logger.info(
-                        "message_sent",
-                        item_id=str(item.id),
-                        provider_message_id=result.provider_message_id,
-                    )
-                else:
-                    if item.attempt_count < MAX_RETRIES:
-                        item.mark_for_retry(result.error or "Unknown error")
-                    else:
-                        item.mark_as_failed(result.error or "Max retries exceeded")
-                    await outbox_repo.save(item)
-                    failed_count += 1
-                    logger.warning(
-                        "message_delivery_failed",
-                        item_id=str(item.id),
-                        attempt=item.attempt_count,
-                        error=result.error,
-                    )
-
-            except Exception as e:
-                logger.exception(
-                    "message_delivery_error",
-                    item_id=str(item.id),
-                    error=str(e),
-                )
-                if item.attempt_count < MAX_RETRIES:
-                    item.mark_for_retry(str(e))
-                else:
-                    item.mark_as_failed(str(e))
-                await outbox_repo.save(item)
-                failed_count += 1
-
+        result = await use_case.deliver(items, worker_id)
         await session.commit()
 
     summary = {
-        "processed": len(pending_items),
-        "sent": sent_count,
-        "failed": failed_count,
-        "skipped": skipped_count,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "processed": result.processed,
+        "sent": result.sent,
+        "failed": result.failed,
+        "skipped": result.skipped,
+        "timestamp": result.timestamp.isoformat(),
     }
 
     logger.info("outbox_batch_complete", **summary)
@@ -3,6 +3,7 @@
 from app.infrastructure.db.models.base import Base
 from app.infrastructure.db.models.billing import BoletoModel, PaymentModel
 from app.infrastructure.db.models.collections import (
+    InterestAccrualModel,
     InterestPolicyModel,
     ReminderScheduleModel,
 )
@@ -19,5 +20,6 @@ __all__ = [
     "PaymentModel",
     "MessageOutboxModel",
     "InterestPolicyModel",
+    "InterestAccrualModel",
     "ReminderScheduleModel",
 ]
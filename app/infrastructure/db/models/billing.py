@@ -1,9 +1,18 @@
 """SQLAlchemy models for Billing bounded context."""
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +30,11 @@ class BoletoModel(Base):
             "idempotency_key",
             name="uq_boletos_tenant_idempotency",
         ),
+        Index(
+            "ix_boletos_sent_due_date",
+            "due_date",
+            postgresql_where=text("status = 'sent'"),
+        ),
     )
 
     id: Mapped[UUID] = mapped_column(
@@ -55,7 +69,11 @@ class BoletoModel(Base):
     )
     status: Mapped[str] = mapped_column(
         Enum(
-            "created", "sent", "paid", "overdue", "cancelled",
+            "created",
+            "sent",
+            "paid",
+            "overdue",
+            "cancelled",
             name="boleto_status_enum",
             create_type=True,
         ),
@@ -73,13 +91,13 @@ class BoletoModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
     )
 
     payment: Mapped["PaymentModel | None"] = relationship(
@@ -125,7 +143,7 @@ class PaymentModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
     )
 
     boleto: Mapped["BoletoModel"] = relationship(
@@ -1,9 +1,9 @@
 """SQLAlchemy models for Collections bounded context."""
 
-from datetime import datetime, timezone
+from datetime import UTC, date, datetime
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -57,13 +57,13 @@ class InterestPolicyModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
     )
 
 
@@ -95,7 +95,9 @@ class ReminderScheduleModel(Base):
     )
     status: Mapped[str] = mapped_column(
         Enum(
-            "pending", "sent", "cancelled",
+            "pending",
+            "sent",
+            "cancelled",
             name="reminder_status_enum",
             create_type=True,
         ),
@@ -111,5 +113,71 @@ class ReminderScheduleModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
+    )
+
+
+class InterestAccrualModel(Base):
+    """Interest ledger entry.
+
+    One row per overdue boleto per accrual date, holding the total
+    interest owed as of that date. (boleto_id, accrual_date) is the
+    idempotency key for the nightly accrual job.
+    """
+
+    __tablename__ = "interest_accruals"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "boleto_id",
+            "accrual_date",
+            name="uq_interest_accruals_boleto_date",
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+    )
+    tenant_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", name="fk_interest_accruals_tenant_id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    boleto_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("boletos.id", name="fk_interest_accruals_boleto_id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+    policy_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "interest_policies.id",
+            name="fk_interest_accruals_policy_id",
+            ondelete="RESTRICT",
+        ),
+        nullable=False,
+    )
+    accrual_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+    days_overdue: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    principal_cents: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    interest_cents: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
     )
@@ -1,9 +1,19 @@
 """SQLAlchemy models for Messaging bounded context."""
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,6 +31,11 @@ class MessageOutboxModel(Base):
             "idempotency_key",
             name="uq_message_outbox_tenant_idempotency",
         ),
+        Index(
+            "ix_message_outbox_deliverable",
+            "scheduled_at",
+            postgresql_where=text("status IN ('pending', 'retrying')"),
+        ),
     )
 
     id: Mapped[UUID] = mapped_column(
@@ -42,7 +57,9 @@ class MessageOutboxModel(Base):
     )
     message_type: Mapped[str] = mapped_column(
         Enum(
-            "boleto_send", "reminder", "notification",
+            "boleto_send",
+            "reminder",
+            "notification",
             name="message_type_enum",
             create_type=True,
         ),
@@ -50,7 +67,10 @@ class MessageOutboxModel(Base):
     )
     status: Mapped[str] = mapped_column(
         Enum(
-            "pending", "sent", "failed", "retrying",
+            "pending",
+            "sent",
+            "failed",
+            "retrying",
             name="delivery_status_enum",
             create_type=True,
         ),
@@ -78,20 +98,28 @@ class MessageOutboxModel(Base):
     scheduled_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
     )
     sent_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
     )
+    lease_owner: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+    )
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
     )
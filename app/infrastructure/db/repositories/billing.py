@@ -1,12 +1,14 @@
 """Repository implementations for Billing bounded context."""
 
+from collections.abc import Sequence
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.ports.repositories.billing import (
     BoletoRepositoryPort,
+    OverdueMarking,
     PaymentRepositoryPort,
 )
 from app.domain.billing.entities.boleto import Boleto
@@ -37,6 +39,15 @@ class BoletoRepository(BoletoRepositoryPort):
             return None
         return self._to_domain(model)
 
+    async def get_by_ids(self, boleto_ids: Sequence[BoletoId]) -> list[Boleto]:
+        """Retrieve many boletos in a single query."""
+        if not boleto_ids:
+            return []
+        result = await self._session.execute(
+            select(BoletoModel).where(BoletoModel.id.in_({bid.value for bid in boleto_ids}))
+        )
+        return [self._to_domain(model) for model in result.scalars().all()]
+
     async def save(self, boleto: Boleto) -> Boleto:
         """Persist a boleto (create or update)."""
         existing = await self._session.get(BoletoModel, boleto.id.value)
@@ -57,18 +68,14 @@ class BoletoRepository(BoletoRepositoryPort):
     async def get_by_provider_reference(self, provider_reference: str) -> Boleto | None:
         """Retrieve a boleto by its Paytime provider reference."""
         result = await self._session.execute(
-            select(BoletoModel).where(
-                BoletoModel.provider_reference == provider_reference
-            )
+            select(BoletoModel).where(BoletoModel.provider_reference == provider_reference)
         )
         model = result.scalar_one_or_none()
         if model is None:
             return None
         return self._to_domain(model)
 
-    async def exists_by_idempotency_key(
-        self, tenant_id: TenantId, idempotency_key: str
-    ) -> bool:
+    async def exists_by_idempotency_key(self, tenant_id: TenantId, idempotency_key: str) -> bool:
         """Check if a boleto with given idempotency key exists."""
         result = await self._session.execute(
             select(BoletoModel.id).where(
@@ -78,6 +85,44 @@ class BoletoRepository(BoletoRepositoryPort):
         )
         return result.scalar_one_or_none() is not None
 
+    async def mark_overdue_batch(self, now: datetime, limit: int) -> list[OverdueMarking]:
+        """Flip a chunk of SENT boletos past due to OVERDUE.
+
+        Single UPDATE ... RETURNING over a SKIP LOCKED candidate set, so
+        concurrent runs never block on or double-mark the same rows.
+        """
+        candidates = (
+            select(BoletoModel.id)
+            .where(
+                BoletoModel.status == BoletoStatus.SENT.value,
+                BoletoModel.due_date < now,
+            )
+            .order_by(BoletoModel.due_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+        result = await self._session.execute(
+            update(BoletoModel)
+            .where(
+                BoletoModel.id.in_(candidates),
+                BoletoModel.status == BoletoStatus.SENT.value,
+            )
+            .values(status=BoletoStatus.OVERDUE.value, updated_at=now)
+            .returning(BoletoModel.id, BoletoModel.tenant_id, BoletoModel.due_date)
+            .execution_options(synchronize_session=False)
+        )
+
+        return [
+            OverdueMarking(
+                boleto_id=BoletoId(value=row.id),
+                tenant_id=TenantId(value=row.tenant_id),
+                due_date=row.due_date,
+            )
+            for row in result.all()
+        ]
+
     @staticmethod
     def _to_domain(model: BoletoModel) -> Boleto:
         """Map SQLAlchemy model to domain entity."""
@@ -135,9 +180,7 @@ class PaymentRepository(PaymentRepositoryPort):
     async def get_by_idempotency_key(self, idempotency_key: str) -> Payment | None:
         """Retrieve payment by idempotency key (provider_reference)."""
         result = await self._session.execute(
-            select(PaymentModel).where(
-                PaymentModel.provider_reference == idempotency_key
-            )
+            select(PaymentModel).where(PaymentModel.provider_reference == idempotency_key)
         )
         model = result.scalar_one_or_none()
         if model is None:
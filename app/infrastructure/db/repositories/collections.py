@@ -1,12 +1,18 @@
 """Repository implementations for Collections bounded context."""
 
-from datetime import datetime, timezone
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+from uuid import uuid4
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.ports.repositories.collections import (
+    InterestAccrualEntry,
+    InterestAccrualRepositoryPort,
     InterestPolicyRepositoryPort,
+    OverdueInterestChunk,
     ReminderScheduleRepositoryPort,
 )
 from app.domain.billing.value_objects.boleto_id import BoletoId
@@ -16,7 +22,9 @@ from app.domain.collections.value_objects.interest_policy_id import InterestPoli
 from app.domain.collections.value_objects.reminder_schedule_id import ReminderScheduleId
 from app.domain.collections.value_objects.reminder_status import ReminderStatus
 from app.domain.identity.value_objects.tenant_id import TenantId
+from app.infrastructure.db.models.billing import BoletoModel
 from app.infrastructure.db.models.collections import (
+    InterestAccrualModel,
     InterestPolicyModel,
     ReminderScheduleModel,
 )
@@ -33,7 +41,7 @@ class InterestPolicyRepository(InterestPolicyRepositoryPort):
         result = await self._session.execute(
             select(InterestPolicyModel).where(
                 InterestPolicyModel.tenant_id == tenant_id.value,
-                InterestPolicyModel.is_active == True,
+                InterestPolicyModel.is_active.is_(True),
             )
         )
         model = result.scalar_one_or_none()
@@ -95,9 +103,7 @@ class ReminderScheduleRepository(ReminderScheduleRepositoryPort):
 
     async def get_by_id(self, schedule_id: ReminderScheduleId) -> ReminderSchedule | None:
         result = await self._session.execute(
-            select(ReminderScheduleModel).where(
-                ReminderScheduleModel.id == schedule_id.value
-            )
+            select(ReminderScheduleModel).where(ReminderScheduleModel.id == schedule_id.value)
         )
         model = result.scalar_one_or_none()
         if model is None:
@@ -105,7 +111,7 @@ class ReminderScheduleRepository(ReminderScheduleRepositoryPort):
         return self._to_domain(model)
 
     async def get_pending(self, limit: int = 100) -> list[ReminderSchedule]:
-        now = datetime.now(timezone.utc)
+        now = datetime.now(UTC)
         result = await self._session.execute(
             select(ReminderScheduleModel)
             .where(
@@ -119,9 +125,7 @@ class ReminderScheduleRepository(ReminderScheduleRepositoryPort):
 
     async def get_by_boleto(self, boleto_id: BoletoId) -> list[ReminderSchedule]:
         result = await self._session.execute(
-            select(ReminderScheduleModel).where(
-                ReminderScheduleModel.boleto_id == boleto_id.value
-            )
+            select(ReminderScheduleModel).where(ReminderScheduleModel.boleto_id == boleto_id.value)
         )
         return [self._to_domain(m) for m in result.scalars().all()]
 
@@ -151,6 +155,37 @@ class ReminderScheduleRepository(ReminderScheduleRepositoryPort):
         )
         return result.rowcount
 
+    async def mark_sent_many(self, schedule_ids: Sequence[ReminderScheduleId]) -> int:
+        if not schedule_ids:
+            return 0
+        result = await self._session.execute(
+            update(ReminderScheduleModel)
+            .where(
+                ReminderScheduleModel.id.in_({sid.value for sid in schedule_ids}),
+                ReminderScheduleModel.status == "pending",
+            )
+            .values(
+                status="sent",
+                attempt_count=ReminderScheduleModel.attempt_count + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def cancel_many(self, schedule_ids: Sequence[ReminderScheduleId]) -> int:
+        if not schedule_ids:
+            return 0
+        result = await self._session.execute(
+            update(ReminderScheduleModel)
+            .where(
+                ReminderScheduleModel.id.in_({sid.value for sid in schedule_ids}),
+                ReminderScheduleModel.status == "pending",
+            )
+            .values(status="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     @staticmethod
     def _to_domain(model: ReminderScheduleModel) -> ReminderSchedule:
         return ReminderSchedule(
@@ -174,3 +209,95 @@ class ReminderScheduleRepository(ReminderScheduleRepositoryPort):
             attempt_count=schedule.attempt_count,
             created_at=schedule.created_at,
         )
+
+
+class InterestAccrualRepository(InterestAccrualRepositoryPort):
+    """SQLAlchemy implementation of InterestAccrualRepositoryPort."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_overdue_chunk(
+        self,
+        accrual_date: date,
+        after_boleto_id: BoletoId | None = None,
+        limit: int = 1000,
+    ) -> OverdueInterestChunk:
+        """Fetch one chunk of overdue boletos joined to the tenant's active policy."""
+        already_accrued = exists().where(
+            InterestAccrualModel.boleto_id == BoletoModel.id,
+            InterestAccrualModel.accrual_date == accrual_date,
+        )
+
+        query = (
+            select(
+                BoletoModel.id,
+                BoletoModel.tenant_id,
+                BoletoModel.amount_cents,
+                BoletoModel.due_date,
+                InterestPolicyModel.id.label("policy_id"),
+                InterestPolicyModel.grace_period_days,
+                InterestPolicyModel.daily_interest_rate_bps,
+                InterestPolicyModel.fixed_penalty_cents,
+            )
+            .join(
+                InterestPolicyModel,
+                and_(
+                    InterestPolicyModel.tenant_id == BoletoModel.tenant_id,
+                    InterestPolicyModel.is_active.is_(True),
+                ),
+            )
+            .where(
+                BoletoModel.status == "overdue",
+                ~already_accrued,
+            )
+            .order_by(BoletoModel.id)
+            .limit(limit)
+        )
+
+        if after_boleto_id is not None:
+            query = query.where(BoletoModel.id > after_boleto_id.value)
+
+        result = await self._session.execute(query)
+
+        chunk = OverdueInterestChunk()
+        for row in result.all():
+            chunk.boleto_ids.append(BoletoId(value=row.id))
+            chunk.tenant_ids.append(TenantId(value=row.tenant_id))
+            chunk.policy_ids.append(InterestPolicyId(value=row.policy_id))
+            chunk.principal_cents.append(row.amount_cents)
+            chunk.due_dates.append(row.due_date)
+            chunk.grace_period_days.append(row.grace_period_days)
+            chunk.daily_interest_rate_bps.append(row.daily_interest_rate_bps)
+            chunk.fixed_penalty_cents.append(row.fixed_penalty_cents)
+        return chunk
+
+    async def record_accruals(self, entries: Sequence[InterestAccrualEntry]) -> int:
+        """Bulk insert ledger entries in one statement."""
+        if not entries:
+            return 0
+
+        now = datetime.now(UTC)
+        stmt = (
+            insert(InterestAccrualModel)
+            .values(
+                [
+                    {
+                        "id": uuid4(),
+                        "tenant_id": entry.tenant_id.value,
+                        "boleto_id": entry.boleto_id.value,
+                        "policy_id": entry.policy_id.value,
+                        "accrual_date": entry.accrual_date,
+                        "days_overdue": entry.days_overdue,
+                        "principal_cents": entry.principal_cents,
+                        "interest_cents": entry.interest_cents,
+                        "created_at": now,
+                    }
+                    for entry in entries
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_interest_accruals_boleto_date")
+        )
+
+        result = await self._session.execute(stmt)
+        return result.rowcount
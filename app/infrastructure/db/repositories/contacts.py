@@ -3,8 +3,11 @@
 Maps domain entities to SQLAlchemy models and implements persistence operations.
 """
 
+from collections.abc import Sequence
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 from app.application.ports.repositories.contacts import ContactRepositoryPort
 from app.domain.contacts.entities.contact import Contact
@@ -30,9 +33,18 @@ class ContactRepository(ContactRepositoryPort):
             return None
         return self._to_domain(model)
 
-    async def get_by_phone(
-        self, tenant_id: TenantId, phone_number: PhoneNumber
-    ) -> Contact | None:
+    async def get_by_ids(self, contact_ids: Sequence[ContactId]) -> list[Contact]:
+        """Retrieve many contacts in a single query."""
+        if not contact_ids:
+            return []
+        result = await self._session.execute(
+            select(ContactModel)
+            .where(ContactModel.id.in_({cid.value for cid in contact_ids}))
+            .options(noload(ContactModel.tenant))
+        )
+        return [self._to_domain(model) for model in result.scalars().all()]
+
+    async def get_by_phone(self, tenant_id: TenantId, phone_number: PhoneNumber) -> Contact | None:
         """Retrieve a contact by phone number within a tenant."""
         result = await self._session.execute(
             select(ContactModel).where(
@@ -73,9 +85,7 @@ class ContactRepository(ContactRepositoryPort):
         models = result.scalars().all()
         return [self._to_domain(model) for model in models]
 
-    async def phone_exists_in_tenant(
-        self, tenant_id: TenantId, phone_number: PhoneNumber
-    ) -> bool:
+    async def phone_exists_in_tenant(self, tenant_id: TenantId, phone_number: PhoneNumber) -> bool:
         """Check if a phone number is already registered in a tenant."""
         result = await self._session.execute(
             select(ContactModel.id).where(
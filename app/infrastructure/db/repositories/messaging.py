@@ -1,8 +1,11 @@
 """Repository implementation for Messaging bounded context."""
 
-from datetime import datetime, timezone
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import cast, column, func, or_, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.ports.repositories.messaging import OutboxRepositoryPort
@@ -14,6 +17,9 @@ from app.domain.messaging.value_objects.message_type import MessageType
 from app.domain.messaging.value_objects.outbox_item_id import OutboxItemId
 from app.infrastructure.db.models.messaging import MessageOutboxModel
 
+# Postgres channel notified (on commit) when due items are queued
+OUTBOX_NOTIFY_CHANNEL = "message_outbox_due"
+
 
 class OutboxRepository(OutboxRepositoryPort):
     """SQLAlchemy implementation of OutboxRepositoryPort."""
@@ -38,6 +44,7 @@ class OutboxRepository(OutboxRepositoryPort):
         if existing is None:
             model = self._to_model(item)
             self._session.add(model)
+            await self._notify_if_due([item])
         else:
             existing.status = item.status.value
             existing.attempt_count = item.attempt_count
@@ -50,11 +57,87 @@ class OutboxRepository(OutboxRepositoryPort):
         await self._session.refresh(model)
         return self._to_domain(model)
 
+    async def add_many(self, items: Sequence[MessageOutboxItem]) -> int:
+        """Bulk insert new items, skipping idempotency key duplicates."""
+        if not items:
+            return 0
+
+        stmt = (
+            insert(MessageOutboxModel)
+            .values([self._to_row(item) for item in items])
+            .on_conflict_do_nothing(constraint="uq_message_outbox_tenant_idempotency")
+        )
+        result = await self._session.execute(stmt)
+        if result.rowcount:
+            await self._notify_if_due(items)
+        return result.rowcount
+
+    async def _notify_if_due(self, items: Sequence[MessageOutboxItem]) -> None:
+        """NOTIFY the dispatcher if any item is deliverable now.
+
+        Postgres delivers the notification only when the surrounding
+        transaction commits, and folds duplicates within one transaction.
+        Future-scheduled items are picked up by the periodic poll.
+        """
+        now = datetime.now(UTC)
+        if any(item.scheduled_at <= now for item in items):
+            await self._session.execute(
+                text("SELECT pg_notify(:channel, '')"),
+                {"channel": OUTBOX_NOTIFY_CHANNEL},
+            )
+
+    async def save_many(self, items: Sequence[MessageOutboxItem], worker_id: str) -> int:
+        """UPDATE ... FROM (VALUES ...) of delivery state columns.
+
+        Fenced on lease_owner: rows re-claimed by another worker after
+        this worker's lease lapsed are left alone.
+        """
+        if not items:
+            return 0
+
+        table = MessageOutboxModel.__table__
+        columns = ("id", "status", "attempt_count", "last_error", "sent_at", "updated_at")
+        rows = values(
+            *(column(name, table.c[name].type) for name in columns), name="delivered"
+        ).data(
+            [
+                (
+                    item.id.value,
+                    item.status.value,
+                    item.attempt_count,
+                    item.last_error,
+                    item.sent_at,
+                    item.updated_at,
+                )
+                for item in items
+            ]
+        )
+        stmt = (
+            update(MessageOutboxModel)
+            .where(
+                MessageOutboxModel.id == rows.c.id,
+                MessageOutboxModel.lease_owner == worker_id,
+            )
+            .values(
+                # VALUES columns default to text (e.g. all-NULL sent_at)
+                **{name: cast(rows.c[name], table.c[name].type) for name in columns[1:]},
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .returning(MessageOutboxModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        return len(result.all())
+
     async def get_pending(
-        self, tenant_id: TenantId | None = None, limit: int = 100
+        self,
+        tenant_id: TenantId | None = None,
+        limit: int = 100,
+        per_tenant_limit: int | None = None,
     ) -> list[MessageOutboxItem]:
         """Get pending items ready for delivery."""
-        now = datetime.now(timezone.utc)
+        now = datetime.now(UTC)
         query = select(MessageOutboxModel).where(
             MessageOutboxModel.status.in_(["pending", "retrying"]),
             MessageOutboxModel.scheduled_at <= now,
@@ -63,15 +146,86 @@ class OutboxRepository(OutboxRepositoryPort):
         if tenant_id is not None:
             query = query.where(MessageOutboxModel.tenant_id == tenant_id.value)
 
+        if per_tenant_limit is not None:
+            query = query.where(
+                MessageOutboxModel.id.in_(self._fair_candidates(now, per_tenant_limit))
+            )
+
         query = query.order_by(MessageOutboxModel.scheduled_at).limit(limit)
 
         result = await self._session.execute(query)
         models = result.scalars().all()
         return [self._to_domain(model) for model in models]
 
-    async def exists_by_idempotency_key(
-        self, tenant_id: TenantId, idempotency_key: str
-    ) -> bool:
+    async def claim_pending(
+        self,
+        worker_id: str,
+        lease_seconds: int,
+        limit: int = 100,
+        per_tenant_limit: int | None = None,
+    ) -> list[MessageOutboxItem]:
+        """Lease due items with UPDATE ... WHERE id IN (... SKIP LOCKED)."""
+        now = datetime.now(UTC)
+        candidates = select(MessageOutboxModel.id).where(
+            MessageOutboxModel.status.in_(["pending", "retrying"]),
+            MessageOutboxModel.scheduled_at <= now,
+            _lease_free(now),
+        )
+
+        if per_tenant_limit is not None:
+            candidates = candidates.where(
+                MessageOutboxModel.id.in_(
+                    self._fair_candidates(now, per_tenant_limit, claimable_only=True)
+                )
+            )
+
+        candidates = (
+            candidates.order_by(MessageOutboxModel.scheduled_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        stmt = (
+            update(MessageOutboxModel)
+            .where(MessageOutboxModel.id.in_(candidates.scalar_subquery()))
+            .values(
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+            .returning(MessageOutboxModel)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        models = sorted(result.scalars().all(), key=lambda m: m.scheduled_at)
+        return [self._to_domain(model) for model in models]
+
+    @staticmethod
+    def _fair_candidates(now: datetime, per_tenant_limit: int, claimable_only: bool = False) -> Any:
+        """Oldest `per_tenant_limit` due item ids of every tenant.
+
+        With claimable_only, rows leased to other workers are not ranked,
+        so a tenant's in-flight rows do not use up its share.
+        """
+        ranked = (
+            select(
+                MessageOutboxModel.id,
+                func.row_number()
+                .over(
+                    partition_by=MessageOutboxModel.tenant_id,
+                    order_by=MessageOutboxModel.scheduled_at,
+                )
+                .label("tenant_rank"),
+            )
+            .where(
+                MessageOutboxModel.status.in_(["pending", "retrying"]),
+                MessageOutboxModel.scheduled_at <= now,
+                *([_lease_free(now)] if claimable_only else []),
+            )
+            .subquery()
+        )
+        return select(ranked.c.id).where(ranked.c.tenant_rank <= per_tenant_limit)
+
+    async def exists_by_idempotency_key(self, tenant_id: TenantId, idempotency_key: str) -> bool:
         """Check if an item with given idempotency key exists."""
         result = await self._session.execute(
             select(MessageOutboxModel.id).where(
@@ -103,18 +257,31 @@ class OutboxRepository(OutboxRepositoryPort):
     @staticmethod
     def _to_model(item: MessageOutboxItem) -> MessageOutboxModel:
         """Map domain entity to SQLAlchemy model."""
-        return MessageOutboxModel(
-            id=item.id.value,
-            tenant_id=item.tenant_id.value,
-            contact_id=item.contact_id.value,
-            message_type=item.message_type.value,
-            status=item.status.value,
-            payload=item.payload,
-            idempotency_key=item.idempotency_key,
-            attempt_count=item.attempt_count,
-            last_error=item.last_error,
-            scheduled_at=item.scheduled_at,
-            sent_at=item.sent_at,
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-        )
+        return MessageOutboxModel(**OutboxRepository._to_row(item))
+
+    @staticmethod
+    def _to_row(item: MessageOutboxItem) -> dict[str, Any]:
+        """Map domain entity to a column dict for bulk statements."""
+        return {
+            "id": item.id.value,
+            "tenant_id": item.tenant_id.value,
+            "contact_id": item.contact_id.value,
+            "message_type": item.message_type.value,
+            "status": item.status.value,
+            "payload": item.payload,
+            "idempotency_key": item.idempotency_key,
+            "attempt_count": item.attempt_count,
+            "last_error": item.last_error,
+            "scheduled_at": item.scheduled_at,
+            "sent_at": item.sent_at,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+        }
+
+
+def _lease_free(now: datetime) -> Any:
+    """Row not leased, or its lease has expired."""
+    return or_(
+        MessageOutboxModel.lease_expires_at.is_(None),
+        MessageOutboxModel.lease_expires_at < now,
+    )
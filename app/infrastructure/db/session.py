@@ -1,42 +1,161 @@
-"""SQLAlchemy async session management."""
+"""SQLAlchemy async session management.
 
+One engine (and one connection pool) per process:
+- Created in the FastAPI lifespan via init_engine()
+- Lazily created on first use elsewhere (Celery workers, scripts)
+- Disposed on shutdown via dispose_engine()
+"""
+
+import threading
+import time
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from dataclasses import asdict, dataclass
+from typing import Annotated, Any
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.sql import text
 
+from app.config.logging import get_logger
 from app.config.settings import Settings, get_settings
 
+logger = get_logger("db.session")
+
+
+@dataclass
+class PoolWaitMetrics:
+    """Cumulative connection checkout metrics for the process pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_time_total_ms: float = 0.0
+    wait_time_max_ms: float = 0.0
+
+
+class _PoolWaitRecorder:
+    """Thread-safe accumulator for pool checkout wait times."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics = PoolWaitMetrics()
+
+    def record(self, wait_seconds: float, timed_out: bool) -> None:
+        wait_ms = wait_seconds * 1000
+        with self._lock:
+            self._metrics.checkouts += 1
+            self._metrics.wait_time_total_ms += wait_ms
+            if wait_ms > self._metrics.wait_time_max_ms:
+                self._metrics.wait_time_max_ms = wait_ms
+            if timed_out:
+                self._metrics.timeouts += 1
+
+    def snapshot(self) -> PoolWaitMetrics:
+        with self._lock:
+            return PoolWaitMetrics(**asdict(self._metrics))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics = PoolWaitMetrics()
 
-def create_engine(settings: Settings) -> create_async_engine:
-    """Create async SQLAlchemy engine."""
+
+_wait_recorder = _PoolWaitRecorder()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            _wait_recorder.record(time.perf_counter() - start, timed_out)
+
+
+def create_engine(settings: Settings) -> AsyncEngine:
+    """Create async SQLAlchemy engine with pool settings from Settings."""
     return create_async_engine(
         settings.database_url,
         echo=settings.debug,
+        poolclass=InstrumentedQueuePool,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_timeout=settings.db_pool_timeout_seconds,
     )
 
 
-def create_session_factory(settings: Settings) -> async_sessionmaker[AsyncSession]:
-    """Create async session factory."""
-    engine = create_engine(settings)
-    return async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autoflush=False,
-    )
+# Process-wide engine and session factory
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
-async def get_session(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> AsyncGenerator[AsyncSession, None]:
+def init_engine(settings: Settings | None = None) -> AsyncEngine:
+    """Create the process-wide engine and session factory (idempotent)."""
+    global _engine, _session_factory
+    if _engine is None:
+        settings = settings or get_settings()
+        _engine = create_engine(settings)
+        _session_factory = async_sessionmaker(
+            bind=_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        logger.info(
+            "db_engine_created",
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Dispose the process-wide engine and close pooled connections."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
+        _wait_recorder.reset()
+        logger.info("db_engine_disposed")
+
+
+def get_engine() -> AsyncEngine:
+    """Get the process-wide engine, creating it on first use."""
+    return init_engine()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the process-wide session factory, creating it on first use."""
+    init_engine()
+    assert _session_factory is not None
+    return _session_factory
+
+
+def async_session_factory() -> AsyncSession:
+    """Open a new session bound to the process-wide engine.
+
+    Used by background jobs: `async with async_session_factory() as session:`
+    """
+    return get_session_factory()()
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session dependency."""
-    session_factory = create_session_factory(settings)
+    session_factory = get_session_factory()
     async with session_factory() as session:
         try:
             yield session
@@ -44,15 +163,46 @@ async def get_session(
             await session.close()
 
 
+# Alias kept for webhook handlers
+get_async_session = get_session
+
+
 async def get_db_health(
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> bool:
-    """Check database connectivity."""
+    """Check database connectivity using the shared pool."""
     try:
-        engine = create_engine(settings)
+        engine = init_engine(settings)
         async with engine.connect() as conn:
             await conn.execute(text("SELECT 1"))
-        await engine.dispose()
         return True
     except Exception:
         return False
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Get connection pool statistics for this process.
+
+    Returns:
+        Pool size, checked-in/checked-out/overflow counts and
+        cumulative checkout wait metrics. Empty counts if no engine yet.
+    """
+    wait = _wait_recorder.snapshot()
+    stats: dict[str, Any] = {
+        "initialized": _engine is not None,
+        "pool_size": 0,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": 0,
+        **asdict(wait),
+    }
+
+    if _engine is not None:
+        pool = _engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats["pool_size"] = pool.size()
+            stats["checked_in"] = pool.checkedin()
+            stats["checked_out"] = pool.checkedout()
+            stats["overflow"] = max(pool.overflow(), 0)
+
+    return stats
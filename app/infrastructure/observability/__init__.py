@@ -0,0 +1,8 @@
+"""Process-local runtime metrics."""
+
+from app.infrastructure.observability.histogram import (
+    HistogramRegistry,
+    LatencyHistogram,
+)
+
+__all__ = ["HistogramRegistry", "LatencyHistogram"]
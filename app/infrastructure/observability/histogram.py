@@ -0,0 +1,138 @@
+"""Fixed-bucket latency histograms.
+
+Cheap enough to record on every call; values are per process and are
+exposed through the /metrics endpoints.
+"""
+
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram with fixed upper bounds in ms."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self._bounds = tuple(sorted(buckets_ms))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record one latency sample."""
+        index = len(self._bounds)
+        for i, bound in enumerate(self._bounds):
+            if value_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum_ms += value_ms
+            if value_ms > self._max_ms:
+                self._max_ms = value_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        """Count, sum, max, cumulative buckets and estimated percentiles.
+
+        Percentiles are bucket upper bounds (max_ms for the overflow bucket).
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            sum_ms = self._sum_ms
+            max_ms = self._max_ms
+
+        buckets: dict[str, int] = {}
+        running = 0
+        # counts has one more (overflow) bucket than bounds
+        for bound, count in zip(self._bounds, counts, strict=False):
+            running += count
+            buckets[f"le_{bound:g}"] = running
+        buckets["le_inf"] = total
+
+        return {
+            "count": total,
+            "sum_ms": round(sum_ms, 3),
+            "avg_ms": round(sum_ms / total, 3) if total else 0.0,
+            "max_ms": round(max_ms, 3),
+            "p50_ms": self._percentile(counts, total, max_ms, 0.50),
+            "p95_ms": self._percentile(counts, total, max_ms, 0.95),
+            "p99_ms": self._percentile(counts, total, max_ms, 0.99),
+            "buckets": buckets,
+        }
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, quantile: float) -> float:
+        """Estimated latency (ms) at `quantile`, 0.0 with no samples."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            max_ms = self._max_ms
+        return self._percentile(counts, total, max_ms, quantile)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._count = 0
+            self._sum_ms = 0.0
+            self._max_ms = 0.0
+
+    def _percentile(self, counts: list[int], total: int, max_ms: float, quantile: float) -> float:
+        if total == 0:
+            return 0.0
+        rank = quantile * total
+        running = 0
+        for bound, count in zip(self._bounds, counts, strict=False):
+            running += count
+            if running >= rank:
+                return float(min(bound, max_ms))
+        return round(max_ms, 3)
+
+
+class HistogramRegistry:
+    """Named histograms created on first use."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self._buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(self._buckets_ms))
+        return histogram
+
+    def observe(self, name: str, value_ms: float) -> None:
+        self.histogram(name).observe(value_ms)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            items = list(self._histograms.items())
+        return {name: histogram.snapshot() for name, histogram in sorted(items)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
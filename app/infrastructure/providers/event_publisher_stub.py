@@ -0,0 +1,32 @@
+"""Stub event publisher for development and testing.
+
+Logs published events by type. A real broker integration comes later.
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+
+from app.application.ports.events import EventPublisherPort
+from app.config.logging import get_logger
+
+
+class StubEventPublisher(EventPublisherPort):
+    """Stub implementation of EventPublisherPort.
+
+    Records event counts per type; no payloads are logged.
+    """
+
+    def __init__(self) -> None:
+        self._logger = get_logger("stub_event_publisher")
+
+    async def publish_many(self, events: Sequence[object]) -> None:
+        """Log a summary of the published batch."""
+        if not events:
+            return
+
+        counts = Counter(type(event).__name__ for event in events)
+        self._logger.info(
+            "stub_events_published",
+            total=len(events),
+            by_type=dict(counts),
+        )
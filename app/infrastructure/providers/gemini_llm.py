@@ -4,21 +4,90 @@ Production-ready adapter for Google Gemini API.
 Returns structured JSON only - no prose.
 """
 
+import asyncio
+import hashlib
 import json
+import time
 
 import httpx
 
 from app.application.ports.providers.llm import (
     ExtractedEntitiesResult,
     IntentClassificationResult,
+    IntentWithEntitiesResult,
     LLMErrorCode,
     LLMProviderPort,
 )
 from app.config.logging import get_logger
-from app.config.settings import get_settings
+from app.config.settings import Settings, get_settings
+from app.infrastructure.observability import HistogramRegistry
+from app.infrastructure.providers.llm_resilience import (
+    HedgePolicy,
+    LatencyBudgetExhaustedError,
+    hedged,
+    remaining_budget,
+)
+from app.infrastructure.providers.singleflight import SingleFlight
 
 logger = get_logger("gemini_llm")
 
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# Call latency per call type (classify_intent, extract_entities)
+gemini_latency = HistogramRegistry()
+
+# Process-wide pooled client
+_client: httpx.AsyncClient | None = None
+
+
+def create_gemini_client(settings: Settings) -> httpx.AsyncClient:
+    """Create a keep-alive client for the Gemini API.
+
+    HTTP/2 multiplexes concurrent prompts over one TLS connection; falls
+    back to HTTP/1.1 keep-alive if the optional h2 package is missing.
+    """
+    http2 = settings.gemini_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("gemini_http2_unavailable")
+            http2 = False
+
+    return httpx.AsyncClient(
+        base_url=GEMINI_BASE_URL,
+        http2=http2,
+        timeout=settings.gemini_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.gemini_max_connections,
+            max_keepalive_connections=settings.gemini_max_keepalive_connections,
+            keepalive_expiry=settings.gemini_keepalive_expiry_seconds,
+        ),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def init_gemini_client(settings: Settings | None = None) -> httpx.AsyncClient:
+    """Create the process-wide Gemini client (idempotent)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_gemini_client(settings or get_settings())
+    return _client
+
+
+async def close_gemini_client() -> None:
+    """Close the process-wide Gemini client and its connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_gemini_client() -> httpx.AsyncClient:
+    """Get the process-wide Gemini client, creating it on first use."""
+    return init_gemini_client()
+
+
 INTENT_CLASSIFICATION_PROMPT = """You are an intent classifier for a financial billing assistant.
 Classify the user message into ONE of these intents:
 - create_boleto: User wants to create a new boleto/billing
@@ -30,7 +99,7 @@ Classify the user message into ONE of these intents:
 - unknown: Cannot determine intent
 
 Return ONLY a JSON object with this exact structure:
-{"intent": "<intent>", "confidence": <0.0-1.0>}
+{{"intent": "<intent>", "confidence": <0.0-1.0>}}
 
 User message: {text}"""
 
@@ -54,6 +123,39 @@ Example: {{"contact_name": "João", "amount_cents": 10000, "due_date": "2026-02-
 
 User message: {text}"""
 
+COMBINED_INTENT_ENTITIES_PROMPT = """You are an intent classifier and entity extractor for a financial billing assistant.
+Classify the user message into ONE of these intents:
+- create_boleto: User wants to create a new boleto/billing
+- cancel_boleto: User wants to cancel an existing boleto
+- check_status: User wants to check the status of a boleto
+- send_message: User wants to send a message/reminder
+- list_boletos: User wants to list their boletos
+- general_question: User has a general question
+- unknown: Cannot determine intent
+
+Then extract the entities for that intent:
+- create_boleto: contact_name, amount_cents (e.g., "R$ 100,00" = 10000), due_date (YYYY-MM-DD)
+- cancel_boleto or check_status: boleto_id (UUID)
+- send_message: contact_name, message_content
+
+Return ONLY a JSON object with this exact structure. Use null for missing fields:
+{{"intent": "<intent>", "confidence": <0.0-1.0>, "entities": {{"contact_name": null, "amount_cents": null, "due_date": null, "boleto_id": null, "message_content": null}}}}
+
+User message: {text}"""
+
+
+# Fingerprint of the prompt templates; part of every LLM cache key, so
+# editing a prompt invalidates results produced by the old one.
+PROMPT_VERSION = hashlib.sha256(
+    "\x00".join(
+        (
+            INTENT_CLASSIFICATION_PROMPT,
+            ENTITY_EXTRACTION_PROMPT,
+            COMBINED_INTENT_ENTITIES_PROMPT,
+        )
+    ).encode()
+).hexdigest()[:12]
+
 
 class GeminiLLMProvider(LLMProviderPort):
     """Gemini LLM provider for intent classification and entity extraction.
@@ -63,6 +165,7 @@ class GeminiLLMProvider(LLMProviderPort):
     - Timeout handling
     - Error classification
     - No sensitive data logging
+    - Pooled keep-alive client shared across calls
     """
 
     def __init__(
@@ -70,12 +173,22 @@ class GeminiLLMProvider(LLMProviderPort):
         api_key: str | None = None,
         model_name: str | None = None,
         timeout_seconds: int | None = None,
+        client: httpx.AsyncClient | None = None,
+        singleflight: SingleFlight | None = None,
+        hedge: HedgePolicy | None = None,
     ) -> None:
         settings = get_settings()
         self._api_key = api_key or settings.gemini_api_key
         self._model_name = model_name or settings.gemini_model_name
         self._timeout = timeout_seconds or settings.gemini_timeout_seconds
-        self._base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self._client = client
+        self._singleflight = singleflight
+        self._hedge = hedge
+
+    @property
+    def model_name(self) -> str:
+        """Gemini model used for all calls."""
+        return self._model_name
 
     async def classify_intent(self, text: str) -> IntentClassificationResult:
         """Classify user intent using Gemini."""
@@ -84,7 +197,7 @@ class GeminiLLMProvider(LLMProviderPort):
         prompt = INTENT_CLASSIFICATION_PROMPT.format(text=text)
 
         try:
-            response = await self._call_gemini(prompt)
+            response = await self._call_gemini(prompt, "classify_intent")
 
             if response is None:
                 return IntentClassificationResult(
@@ -118,6 +231,14 @@ class GeminiLLMProvider(LLMProviderPort):
                     error_message=f"Failed to parse response: {e}",
                 )
 
+        except LatencyBudgetExhaustedError:
+            logger.warning("gemini_budget_exhausted")
+            return IntentClassificationResult(
+                success=False,
+                error_code=LLMErrorCode.BUDGET_EXHAUSTED,
+                error_message="Latency budget exhausted",
+            )
+
         except httpx.TimeoutException:
             logger.error("gemini_timeout")
             return IntentClassificationResult(
@@ -134,16 +255,14 @@ class GeminiLLMProvider(LLMProviderPort):
                 error_message=str(e),
             )
 
-    async def extract_entities(
-        self, text: str, intent: str
-    ) -> ExtractedEntitiesResult:
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
         """Extract entities using Gemini."""
         logger.info("gemini_extract_entities_start", intent=intent)
 
         prompt = ENTITY_EXTRACTION_PROMPT.format(text=text, intent=intent)
 
         try:
-            response = await self._call_gemini(prompt)
+            response = await self._call_gemini(prompt, "extract_entities")
 
             if response is None:
                 return ExtractedEntitiesResult(
@@ -154,22 +273,11 @@ class GeminiLLMProvider(LLMProviderPort):
 
             try:
                 data = json.loads(response)
-
-                amount_cents = data.get("amount_cents")
-                if amount_cents is not None:
-                    amount_cents = int(amount_cents)
+                entities = self._parse_entities(data)
 
                 logger.info("gemini_extract_entities_success")
 
-                return ExtractedEntitiesResult(
-                    success=True,
-                    contact_name=data.get("contact_name"),
-                    contact_phone=data.get("contact_phone"),
-                    amount_cents=amount_cents,
-                    due_date=data.get("due_date"),
-                    boleto_id=data.get("boleto_id"),
-                    message_content=data.get("message_content"),
-                )
+                return entities
 
             except (json.JSONDecodeError, ValueError, KeyError) as e:
                 logger.warning("gemini_parse_error", error=str(e))
@@ -179,6 +287,14 @@ class GeminiLLMProvider(LLMProviderPort):
                     error_message=f"Failed to parse response: {e}",
                 )
 
+        except LatencyBudgetExhaustedError:
+            logger.warning("gemini_budget_exhausted")
+            return ExtractedEntitiesResult(
+                success=False,
+                error_code=LLMErrorCode.BUDGET_EXHAUSTED,
+                error_message="Latency budget exhausted",
+            )
+
         except httpx.TimeoutException:
             logger.error("gemini_timeout")
             return ExtractedEntitiesResult(
@@ -195,11 +311,131 @@ class GeminiLLMProvider(LLMProviderPort):
                 error_message=str(e),
             )
 
-    async def _call_gemini(self, prompt: str) -> str | None:
-        """Make API call to Gemini."""
-        url = f"{self._base_url}/models/{self._model_name}:generateContent"
+    async def classify_and_extract(self, text: str) -> IntentWithEntitiesResult:
+        """Classify intent and extract entities in one Gemini call."""
+        logger.info("gemini_classify_and_extract_start")
+
+        prompt = COMBINED_INTENT_ENTITIES_PROMPT.format(text=text)
+
+        try:
+            response = await self._call_gemini(prompt, "classify_and_extract")
+
+            if response is None:
+                return IntentWithEntitiesResult(
+                    success=False,
+                    error_code=LLMErrorCode.API_ERROR,
+                    error_message="Empty response from Gemini",
+                )
+
+            try:
+                data = json.loads(response)
+                intent = data.get("intent", "unknown")
+                confidence = float(data.get("confidence", 0.0))
+                entities = self._parse_entities(data.get("entities") or {})
+
+                logger.info(
+                    "gemini_classify_and_extract_success",
+                    intent=intent,
+                    confidence=confidence,
+                )
+
+                return IntentWithEntitiesResult(
+                    success=True,
+                    intent=intent,
+                    confidence=confidence,
+                    entities=entities,
+                )
+
+            except (json.JSONDecodeError, ValueError, KeyError, AttributeError) as e:
+                logger.warning("gemini_parse_error", error=str(e))
+                return IntentWithEntitiesResult(
+                    success=False,
+                    error_code=LLMErrorCode.PARSE_ERROR,
+                    error_message=f"Failed to parse response: {e}",
+                )
+
+        except LatencyBudgetExhaustedError:
+            logger.warning("gemini_budget_exhausted")
+            return IntentWithEntitiesResult(
+                success=False,
+                error_code=LLMErrorCode.BUDGET_EXHAUSTED,
+                error_message="Latency budget exhausted",
+            )
+
+        except httpx.TimeoutException:
+            logger.error("gemini_timeout")
+            return IntentWithEntitiesResult(
+                success=False,
+                error_code=LLMErrorCode.TIMEOUT,
+                error_message="Request timed out",
+            )
+
+        except Exception as e:
+            logger.error("gemini_error", error=str(e))
+            return IntentWithEntitiesResult(
+                success=False,
+                error_code=LLMErrorCode.UNKNOWN,
+                error_message=str(e),
+            )
+
+    @staticmethod
+    def _parse_entities(data: dict) -> ExtractedEntitiesResult:
+        """Map a JSON entities object to ExtractedEntitiesResult."""
+        amount_cents = data.get("amount_cents")
+        if amount_cents is not None:
+            amount_cents = int(amount_cents)
+
+        return ExtractedEntitiesResult(
+            success=True,
+            contact_name=data.get("contact_name"),
+            contact_phone=data.get("contact_phone"),
+            amount_cents=amount_cents,
+            due_date=data.get("due_date"),
+            boleto_id=data.get("boleto_id"),
+            message_content=data.get("message_content"),
+        )
+
+    async def _call_gemini(self, prompt: str, call_type: str) -> str | None:
+        """Make API call to Gemini, coalescing identical in-flight prompts."""
+        if self._singleflight is None:
+            return await self._post_gemini(prompt, call_type)
+
+        key = f"{self._model_name}:{prompt}"
+        return await self._singleflight.do(key, lambda: self._post_gemini(prompt, call_type))
+
+    async def _post_gemini(self, prompt: str, call_type: str) -> str | None:
+        """POST a prompt, bounded by the latency budget."""
+        timeout = float(self._timeout)
+        remaining = remaining_budget()
+        if remaining is not None:
+            if remaining <= 0:
+                raise LatencyBudgetExhaustedError
+            timeout = min(timeout, remaining)
+
+        try:
+            return await self._post_hedged(prompt, call_type, timeout)
+        except httpx.TimeoutException as e:
+            # A timeout cut short by the budget says nothing about Gemini
+            if timeout < self._timeout:
+                raise LatencyBudgetExhaustedError from e
+            raise
+
+    async def _post_hedged(self, prompt: str, call_type: str, timeout: float) -> str | None:
+        """POST a prompt, hedging it once it is slower than usual."""
+        if self._hedge is None:
+            return await self._post_once(prompt, call_type, timeout)
+
+        delay = self._hedge.delay_seconds(call_type)
+        if delay >= timeout:
+            return await self._post_once(prompt, call_type, timeout)
+
+        return await hedged(lambda: self._post_once(prompt, call_type, timeout), delay)
+
+    async def _post_once(self, prompt: str, call_type: str, timeout: float) -> str | None:
+        """POST one prompt to Gemini over the pooled client."""
+        client = self._client or get_gemini_client()
+        url = f"/models/{self._model_name}:generateContent"
 
-        headers = {"Content-Type": "application/json"}
         params = {"key": self._api_key}
 
         payload = {
@@ -211,41 +447,50 @@ class GeminiLLMProvider(LLMProviderPort):
             },
         }
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        start = time.perf_counter()
+        cancelled = False
+        try:
             response = await client.post(
                 url,
-                headers=headers,
                 params=params,
                 json=payload,
+                timeout=timeout,
             )
+        except asyncio.CancelledError:
+            # Losing hedge attempt: not a real latency sample
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                gemini_latency.observe(call_type, (time.perf_counter() - start) * 1000)
+
+        if response.status_code != 200:
+            logger.error(
+                "gemini_api_error",
+                status_code=response.status_code,
+            )
+            return None
 
-            if response.status_code != 200:
-                logger.error(
-                    "gemini_api_error",
-                    status_code=response.status_code,
-                )
-                return None
-
-            data = response.json()
-            candidates = data.get("candidates", [])
+        data = response.json()
+        candidates = data.get("candidates", [])
 
-            if not candidates:
-                return None
+        if not candidates:
+            return None
 
-            content = candidates[0].get("content", {})
-            parts = content.get("parts", [])
+        content = candidates[0].get("content", {})
+        parts = content.get("parts", [])
 
-            if not parts:
-                return None
+        if not parts:
+            return None
 
-            text = parts[0].get("text", "")
+        text = parts[0].get("text", "")
 
-            # Clean up markdown code blocks if present
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
+        # Clean up markdown code blocks if present
+        if text.startswith("```json"):
+            text = text[7:]
+        if text.startswith("```"):
+            text = text[3:]
+        if text.endswith("```"):
+            text = text[:-3]
 
-            return text.strip()
+        return text.strip()
@@ -0,0 +1,202 @@
+"""Caching decorator for LLM providers.
+
+Two tiers in front of any LLMProviderPort:
+- In-process LRU (short TTL, no network)
+- Redis (shared across replicas, longer TTL)
+
+Keys are (prompt version, model, call type, sha256 of normalized input
+and intent), so raw user text never appears in Redis keys and prompt
+changes invalidate old entries. Entity results also key on the current
+date (business timezone): relative dates ("amanhã", "sexta") resolve
+differently each day. Failures and low-confidence classifications are
+never cached.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import redis.asyncio as redis
+
+from app.application.ports.providers.llm import (
+    ExtractedEntitiesResult,
+    IntentClassificationResult,
+    IntentWithEntitiesResult,
+    LLMProviderPort,
+)
+from app.config.logging import get_logger
+
+logger = get_logger("llm_cache")
+
+KEY_PREFIX = "llm:cache:"
+
+
+class LLMCacheMetrics:
+    """Thread-safe hit/miss counters per call type."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def incr(self, call_type: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                call_type,
+                {"local_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0, "errors": 0},
+            )
+            counts[outcome] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            counts = {name: dict(c) for name, c in self._counts.items()}
+
+        for c in counts.values():
+            lookups = c["local_hits"] + c["redis_hits"] + c["misses"]
+            hits = c["local_hits"] + c["redis_hits"]
+            c["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+# Process-wide cache metrics (exposed at /metrics/llm)
+llm_cache_metrics = LLMCacheMetrics()
+
+
+class _LocalLRU:
+    """Small in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class CachingLLMProvider(LLMProviderPort):
+    """LLMProviderPort decorator that caches successful results."""
+
+    def __init__(
+        self,
+        inner: LLMProviderPort,
+        redis_client: redis.Redis | None,
+        prompt_version: str,
+        model_name: str,
+        ttl_seconds: int = 3600,
+        local_max_entries: int = 1024,
+        local_ttl_seconds: float = 60.0,
+        min_confidence: float = 0.7,
+        timezone: str = "America/Sao_Paulo",
+    ) -> None:
+        self._inner = inner
+        self._redis = redis_client
+        self._namespace = f"{KEY_PREFIX}{prompt_version}:{model_name}:"
+        self._ttl = ttl_seconds
+        self._local = _LocalLRU(local_max_entries, min(local_ttl_seconds, ttl_seconds))
+        self._min_confidence = min_confidence
+        self._timezone = ZoneInfo(timezone)
+
+    async def classify_intent(self, text: str) -> IntentClassificationResult:
+        key = self._key("intent", text)
+        cached = await self._get("classify_intent", key)
+        if cached is not None:
+            return IntentClassificationResult(**cached)
+
+        result = await self._inner.classify_intent(text)
+        if result.success and result.confidence >= self._min_confidence:
+            await self._set("classify_intent", key, asdict(result))
+        return result
+
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
+        key = self._key("entities", text, intent, self._today())
+        cached = await self._get("extract_entities", key)
+        if cached is not None:
+            return ExtractedEntitiesResult(**cached)
+
+        result = await self._inner.extract_entities(text, intent)
+        if result.success:
+            await self._set("extract_entities", key, asdict(result))
+        return result
+
+    async def classify_and_extract(self, text: str) -> IntentWithEntitiesResult:
+        key = self._key("combined", text, day=self._today())
+        cached = await self._get("classify_and_extract", key)
+        if cached is not None:
+            entities = cached.pop("entities")
+            return IntentWithEntitiesResult(
+                **cached,
+                entities=ExtractedEntitiesResult(**entities) if entities else None,
+            )
+
+        result = await self._inner.classify_and_extract(text)
+        if result.success and result.confidence >= self._min_confidence:
+            await self._set("classify_and_extract", key, asdict(result))
+        return result
+
+    def _key(self, call_type: str, text: str, intent: str = "", day: str = "") -> str:
+        digest = hashlib.sha256(f"{text}\x00{intent}\x00{day}".encode()).hexdigest()
+        return f"{self._namespace}{call_type}:{digest}"
+
+    def _today(self) -> str:
+        """Date relative dates in the input resolve against."""
+        return datetime.now(self._timezone).date().isoformat()
+
+    async def _get(self, call_type: str, key: str) -> dict[str, Any] | None:
+        raw = self._local.get(key)
+        if raw is not None:
+            llm_cache_metrics.incr(call_type, "local_hits")
+            return json.loads(raw)
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+            except (redis.RedisError, OSError) as e:
+                logger.warning("llm_cache_read_error", error=str(e))
+                llm_cache_metrics.incr(call_type, "errors")
+                raw = None
+
+            if raw is not None:
+                if isinstance(raw, bytes):
+                    raw = raw.decode()
+                self._local.set(key, raw)
+                llm_cache_metrics.incr(call_type, "redis_hits")
+                return json.loads(raw)
+
+        llm_cache_metrics.incr(call_type, "misses")
+        return None
+
+    async def _set(self, call_type: str, key: str, value: dict[str, Any]) -> None:
+        raw = json.dumps(value)
+        self._local.set(key, raw)
+        llm_cache_metrics.incr(call_type, "stores")
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, raw, ex=self._ttl)
+            except (redis.RedisError, OSError) as e:
+                logger.warning("llm_cache_write_error", error=str(e))
+                llm_cache_metrics.incr(call_type, "errors")
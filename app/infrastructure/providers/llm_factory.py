@@ -0,0 +1,66 @@
+"""LLM provider composition.
+
+Builds the provider the AI graph uses in production, outermost first:
+- Result cache (served even while the circuit is open)
+- Latency budget + circuit breaker
+- Gemini: identical in-flight prompts coalesced, slow calls hedged
+"""
+
+from app.ai.nodes.intent_classification import CONFIDENCE_THRESHOLD
+from app.application.ports.providers.llm import LLMProviderPort
+from app.config.settings import Settings
+from app.infrastructure.providers.gemini_llm import (
+    PROMPT_VERSION,
+    GeminiLLMProvider,
+    gemini_latency,
+)
+from app.infrastructure.providers.llm_cache import CachingLLMProvider
+from app.infrastructure.providers.llm_resilience import (
+    CircuitBreaker,
+    HedgePolicy,
+    ResilientLLMProvider,
+)
+from app.infrastructure.providers.singleflight import SingleFlight
+from app.infrastructure.redis.client import get_redis
+
+
+def create_llm_provider(settings: Settings) -> LLMProviderPort:
+    """Create the configured LLM provider stack."""
+    singleflight = SingleFlight(
+        redis_client=(get_redis() if settings.llm_singleflight_redis else None),
+        lock_ttl_ms=settings.gemini_timeout_seconds * 1000,
+        result_ttl_ms=settings.llm_singleflight_result_ttl_ms,
+    )
+    hedge = None
+    if settings.gemini_hedge_enabled:
+        hedge = HedgePolicy(
+            latency=gemini_latency,
+            percentile=settings.gemini_hedge_percentile,
+            min_delay_ms=settings.gemini_hedge_min_delay_ms,
+            default_delay_ms=settings.gemini_hedge_default_delay_ms,
+        )
+
+    gemini = GeminiLLMProvider(singleflight=singleflight, hedge=hedge)
+    provider: LLMProviderPort = ResilientLLMProvider(
+        inner=gemini,
+        breaker=CircuitBreaker(
+            name="gemini",
+            failure_threshold=settings.llm_breaker_failure_threshold,
+            reset_timeout_seconds=settings.llm_breaker_reset_seconds,
+        ),
+    )
+
+    if settings.llm_cache_enabled:
+        provider = CachingLLMProvider(
+            inner=provider,
+            redis_client=get_redis(),
+            prompt_version=PROMPT_VERSION,
+            model_name=gemini.model_name,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            local_max_entries=settings.llm_cache_local_max_entries,
+            local_ttl_seconds=settings.llm_cache_local_ttl_seconds,
+            min_confidence=CONFIDENCE_THRESHOLD,
+            timezone=settings.llm_cache_timezone,
+        )
+
+    return provider
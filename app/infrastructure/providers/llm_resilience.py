@@ -0,0 +1,303 @@
+"""Resilience layer for LLM providers.
+
+- Latency budget: a per-request deadline set by the HTTP handler and
+  read by every LLM call made while handling that request
+- Hedging: a second identical request once the first is slower than
+  a recent latency percentile; the first good answer wins
+- Circuit breaker: opens after consecutive TIMEOUT/API_ERROR results
+  and fails fast (CIRCUIT_OPEN) so callers drop to the rule-based or
+  cached path instead of waiting on a sick upstream. Running out of
+  the request's own budget (BUDGET_EXHAUSTED) is not an upstream
+  failure and never counts against the breaker
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import Any
+
+from app.application.ports.providers.llm import (
+    ExtractedEntitiesResult,
+    IntentClassificationResult,
+    IntentWithEntitiesResult,
+    LLMErrorCode,
+    LLMProviderPort,
+)
+from app.config.logging import get_logger
+from app.infrastructure.observability import HistogramRegistry
+
+logger = get_logger("llm_resilience")
+
+# Monotonic deadline of the request being handled (None = no budget)
+_deadline: ContextVar[float | None] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def latency_budget(seconds: float) -> Iterator[None]:
+    """Bound the total time LLM calls may take inside this block."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class LatencyBudgetExhaustedError(Exception):
+    """An LLM call ran out of the current request's latency budget."""
+
+
+def remaining_budget() -> float | None:
+    """Seconds left in the current latency budget, None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class _Counters:
+    """Thread-safe named counters."""
+
+    def __init__(self, *names: str) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(names, 0)
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+# Process-wide hedging counters (exposed at /metrics/llm)
+hedge_metrics = _Counters("hedges_sent", "hedges_won")
+
+
+class HedgePolicy:
+    """Decides how long to wait before sending a hedged request.
+
+    Uses the recorded latency percentile for the call type once enough
+    samples exist, never less than min_delay_ms.
+    """
+
+    def __init__(
+        self,
+        latency: HistogramRegistry,
+        percentile: float = 0.95,
+        min_delay_ms: float = 250,
+        default_delay_ms: float = 2000,
+        min_samples: int = 50,
+    ) -> None:
+        self._latency = latency
+        self._percentile = percentile
+        self._min_delay_ms = min_delay_ms
+        self._default_delay_ms = default_delay_ms
+        self._min_samples = min_samples
+
+    def delay_seconds(self, call_type: str) -> float:
+        histogram = self._latency.histogram(call_type)
+        if histogram.count < self._min_samples:
+            delay_ms = self._default_delay_ms
+        else:
+            delay_ms = histogram.percentile(self._percentile)
+        return max(delay_ms, self._min_delay_ms) / 1000
+
+
+async def hedged[T](fn: Callable[[], Awaitable[T | None]], delay_seconds: float) -> T | None:
+    """Run fn(); if it has not finished after delay_seconds, run it again.
+
+    Returns the first non-None result. If both attempts fail, the first
+    attempt's outcome (None or its exception) is returned/raised.
+    The losing attempt is cancelled.
+    """
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=delay_seconds)
+    if done:
+        return first.result()
+
+    hedge_metrics.incr("hedges_sent")
+    second = asyncio.ensure_future(fn())
+    pending: set[asyncio.Future[T | None]] = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and task.result() is not None:
+                    if task is second:
+                        hedge_metrics.incr("hedges_won")
+                    return task.result()
+        return first.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class BreakerState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    CLOSED → OPEN after `failure_threshold` consecutive failures.
+    OPEN → HALF_OPEN after `reset_timeout_seconds`; one probe call is
+    let through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout_seconds
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+        _breakers[name] = self
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now."""
+        with self._lock:
+            if self._state == BreakerState.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_timeout:
+                    self._rejected += 1
+                    return False
+                self._state = BreakerState.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._state == BreakerState.HALF_OPEN:
+                if self._probe_in_flight:
+                    self._rejected += 1
+                    return False
+                self._probe_in_flight = True
+
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != BreakerState.CLOSED:
+                logger.info("circuit_closed", breaker=self.name)
+            self._state = BreakerState.CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if (
+                self._state == BreakerState.HALF_OPEN
+                or self._consecutive_failures >= self._failure_threshold
+            ):
+                if self._state != BreakerState.OPEN:
+                    self._times_opened += 1
+                    logger.warning(
+                        "circuit_opened",
+                        breaker=self.name,
+                        consecutive_failures=self._consecutive_failures,
+                    )
+                self._state = BreakerState.OPEN
+                self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Forget an abandoned (cancelled) half-open probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker_snapshots() -> dict[str, dict[str, Any]]:
+    """State of every circuit breaker in this process."""
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
+
+
+# Result codes that mean the upstream itself is unhealthy
+BREAKER_FAILURE_CODES = frozenset({LLMErrorCode.TIMEOUT, LLMErrorCode.API_ERROR})
+
+
+class ResilientLLMProvider(LLMProviderPort):
+    """LLMProviderPort decorator enforcing the latency budget and breaker."""
+
+    def __init__(self, inner: LLMProviderPort, breaker: CircuitBreaker) -> None:
+        self._inner = inner
+        self._breaker = breaker
+
+    async def classify_intent(self, text: str) -> IntentClassificationResult:
+        return await self._guarded(
+            lambda: self._inner.classify_intent(text), IntentClassificationResult
+        )
+
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
+        return await self._guarded(
+            lambda: self._inner.extract_entities(text, intent), ExtractedEntitiesResult
+        )
+
+    async def classify_and_extract(self, text: str) -> IntentWithEntitiesResult:
+        return await self._guarded(
+            lambda: self._inner.classify_and_extract(text), IntentWithEntitiesResult
+        )
+
+    async def _guarded(self, call: Callable[[], Awaitable[Any]], result_cls: type) -> Any:
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            return result_cls(
+                success=False,
+                error_code=LLMErrorCode.BUDGET_EXHAUSTED,
+                error_message="Latency budget exhausted",
+            )
+
+        if not self._breaker.allow():
+            return result_cls(
+                success=False,
+                error_code=LLMErrorCode.CIRCUIT_OPEN,
+                error_message="LLM temporarily unavailable",
+            )
+
+        try:
+            result = await call()
+        except (asyncio.CancelledError, LatencyBudgetExhaustedError):
+            self._breaker.release_probe()
+            raise
+        except Exception:
+            self._breaker.record_failure()
+            raise
+
+        if not result.success and result.error_code == LLMErrorCode.BUDGET_EXHAUSTED:
+            # Our deadline, not the upstream's health
+            self._breaker.release_probe()
+        elif not result.success and result.error_code in BREAKER_FAILURE_CODES:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return result
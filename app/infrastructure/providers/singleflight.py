@@ -0,0 +1,161 @@
+"""Request coalescing for identical upstream calls.
+
+Concurrent callers with the same key await one shared call instead of
+each hitting the upstream API (e.g. hundreds of identical replies to a
+campaign). Optionally coordinates across replicas with a short-lived
+Redis lock plus result key.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config.logging import get_logger
+
+logger = get_logger("singleflight")
+
+LOCK_PREFIX = "llm:sf:lock:"
+RESULT_PREFIX = "llm:sf:result:"
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightMetrics:
+    """Thread-safe counters for coalesced calls."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {
+            "leaders": 0,
+            "local_followers": 0,
+            "remote_followers": 0,
+            "remote_fallbacks": 0,
+        }
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._counts:
+                self._counts[name] = 0
+
+
+# Process-wide counters (exposed at /metrics/llm)
+singleflight_metrics = SingleFlightMetrics()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key.
+
+    In-process, the first caller starts the call as a task and later
+    callers await the same task (shielded, so one caller's cancellation
+    does not cancel the others). With a Redis client, the task also
+    takes a cross-replica lock; replicas that lose the race poll the
+    result key until the winner publishes it, its lock lapses, or the
+    lock TTL passes, then fall back to calling upstream themselves.
+    Only non-None results are shared across replicas.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis | None = None,
+        lock_ttl_ms: int = 30000,
+        result_ttl_ms: int = 5000,
+        poll_interval_ms: int = 50,
+    ) -> None:
+        self._redis = redis_client
+        self._lock_ttl_ms = lock_ttl_ms
+        self._result_ttl_ms = result_ttl_ms
+        self._poll_interval = poll_interval_ms / 1000
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[str | None]]) -> str | None:
+        """Run fn() once for all concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            singleflight_metrics.incr("leaders")
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            singleflight_metrics.incr("local_followers")
+
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[str | None]]) -> str | None:
+        if self._redis is None:
+            return await fn()
+
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        lock_key = f"{LOCK_PREFIX}{digest}"
+        result_key = f"{RESULT_PREFIX}{digest}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await self._redis.set(lock_key, token, nx=True, px=self._lock_ttl_ms)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("singleflight_lock_error", error=str(e))
+            return await fn()
+
+        if not acquired:
+            return await self._follow_remote(lock_key, result_key, fn)
+
+        try:
+            value = await fn()
+            if value is not None:
+                # Publish before releasing: followers see the lock or the result
+                await self._publish(result_key, value)
+            return value
+        finally:
+            # The lock expires on its own if this fails
+            with contextlib.suppress(redis.RedisError, OSError):
+                await self._redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+
+    async def _publish(self, result_key: str, value: str) -> None:
+        try:
+            await self._redis.set(  # type: ignore[union-attr]
+                result_key, value, px=self._result_ttl_ms
+            )
+        except (redis.RedisError, OSError) as e:
+            logger.warning("singleflight_publish_error", error=str(e))
+
+    async def _follow_remote(
+        self,
+        lock_key: str,
+        result_key: str,
+        fn: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        deadline = time.monotonic() + self._lock_ttl_ms / 1000
+        try:
+            while time.monotonic() < deadline:
+                value = await self._redis.get(result_key)  # type: ignore[union-attr]
+                if value is not None:
+                    singleflight_metrics.incr("remote_followers")
+                    return value.decode() if isinstance(value, bytes) else value
+                if not await self._redis.exists(lock_key):  # type: ignore[union-attr]
+                    break
+                await asyncio.sleep(self._poll_interval)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("singleflight_poll_error", error=str(e))
+
+        singleflight_metrics.incr("remote_fallbacks")
+        return await fn()
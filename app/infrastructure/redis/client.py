@@ -1,30 +1,176 @@
-"""Redis client management."""
+"""Redis client management.
 
-from typing import Annotated
+One connection pool (and one client) per process:
+- Created in the FastAPI lifespan via init_redis()
+- Lazily created on first use elsewhere (Celery workers, scripts)
+- Closed on shutdown via close_redis()
+
+Shared by the conversation store, LLM cache, singleflight and health
+checks. Values are returned as bytes (decode_responses=False), since
+conversation state is stored as binary blobs.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Annotated, Any
 
 import redis.asyncio as redis
 from fastapi import Depends
 
+from app.config.logging import get_logger
 from app.config.settings import Settings, get_settings
 
+logger = get_logger("redis.client")
 
-def create_redis_client(settings: Settings) -> redis.Redis:
-    """Create async Redis client."""
-    return redis.from_url(
+
+@dataclass
+class RedisPoolWaitMetrics:
+    """Cumulative connection checkout metrics for the process pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_time_total_ms: float = 0.0
+    wait_time_max_ms: float = 0.0
+
+
+class _PoolWaitRecorder:
+    """Thread-safe accumulator for pool checkout wait times."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics = RedisPoolWaitMetrics()
+
+    def record(self, wait_seconds: float, timed_out: bool) -> None:
+        wait_ms = wait_seconds * 1000
+        with self._lock:
+            self._metrics.checkouts += 1
+            self._metrics.wait_time_total_ms += wait_ms
+            if wait_ms > self._metrics.wait_time_max_ms:
+                self._metrics.wait_time_max_ms = wait_ms
+            if timed_out:
+                self._metrics.timeouts += 1
+
+    def snapshot(self) -> RedisPoolWaitMetrics:
+        with self._lock:
+            return RedisPoolWaitMetrics(**asdict(self._metrics))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics = RedisPoolWaitMetrics()
+
+
+_wait_recorder = _PoolWaitRecorder()
+
+
+class InstrumentedBlockingPool(redis.BlockingConnectionPool):
+    """Blocking pool that records how long callers wait for a connection."""
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as e:
+            timed_out = isinstance(e.__cause__, asyncio.TimeoutError)
+            raise
+        finally:
+            _wait_recorder.record(time.perf_counter() - start, timed_out)
+
+
+def create_redis_pool(settings: Settings) -> redis.ConnectionPool:
+    """Create a bounded connection pool with settings from Settings.
+
+    Callers beyond redis_max_connections wait up to
+    redis_pool_timeout_seconds for a free connection.
+    """
+    return InstrumentedBlockingPool.from_url(
         settings.redis_url,
-        encoding="utf-8",
-        decode_responses=True,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout_seconds,
+        health_check_interval=settings.redis_health_check_interval_seconds,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        socket_keepalive=True,
     )
 
 
+def create_redis_client(settings: Settings) -> redis.Redis:
+    """Create a standalone async Redis client (own connections).
+
+    Request handlers should use get_redis() instead.
+    """
+    return redis.Redis(connection_pool=create_redis_pool(settings))
+
+
+# Process-wide pool and client
+_pool: redis.ConnectionPool | None = None
+_client: redis.Redis | None = None
+
+
+def init_redis(settings: Settings | None = None) -> redis.Redis:
+    """Create the process-wide pool and client (idempotent)."""
+    global _pool, _client
+    if _client is None:
+        settings = settings or get_settings()
+        _pool = create_redis_pool(settings)
+        _client = redis.Redis(connection_pool=_pool)
+        logger.info(
+            "redis_pool_created",
+            max_connections=settings.redis_max_connections,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the process-wide client and disconnect pooled connections."""
+    global _pool, _client
+    if _client is not None:
+        await _client.aclose()
+        if _pool is not None:
+            await _pool.disconnect()
+        _client = None
+        _pool = None
+        _wait_recorder.reset()
+        logger.info("redis_pool_closed")
+
+
+def get_redis() -> redis.Redis:
+    """Get the process-wide client, creating it on first use."""
+    return init_redis()
+
+
 async def get_redis_health(
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> bool:
-    """Check Redis connectivity."""
+    """Check Redis connectivity using the shared pool."""
     try:
-        client = create_redis_client(settings)
-        await client.ping()
-        await client.aclose()
+        await init_redis(settings).ping()
         return True
     except Exception:
         return False
+
+
+def get_redis_pool_stats() -> dict[str, Any]:
+    """Get connection pool statistics for this process.
+
+    Returns:
+        Max connections, in-use/idle counts and cumulative checkout
+        wait metrics. Empty counts if no pool yet.
+    """
+    wait = _wait_recorder.snapshot()
+    stats: dict[str, Any] = {
+        "initialized": _pool is not None,
+        "max_connections": 0,
+        "in_use": 0,
+        "idle": 0,
+        **asdict(wait),
+    }
+
+    if _pool is not None:
+        stats["max_connections"] = _pool.max_connections
+        stats["in_use"] = len(_pool._in_use_connections)
+        stats["idle"] = len(_pool._available_connections)
+
+    return stats
@@ -0,0 +1,379 @@
+"""Per-conversation serialization of AI graph runs.
+
+Messages of one conversation that arrive together (e.g. three quick
+WhatsApp messages) would each load the same state, run the graph and
+overwrite each other's save. ConversationLocks runs them one at a time:
+
+- In-process, callers queue on a per-conversation asyncio.Lock (FIFO).
+- Across replicas, the holder also takes a Redis lock whose value is a
+  fencing token from a per-conversation counter. Waiters poll with
+  backoff until the lock is free or their wait budget runs out.
+
+Commits made under a lease carry its token; ConversationStateStore
+drops them if the token no longer holds the lock (it expired under a
+stalled run and another run took over).
+"""
+
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config.logging import get_logger
+from app.infrastructure.observability.histogram import LatencyHistogram
+from app.infrastructure.redis.client import get_redis
+
+logger = get_logger("redis.conversation_lock")
+
+LOCK_PREFIX = "ai:lock:"
+FENCE_PREFIX = "ai:lock:fence:"
+
+# Take all locks (KEYS: n locks, then their n fence counters), each with
+# its next fencing token; if any is held take none and return its index
+_ACQUIRE_SCRIPT = """
+local n = #KEYS / 2
+for i = 1, n do
+    if redis.call("exists", KEYS[i]) == 1 then
+        return i
+    end
+end
+local tokens = {}
+for i = 1, n do
+    tokens[i] = redis.call("incr", KEYS[n + i])
+    redis.call("pexpire", KEYS[n + i], ARGV[2])
+    redis.call("set", KEYS[i], tokens[i], "px", ARGV[1])
+end
+return tokens
+"""
+
+# Extend each lock we still own (ARGV: ttl, then tokens in KEYS order)
+_RENEW_SCRIPT = """
+local renewed = 0
+for i = 1, #KEYS do
+    if redis.call("get", KEYS[i]) == ARGV[i + 1] then
+        renewed = renewed + redis.call("pexpire", KEYS[i], ARGV[1])
+    end
+end
+return renewed
+"""
+
+# Delete each lock only if we still own it (ARGV: tokens, in KEYS order)
+_RELEASE_SCRIPT = """
+local released = 0
+for i = 1, #KEYS do
+    if redis.call("get", KEYS[i]) == ARGV[i] then
+        released = released + redis.call("del", KEYS[i])
+    end
+end
+return released
+"""
+
+
+class ConversationBusyError(Exception):
+    """Timed out waiting for another run of the same conversation."""
+
+    def __init__(self, conversation_id: str, waited_ms: float) -> None:
+        self.conversation_id = conversation_id
+        self.waited_ms = waited_ms
+        super().__init__(f"Conversation busy after {waited_ms:.0f} ms")
+
+
+class StaleConversationWriteError(Exception):
+    """Commit rejected: the lease's lock was lost to a newer run."""
+
+    def __init__(self, conversation_id: str, token: int) -> None:
+        self.conversation_id = conversation_id
+        self.token = token
+        super().__init__(f"Fencing token {token} no longer holds the conversation lock")
+
+
+@dataclass(frozen=True)
+class ConversationLease:
+    """Exclusive right to run and commit one conversation.
+
+    token is None when the Redis lock is disabled or Redis was
+    unreachable (in-process ordering only; commits are not fenced).
+    """
+
+    conversation_id: str
+    lock_key: str
+    token: int | None
+    waited_ms: float
+
+
+class ConversationLockMetrics:
+    """Thread-safe contention counters plus a wait-time histogram."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            (
+                "acquired",
+                "contended",
+                "local_waits",
+                "remote_waits",
+                "timeouts",
+                "stale_writes",
+                "redis_errors",
+            ),
+            0,
+        )
+        self._gauges = {"held": 0, "waiting": 0}
+        self.wait = LatencyHistogram()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def adjust(self, gauge: str, delta: int) -> None:
+        with self._lock:
+            self._gauges[gauge] += delta
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            gauges = dict(self._gauges)
+        acquired = counts["acquired"]
+        return {
+            **gauges,
+            **counts,
+            "contention_rate": round(counts["contended"] / acquired, 4) if acquired else 0.0,
+            "wait_ms": self.wait.snapshot(),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._counts:
+                self._counts[name] = 0
+        self.wait.reset()
+
+
+# Process-wide counters (exposed at /metrics/ai-conversation-locks)
+conversation_lock_metrics = ConversationLockMetrics()
+
+
+class _Slot:
+    """In-process queue for one conversation, dropped when unused."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class ConversationLocks:
+    """Per-conversation mutual exclusion, in-process and across replicas."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis | None = None,
+        use_redis: bool = True,
+        lock_ttl_ms: int = 30000,
+        wait_timeout_ms: int = 30000,
+        fence_ttl_ms: int = 86_400_000,
+        poll_min_ms: int = 20,
+        poll_max_ms: int = 500,
+    ) -> None:
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self._lock_ttl_ms = lock_ttl_ms
+        self._wait_timeout = wait_timeout_ms / 1000
+        self._fence_ttl_ms = fence_ttl_ms
+        self._poll_min = poll_min_ms / 1000
+        self._poll_max = poll_max_ms / 1000
+        self._slots: dict[str, _Slot] = {}
+
+    @asynccontextmanager
+    async def hold(self, conversation_id: str) -> AsyncIterator[ConversationLease]:
+        """Wait for and hold the conversation's lock.
+
+        Raises:
+            ConversationBusyError: Not acquired within the wait timeout
+        """
+        async with self.hold_many([conversation_id]) as leases:
+            yield leases[conversation_id]
+
+    @asynccontextmanager
+    async def hold_many(
+        self, conversation_ids: Iterable[str], keep_alive: bool = False
+    ) -> AsyncIterator[dict[str, ConversationLease]]:
+        """Wait for and hold the locks of several conversations.
+
+        In-process locks are taken in sorted order and Redis locks all at
+        once or not at all, so overlapping batches cannot deadlock. With
+        keep_alive the Redis locks are renewed while held, for work that
+        may outlast the lock TTL (a batch running many graph turns).
+
+        Raises:
+            ConversationBusyError: Not all acquired within the wait timeout
+        """
+        ids = sorted(set(conversation_ids))
+        start = time.monotonic()
+        deadline = start + self._wait_timeout
+        slots = [self._join(conversation_id) for conversation_id in ids]
+        # Another run holds or awaits one of these conversations
+        contended = any(slot.users > 1 for slot in slots)
+        locked: list[_Slot] = []
+        conversation_lock_metrics.adjust("waiting", len(ids))
+        waiting = True
+        try:
+            if contended:
+                conversation_lock_metrics.incr("local_waits")
+            for conversation_id, slot in zip(ids, slots, strict=True):
+                try:
+                    await asyncio.wait_for(
+                        slot.lock.acquire(), timeout=max(deadline - time.monotonic(), 0)
+                    )
+                except TimeoutError:
+                    raise self._busy(conversation_id, start) from None
+                locked.append(slot)
+
+            tokens, remote_waited, busy_id = await self._acquire_remote(ids, deadline)
+            if busy_id is not None:
+                raise self._busy(busy_id, start)
+            contended = contended or remote_waited
+
+            waited_ms = (time.monotonic() - start) * 1000
+            conversation_lock_metrics.incr("acquired", len(ids))
+            if contended:
+                conversation_lock_metrics.incr("contended", len(ids))
+            conversation_lock_metrics.wait.observe(waited_ms)
+            conversation_lock_metrics.adjust("waiting", -len(ids))
+            conversation_lock_metrics.adjust("held", len(ids))
+            waiting = False
+
+            leases = {
+                conversation_id: ConversationLease(
+                    conversation_id=conversation_id,
+                    lock_key=f"{LOCK_PREFIX}{conversation_id}",
+                    token=token,
+                    waited_ms=waited_ms,
+                )
+                for conversation_id, token in zip(ids, tokens, strict=True)
+            }
+            renewer = None
+            if keep_alive and any(token is not None for token in tokens):
+                renewer = asyncio.create_task(self._keep_alive(list(leases.values())))
+            try:
+                yield leases
+            finally:
+                if renewer is not None:
+                    renewer.cancel()
+                    await asyncio.gather(renewer, return_exceptions=True)
+                conversation_lock_metrics.adjust("held", -len(ids))
+                await self._release_remote(leases.values())
+        finally:
+            for slot in locked:
+                slot.lock.release()
+            if waiting:
+                conversation_lock_metrics.adjust("waiting", -len(ids))
+            for conversation_id, slot in zip(ids, slots, strict=True):
+                slot.users -= 1
+                if slot.users == 0:
+                    del self._slots[conversation_id]
+
+    def _join(self, conversation_id: str) -> _Slot:
+        slot = self._slots.get(conversation_id)
+        if slot is None:
+            slot = self._slots[conversation_id] = _Slot()
+        slot.users += 1
+        return slot
+
+    async def _acquire_remote(
+        self, conversation_ids: list[str], deadline: float
+    ) -> tuple[list[int | None], bool, str | None]:
+        """Take every Redis lock at once: (tokens, waited, busy id).
+
+        busy id names a conversation still held when the deadline passed.
+        Fails open (no tokens) if Redis is disabled or unreachable.
+        """
+        no_tokens: list[int | None] = [None] * len(conversation_ids)
+        if not self._use_redis:
+            return no_tokens, False, None
+
+        r = self._redis or get_redis()
+        keys = [f"{LOCK_PREFIX}{conversation_id}" for conversation_id in conversation_ids]
+        keys += [f"{FENCE_PREFIX}{conversation_id}" for conversation_id in conversation_ids]
+        delay = self._poll_min
+        waited = False
+        try:
+            while True:
+                result = await r.eval(
+                    _ACQUIRE_SCRIPT, len(keys), *keys, self._lock_ttl_ms, self._fence_ttl_ms
+                )
+                if isinstance(result, list):
+                    return [int(token) for token in result], waited, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return no_tokens, waited, conversation_ids[int(result) - 1]
+                if not waited:
+                    waited = True
+                    conversation_lock_metrics.incr("remote_waits")
+                await asyncio.sleep(min(delay * random.uniform(0.5, 1.0), remaining))
+                delay = min(delay * 2, self._poll_max)
+        except (redis.RedisError, OSError) as e:
+            conversation_lock_metrics.incr("redis_errors")
+            logger.warning(
+                "conversation_lock_error",
+                conversations=len(conversation_ids),
+                error=str(e),
+            )
+            return no_tokens, waited, None
+
+    async def _keep_alive(self, leases: list[ConversationLease]) -> None:
+        """Renew held Redis locks every third of their TTL until cancelled."""
+        held = [lease for lease in leases if lease.token is not None]
+        r = self._redis or get_redis()
+        while True:
+            await asyncio.sleep(self._lock_ttl_ms / 3000)
+            try:
+                renewed = await r.eval(
+                    _RENEW_SCRIPT,
+                    len(held),
+                    *(lease.lock_key for lease in held),
+                    self._lock_ttl_ms,
+                    *(lease.token for lease in held),
+                )
+            except (redis.RedisError, OSError) as e:
+                conversation_lock_metrics.incr("redis_errors")
+                logger.warning("conversation_lock_renew_error", error=str(e))
+                continue
+            if int(renewed) < len(held):
+                # Their commits will be fenced off; keep the rest alive
+                logger.warning(
+                    "conversation_lock_lost",
+                    conversations=len(held),
+                    renewed=int(renewed),
+                )
+
+    async def _release_remote(self, leases: Iterable[ConversationLease]) -> None:
+        held = [lease for lease in leases if lease.token is not None]
+        if not held:
+            return
+        r = self._redis or get_redis()
+        # The locks expire on their own if this fails
+        with contextlib.suppress(redis.RedisError, OSError):
+            await r.eval(
+                _RELEASE_SCRIPT,
+                len(held),
+                *(lease.lock_key for lease in held),
+                *(lease.token for lease in held),
+            )
+
+    def _busy(self, conversation_id: str, start: float) -> ConversationBusyError:
+        waited_ms = (time.monotonic() - start) * 1000
+        conversation_lock_metrics.incr("timeouts")
+        logger.warning(
+            "conversation_lock_timeout",
+            conversation_id=conversation_id,
+            waited_ms=round(waited_ms, 1),
+        )
+        return ConversationBusyError(conversation_id, waited_ms)
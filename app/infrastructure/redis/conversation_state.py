@@ -1,28 +1,81 @@
 """Redis-based conversation state persistence.
 
-Stores AI conversation state with TTL for ephemeral data.
-No PII in logs.
+Stores AI conversation state with TTL for ephemeral data, one Redis
+hash per conversation. Saves write only the fields changed since the
+state was loaded (tracked by AIGraphState.with_updates) and refresh
+the TTL with EXPIRE. No PII in logs.
 """
 
+import asyncio
 import json
-from dataclasses import asdict
-from datetime import datetime
+from collections.abc import AsyncIterator, Mapping, Sequence
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
 from typing import Any
 
 import redis.asyncio as redis
 
-from app.ai.state import (
-    AIGraphState,
-    ConfirmationStatus,
-    ExtractedEntities,
-    Intent,
-    ValidationResult,
-)
+from app.ai.state import AIGraphState
 from app.config.logging import get_logger
 from app.config.settings import get_settings
+from app.infrastructure.redis.client import get_redis
+from app.infrastructure.redis.conversation_lock import (
+    ConversationLease,
+    ConversationLocks,
+    StaleConversationWriteError,
+    conversation_lock_metrics,
+)
+from app.infrastructure.redis.near_cache import (
+    INVALIDATION_CHANNEL,
+    NearCache,
+    listen_for_invalidations,
+)
+from app.infrastructure.redis.state_codec import PERSISTED_FIELDS, StateCodec
 
 logger = get_logger("redis.conversation_state")
 
+# Fenced commit: apply only while the lease's token still holds the lock.
+# KEYS: lock, state hash, blob, confirmation
+# ARGV: token, ttl, drop blob (0/1), confirmation action (set/clear/""),
+#       confirmation payload, confirmation ttl, then field/value pairs
+_FENCED_COMMIT_SCRIPT = """
+if redis.call("get", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[3] == "1" then
+    redis.call("del", KEYS[3])
+end
+if #ARGV > 6 then
+    redis.call("hset", KEYS[2], unpack(ARGV, 7))
+end
+redis.call("expire", KEYS[2], ARGV[2])
+if ARGV[4] == "set" then
+    redis.call("set", KEYS[4], ARGV[5], "ex", ARGV[6])
+elseif ARGV[4] == "clear" then
+    redis.call("del", KEYS[4])
+end
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class ConversationCommit:
+    """State to save plus what to do with the pending confirmation."""
+
+    conversation_id: str
+    state: AIGraphState
+    pending_confirmation: dict[str, Any] | None = None
+    clear_confirmation: bool = False  # ignored when pending_confirmation is given
+    lease: ConversationLease | None = None
+
+
+@dataclass(frozen=True)
+class LoadedConversation:
+    """Conversation state and pending confirmation, read together."""
+
+    state: AIGraphState | None
+    pending_confirmation: dict[str, Any] | None
+
 
 class ConversationStateStore:
     """Redis-based conversation state storage.
@@ -30,26 +83,171 @@ class ConversationStateStore:
     Features:
     - TTL-based expiration
     - Separate TTL for pending confirmations
-    - JSON serialization
+    - State as a hash of compact per-field values (see state_codec);
+      only changed fields are written. Blob/JSON states from earlier
+      releases are still read and rewritten as hashes on next save
+    - Single round-trip load and atomic commit (MULTI/EXEC) of
+      state + pending confirmation
+    - Optional in-process near cache, invalidated via pub/sub
+    - Per-conversation lock (see conversation_lock) so concurrent
+      messages run one at a time; commits under a lease are fenced
+    - Uses the process-wide Redis pool unless a client is injected
     - No PII logging
     """
 
-    STATE_PREFIX = "ai:state:"
+    STATE_PREFIX = "ai:state:h:"
+    BLOB_STATE_PREFIX = "ai:state:"  # earlier releases; read-only
     CONFIRMATION_PREFIX = "ai:confirm:"
 
-    def __init__(self, redis_url: str | None = None) -> None:
+    def __init__(
+        self,
+        redis_client: redis.Redis | None = None,
+        near_cache: NearCache | None = None,
+        locks: ConversationLocks | None = None,
+    ) -> None:
         settings = get_settings()
-        self._redis_url = redis_url or settings.redis_url
         self._state_ttl = settings.ai_state_ttl_seconds
         self._confirmation_ttl = settings.ai_confirmation_ttl_seconds
-        self._redis: redis.Redis | None = None
+        self._codec = StateCodec(
+            payload_format=settings.ai_state_codec,
+            compress_min_bytes=settings.ai_state_compress_min_bytes,
+        )
+        self._redis = redis_client
+        self._near = near_cache
+        self._locks = locks or ConversationLocks(
+            redis_client=redis_client,
+            use_redis=settings.ai_conversation_lock_redis,
+            lock_ttl_ms=settings.ai_conversation_lock_ttl_ms,
+            wait_timeout_ms=settings.ai_conversation_lock_wait_ms,
+        )
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def near_cache(self) -> NearCache | None:
+        return self._near
+
+    def start_invalidation_listener(self) -> None:
+        """Start evicting near-cache entries written by other replicas.
+
+        The near cache stays bypassed until the listener is subscribed.
+        """
+        if self._near is not None and self._listener is None:
+            self._listener = asyncio.create_task(
+                listen_for_invalidations(self._near, self._redis or get_redis())
+            )
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    def _publish_write(self, pipe: Any, conversation_id: str) -> None:
+        """Queue a near-cache invalidation for other replicas."""
+        if self._near is not None:
+            pipe.publish(INVALIDATION_CHANNEL, self._near.message_for(conversation_id))
 
     async def _get_redis(self) -> redis.Redis:
-        """Get or create Redis connection."""
+        """Get the injected client, or the process-wide pooled one."""
         if self._redis is None:
-            self._redis = redis.from_url(self._redis_url, decode_responses=True)
+            return get_redis()
         return self._redis
 
+    def _queue_state_read(self, pipe: Any, conversation_id: str) -> None:
+        pipe.hgetall(f"{self.STATE_PREFIX}{conversation_id}")
+        pipe.get(f"{self.BLOB_STATE_PREFIX}{conversation_id}")
+
+    def _decode_state(
+        self, fields: dict[bytes, bytes] | None, blob: bytes | None
+    ) -> AIGraphState | None:
+        """State from its hash, else from a pre-hash blob (fully dirty)."""
+        if fields:
+            state = self._codec.decode_fields(fields)
+            if state is not None:
+                return state.clean()
+        if blob is not None:
+            return self._codec.decode(blob)
+        return None
+
+    def _state_mapping(self, state: AIGraphState) -> tuple[dict[str, bytes], bool]:
+        """Hash fields to write, and whether a pre-hash blob must be dropped."""
+        if state.dirty_fields is None:
+            # Never persisted as a hash: write everything, drop any old blob
+            return self._codec.encode_fields(state), True
+        names = [name for name in PERSISTED_FIELDS if name in state.dirty_fields]
+        return (self._codec.encode_fields(state, names) if names else {}), False
+
+    def _queue_state_write(
+        self, pipe: Any, conversation_id: str, state: AIGraphState, ttl: int
+    ) -> int:
+        """Queue HSET of changed fields + EXPIRE; returns fields written."""
+        key = f"{self.STATE_PREFIX}{conversation_id}"
+        mapping, drop_blob = self._state_mapping(state)
+        if drop_blob:
+            pipe.delete(f"{self.BLOB_STATE_PREFIX}{conversation_id}")
+        if mapping:
+            pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl)
+        return len(mapping)
+
+    def _queue_fenced_commit(
+        self,
+        pipe: Any,
+        lease: ConversationLease,
+        state: AIGraphState,
+        ttl: int,
+        confirmation_action: str,
+        confirmation_payload: str,
+    ) -> int:
+        """Queue the fenced commit script; returns fields written."""
+        conversation_id = lease.conversation_id
+        mapping, drop_blob = self._state_mapping(state)
+        pairs = [item for field_value in mapping.items() for item in field_value]
+        pipe.eval(
+            _FENCED_COMMIT_SCRIPT,
+            4,
+            lease.lock_key,
+            f"{self.STATE_PREFIX}{conversation_id}",
+            f"{self.BLOB_STATE_PREFIX}{conversation_id}",
+            f"{self.CONFIRMATION_PREFIX}{conversation_id}",
+            lease.token,
+            ttl,
+            int(drop_blob),
+            confirmation_action,
+            confirmation_payload,
+            self._confirmation_ttl,
+            *pairs,
+        )
+        return len(mapping)
+
+    @asynccontextmanager
+    async def conversation_lock(self, conversation_id: str) -> AsyncIterator[ConversationLease]:
+        """Hold the conversation for one load → run → commit cycle.
+
+        Later messages of the same conversation wait until the lease is
+        released. Pass the lease to commit_conversation to fence the write.
+
+        Raises:
+            ConversationBusyError: Not acquired within the wait timeout
+        """
+        async with self._locks.hold(conversation_id) as lease:
+            yield lease
+
+    @asynccontextmanager
+    async def conversation_locks(
+        self, conversation_ids: Sequence[str]
+    ) -> AsyncIterator[dict[str, ConversationLease]]:
+        """Hold several conversations at once (all or none; no deadlocks).
+
+        The locks are renewed while held, so a long batch keeps them.
+
+        Raises:
+            ConversationBusyError: Not all acquired within the wait timeout
+        """
+        async with self._locks.hold_many(conversation_ids, keep_alive=True) as leases:
+            yield leases
+
     async def save_state(
         self,
         conversation_id: str,
@@ -64,40 +262,57 @@ class ConversationStateStore:
             ttl_seconds: Optional TTL override (default: 30 minutes)
         """
         r = await self._get_redis()
-        key = f"{self.STATE_PREFIX}{conversation_id}"
         ttl = ttl_seconds or self._state_ttl
 
-        data = self._serialize_state(state)
-
-        await r.setex(key, ttl, json.dumps(data))
+        async with r.pipeline(transaction=True) as pipe:
+            written = self._queue_state_write(pipe, conversation_id, state, ttl)
+            self._publish_write(pipe, conversation_id)
+            await pipe.execute()
+        if self._near is not None:
+            self._near.put(conversation_id, state.clean())
 
         logger.info(
             "state_saved",
             conversation_id=conversation_id,
             ttl=ttl,
+            fields_written=written,
         )
 
-    async def load_state(self, conversation_id: str) -> AIGraphState | None:
+    async def load_state(
+        self, conversation_id: str, lease: ConversationLease | None = None
+    ) -> AIGraphState | None:
         """Load conversation state from Redis.
 
         Args:
             conversation_id: Unique conversation identifier
+            lease: Lease held for this conversation; the near cache is
+                used only if nothing can have been committed since its entry
 
         Returns:
             AIGraphState if found, None if expired/missing
         """
+        token = _token(lease)
+        if self._near is not None:
+            cached = self._near.get(conversation_id, token)
+            if cached is not None:
+                return cached
+            epoch = self._near.epoch
+
         r = await self._get_redis()
-        key = f"{self.STATE_PREFIX}{conversation_id}"
+        async with r.pipeline(transaction=False) as pipe:
+            self._queue_state_read(pipe, conversation_id)
+            fields, blob = await pipe.execute()
 
-        data = await r.get(key)
-        if data is None:
+        state = self._decode_state(fields, blob)
+        if state is None:
             logger.info(
                 "state_not_found",
                 conversation_id=conversation_id,
             )
             return None
 
-        state = self._deserialize_state(json.loads(data))
+        if self._near is not None:
+            self._near.put(conversation_id, state, epoch, token)
 
         logger.info(
             "state_loaded",
@@ -116,9 +331,16 @@ class ConversationStateStore:
             True if deleted, False if not found
         """
         r = await self._get_redis()
-        key = f"{self.STATE_PREFIX}{conversation_id}"
 
-        deleted = await r.delete(key)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.delete(
+                f"{self.STATE_PREFIX}{conversation_id}",
+                f"{self.BLOB_STATE_PREFIX}{conversation_id}",
+            )
+            self._publish_write(pipe, conversation_id)
+            deleted = (await pipe.execute())[0]
+        if self._near is not None:
+            self._near.invalidate(conversation_id)
 
         logger.info(
             "state_deleted",
@@ -154,9 +376,7 @@ class ConversationStateStore:
             ttl=self._confirmation_ttl,
         )
 
-    async def load_pending_confirmation(
-        self, conversation_id: str
-    ) -> dict[str, Any] | None:
+    async def load_pending_confirmation(self, conversation_id: str) -> dict[str, Any] | None:
         """Load pending confirmation from Redis.
 
         Args:
@@ -182,82 +402,253 @@ class ConversationStateStore:
         deleted = await r.delete(key)
         return deleted > 0
 
-    async def close(self) -> None:
-        """Close Redis connection."""
-        if self._redis is not None:
-            await self._redis.close()
-            self._redis = None
-
-    def _serialize_state(self, state: AIGraphState) -> dict[str, Any]:
-        """Serialize state to JSON-compatible dict."""
-        return {
-            "conversation_id": state.conversation_id,
-            "tenant_id": state.tenant_id,
-            "user_id": state.user_id,
-            "user_input": state.user_input,
-            "input_type": state.input_type,
-            "normalized_input": state.normalized_input,
-            "intent": state.intent.value if state.intent else None,
-            "intent_confidence": state.intent_confidence,
-            "entities": state.entities.to_dict(),
-            "validation_result": state.validation_result.value,
-            "validation_errors": state.validation_errors,
-            "confirmation_status": state.confirmation_status.value,
-            "confirmation_message": state.confirmation_message,
-            "tool_name": state.tool_name,
-            "tool_result": state.tool_result,
-            "tool_error": state.tool_error,
-            "response": state.response,
-            "created_at": state.created_at.isoformat(),
-            "step_count": state.step_count,
-        }
-
-    def _deserialize_state(self, data: dict[str, Any]) -> AIGraphState:
-        """Deserialize state from JSON dict."""
-        intent = None
-        if data.get("intent"):
-            try:
-                intent = Intent(data["intent"])
-            except ValueError:
-                intent = Intent.UNKNOWN
-
-        entities_data = data.get("entities", {})
-        entities = ExtractedEntities(
-            contact_name=entities_data.get("contact_name"),
-            contact_phone=entities_data.get("contact_phone"),
-            amount_cents=entities_data.get("amount_cents"),
-            due_date=entities_data.get("due_date"),
-            boleto_id=entities_data.get("boleto_id"),
-            message_content=entities_data.get("message_content"),
-            raw=entities_data.get("raw", {}),
+    async def load_conversation(
+        self, conversation_id: str, lease: ConversationLease | None = None
+    ) -> LoadedConversation:
+        """Load state and pending confirmation in one round trip.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            lease: Lease held for this conversation (see load_state)
+
+        Returns:
+            LoadedConversation; either part is None if expired/missing
+        """
+        r = await self._get_redis()
+        confirmation_key = f"{self.CONFIRMATION_PREFIX}{conversation_id}"
+        token = _token(lease)
+
+        state = self._near.get(conversation_id, token) if self._near is not None else None
+        if state is not None:
+            confirmation_data = await r.get(confirmation_key)
+        else:
+            epoch = self._near.epoch if self._near is not None else 0
+            async with r.pipeline(transaction=False) as pipe:
+                self._queue_state_read(pipe, conversation_id)
+                pipe.get(confirmation_key)
+                fields, blob, confirmation_data = await pipe.execute()
+
+            state = self._decode_state(fields, blob)
+            if state is not None and self._near is not None:
+                self._near.put(conversation_id, state, epoch, token)
+
+        logger.info(
+            "conversation_loaded",
+            conversation_id=conversation_id,
+            has_state=state is not None,
+            has_pending_confirmation=confirmation_data is not None,
         )
 
-        return AIGraphState(
-            conversation_id=data["conversation_id"],
-            tenant_id=data.get("tenant_id"),
-            user_id=data.get("user_id"),
-            user_input=data.get("user_input", ""),
-            input_type=data.get("input_type", "text"),
-            normalized_input=data.get("normalized_input"),
-            intent=intent,
-            intent_confidence=data.get("intent_confidence", 0.0),
-            entities=entities,
-            validation_result=ValidationResult(
-                data.get("validation_result", "fail")
-            ),
-            validation_errors=data.get("validation_errors", []),
-            confirmation_status=ConfirmationStatus(
-                data.get("confirmation_status", "not_required")
+        return LoadedConversation(
+            state=state,
+            pending_confirmation=(
+                json.loads(confirmation_data) if confirmation_data is not None else None
             ),
-            confirmation_message=data.get("confirmation_message"),
-            tool_name=data.get("tool_name"),
-            tool_result=data.get("tool_result"),
-            tool_error=data.get("tool_error"),
-            response=data.get("response"),
-            created_at=datetime.fromisoformat(data["created_at"]),
-            step_count=data.get("step_count", 0),
         )
 
+    async def load_states(
+        self,
+        conversation_ids: Sequence[str],
+        leases: Mapping[str, ConversationLease] | None = None,
+    ) -> dict[str, AIGraphState | None]:
+        """Load many conversation states in one round trip.
+
+        Args:
+            conversation_ids: Conversation identifiers (duplicates allowed)
+            leases: Leases held for these conversations (see load_state)
+
+        Returns:
+            State per conversation id; None if expired/missing
+        """
+        leases = leases or {}
+        states: dict[str, AIGraphState | None] = {}
+        missing: list[str] = []
+        for conversation_id in dict.fromkeys(conversation_ids):
+            token = _token(leases.get(conversation_id))
+            cached = self._near.get(conversation_id, token) if self._near is not None else None
+            if cached is not None:
+                states[conversation_id] = cached
+            else:
+                missing.append(conversation_id)
+
+        if missing:
+            epoch = self._near.epoch if self._near is not None else 0
+            r = await self._get_redis()
+            async with r.pipeline(transaction=False) as pipe:
+                for conversation_id in missing:
+                    self._queue_state_read(pipe, conversation_id)
+                results = await pipe.execute()
+
+            for i, conversation_id in enumerate(missing):
+                state = self._decode_state(results[2 * i], results[2 * i + 1])
+                states[conversation_id] = state
+                if state is not None and self._near is not None:
+                    self._near.put(
+                        conversation_id, state, epoch, _token(leases.get(conversation_id))
+                    )
+
+        logger.info(
+            "states_loaded",
+            conversations=len(states),
+            found=sum(state is not None for state in states.values()),
+            redis_reads=len(missing),
+        )
+
+        return states
+
+    async def commit_conversation(
+        self,
+        conversation_id: str,
+        state: AIGraphState,
+        pending_confirmation: dict[str, Any] | None = None,
+        clear_confirmation: bool = False,
+        ttl_seconds: int | None = None,
+        lease: ConversationLease | None = None,
+    ) -> None:
+        """Save state and set or clear the pending confirmation atomically.
+
+        All writes go in one MULTI/EXEC pipeline (one round trip). With a
+        fenced lease they run in one script that first checks the lease
+        still holds the conversation lock.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            state: AI graph state to persist
+            pending_confirmation: Confirmation data to save (short TTL)
+            clear_confirmation: Delete any pending confirmation
+                (ignored when pending_confirmation is given)
+            ttl_seconds: Optional state TTL override (default: 30 minutes)
+            lease: Lease from conversation_lock() for this conversation
+
+        Raises:
+            StaleConversationWriteError: The lease lost its lock; nothing
+                was written
+        """
+        ttl = ttl_seconds or self._state_ttl
+        commit = ConversationCommit(
+            conversation_id=conversation_id,
+            state=state,
+            pending_confirmation=pending_confirmation,
+            clear_confirmation=clear_confirmation,
+            lease=lease,
+        )
+        [(committed, written)] = await self._commit_many([commit], ttl)
+        if not committed:
+            raise StaleConversationWriteError(
+                conversation_id, lease.token if lease and lease.token else 0
+            )
+
+        logger.info(
+            "conversation_committed",
+            conversation_id=conversation_id,
+            ttl=ttl,
+            fields_written=written,
+            confirmation_saved=pending_confirmation is not None,
+            confirmation_cleared=pending_confirmation is None and clear_confirmation,
+        )
+
+    async def commit_conversations(
+        self,
+        commits: Sequence[ConversationCommit],
+        ttl_seconds: int | None = None,
+    ) -> list[bool]:
+        """Commit many conversations in one MULTI/EXEC pipeline.
+
+        Args:
+            commits: One entry per conversation
+            ttl_seconds: Optional state TTL override (default: 30 minutes)
+
+        Returns:
+            Per commit, False if its lease lost the lock (nothing of that
+            conversation was written; the others still were)
+        """
+        ttl = ttl_seconds or self._state_ttl
+        outcomes = await self._commit_many(commits, ttl)
+
+        logger.info(
+            "conversations_committed",
+            conversations=len(commits),
+            stale=sum(not committed for committed, _ in outcomes),
+            ttl=ttl,
+            fields_written=sum(written for _, written in outcomes),
+        )
+
+        return [committed for committed, _ in outcomes]
+
+    async def _commit_many(
+        self, commits: Sequence[ConversationCommit], ttl: int
+    ) -> list[tuple[bool, int]]:
+        """Queue every commit in one transaction: (committed, fields written) each."""
+        if not commits:
+            return []
+        r = await self._get_redis()
+        queued: list[tuple[int | None, int]] = []
+        async with r.pipeline(transaction=True) as pipe:
+            for commit in commits:
+                queued.append(self._queue_commit(pipe, commit, ttl))
+            results = await pipe.execute()
+
+        outcomes: list[tuple[bool, int]] = []
+        for commit, (check, written) in zip(commits, queued, strict=True):
+            committed = check is None or bool(results[check])
+            if not committed:
+                conversation_lock_metrics.incr("stale_writes")
+                logger.warning(
+                    "conversation_commit_stale",
+                    conversation_id=commit.conversation_id,
+                    token=commit.lease.token if commit.lease else None,
+                )
+            elif self._near is not None:
+                self._near.put(
+                    commit.conversation_id, commit.state.clean(), token=_token(commit.lease)
+                )
+            outcomes.append((committed, written))
+        return outcomes
+
+    def _queue_commit(
+        self, pipe: Any, commit: ConversationCommit, ttl: int
+    ) -> tuple[int | None, int]:
+        """Queue one commit: (index of its fencing check result, fields written)."""
+        conversation_id = commit.conversation_id
+        lease = commit.lease
+        if lease is not None and lease.token is None:
+            lease = None  # lock ran in-process only: nothing to fence against
+
+        check = None
+        if lease is not None:
+            action = ""
+            if commit.pending_confirmation is not None:
+                action = "set"
+            elif commit.clear_confirmation:
+                action = "clear"
+            check = len(pipe)
+            written = self._queue_fenced_commit(
+                pipe,
+                lease,
+                commit.state,
+                ttl,
+                action,
+                json.dumps(commit.pending_confirmation) if action == "set" else "",
+            )
+        else:
+            confirmation_key = f"{self.CONFIRMATION_PREFIX}{conversation_id}"
+            written = self._queue_state_write(pipe, conversation_id, commit.state, ttl)
+            if commit.pending_confirmation is not None:
+                pipe.setex(
+                    confirmation_key,
+                    self._confirmation_ttl,
+                    json.dumps(commit.pending_confirmation),
+                )
+            elif commit.clear_confirmation:
+                pipe.delete(confirmation_key)
+        self._publish_write(pipe, conversation_id)
+        return check, written
+
+
+def _token(lease: ConversationLease | None) -> int | None:
+    """Fencing token of a lease (None: no lease, or not fenced)."""
+    return lease.token if lease is not None else None
+
 
 # Singleton instance
 _store: ConversationStateStore | None = None
@@ -267,5 +658,12 @@ def get_conversation_store() -> ConversationStateStore:
     """Get singleton conversation state store."""
     global _store
     if _store is None:
-        _store = ConversationStateStore()
+        settings = get_settings()
+        near_cache = None
+        if settings.ai_state_near_cache_enabled:
+            near_cache = NearCache(
+                max_entries=settings.ai_state_near_cache_max_entries,
+                ttl_seconds=settings.ai_state_ttl_seconds,
+            )
+        _store = ConversationStateStore(near_cache=near_cache)
     return _store
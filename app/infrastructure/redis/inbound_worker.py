@@ -0,0 +1,419 @@
+"""Graph workers for the inbound AI message stream.
+
+Long-lived process that owns a share of the inbound stream partitions
+(see message_stream), runs each message through the AI graph and queues
+the reply in the outbox, which delivers it like any other message.
+
+Partition ownership: workers heartbeat into a Redis sorted set and each
+takes ceil(partitions / live workers) partitions via short leases,
+renewed while alive. A partition has one owner at a time and is consumed
+by one task, in stream order, which keeps per-conversation ordering.
+Partitions of a dead worker are taken over when their leases lapse.
+
+Run with:
+    python -m app.infrastructure.redis.inbound_worker
+"""
+
+import asyncio
+import contextlib
+import math
+import os
+import signal
+import socket
+import threading
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.ai.conversation import process_message
+from app.ai.graph import get_graph
+from app.ai.nodes import configure_llm_provider
+from app.application.messaging.dto import QueueMessageInput
+from app.application.messaging.use_cases.queue_message import QueueMessageUseCase
+from app.config.logging import configure_logging, get_logger
+from app.config.settings import Settings, get_settings
+from app.domain.messaging.exceptions import DuplicateMessageError
+from app.domain.messaging.value_objects.message_type import MessageType
+from app.infrastructure.db.repositories.contacts import ContactRepository
+from app.infrastructure.db.repositories.identity import TenantRepository
+from app.infrastructure.db.repositories.messaging import OutboxRepository
+from app.infrastructure.db.session import dispose_engine
+from app.infrastructure.observability.histogram import LatencyHistogram
+from app.infrastructure.providers.gemini_llm import (
+    close_gemini_client,
+    init_gemini_client,
+)
+from app.infrastructure.providers.llm_factory import create_llm_provider
+from app.infrastructure.redis.client import close_redis, get_redis, init_redis
+from app.infrastructure.redis.conversation_lock import ConversationBusyError
+from app.infrastructure.redis.conversation_state import get_conversation_store
+from app.infrastructure.redis.message_stream import (
+    InboundMessage,
+    MessageStream,
+    StreamEntry,
+    get_message_stream,
+)
+
+logger = get_logger("inbound_worker")
+
+OWNER_PREFIX = "ai:inbound:owner:"
+WORKERS_KEY = "ai:inbound:workers"
+RETRY_DELAY_SECONDS = 1.0
+
+# Extend the lease only if we still own it
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+MessageHandler = Callable[[InboundMessage], Awaitable[None]]
+
+
+class InboundWorkerMetrics:
+    """Thread-safe counters plus end-to-end (append → acked) latency."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ("processed", "retries", "dead_lettered", "claimed", "rebalances"), 0
+        )
+        self.partitions_owned = 0
+        self.latency = LatencyHistogram()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "partitions_owned": self.partitions_owned,
+            "latency_ms": self.latency.snapshot(),
+        }
+
+
+class InboundWorker:
+    """Consumes owned partitions, one task per partition."""
+
+    def __init__(
+        self,
+        stream: MessageStream,
+        handler: MessageHandler,
+        worker_id: str,
+        redis_client: redis.Redis | None = None,
+        lease_ttl_ms: int = 15000,
+        batch_size: int = 10,
+        block_ms: int = 2000,
+        max_attempts: int = 3,
+        max_busy_retries: int = 30,
+    ) -> None:
+        self._stream = stream
+        self._handler = handler
+        self.worker_id = worker_id
+        self._redis = redis_client
+        self._lease_ttl_ms = lease_ttl_ms
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._max_attempts = max_attempts
+        self._max_busy_retries = max_busy_retries
+        # partition → consumer task; a partition leaves _owned when it
+        # must be handed over, and its task exits after its current batch
+        # (its lease is renewed until then)
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._owned: set[int] = set()
+        self.metrics = InboundWorkerMetrics()
+
+    def _client(self) -> redis.Redis:
+        return self._redis or get_redis()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Rebalance and consume until `stop` is set, then hand over."""
+        interval = self._lease_ttl_ms / 3000
+        try:
+            while not stop.is_set():
+                try:
+                    await self._rebalance()
+                except (redis.RedisError, OSError) as e:
+                    logger.warning("inbound_rebalance_failed", error=str(e))
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=interval)
+        finally:
+            self._owned.clear()
+            if self._tasks:
+                await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            # Pruned once its heartbeat is stale if this fails
+            with contextlib.suppress(redis.RedisError, OSError):
+                await self._client().zrem(WORKERS_KEY, self.worker_id)
+            logger.info("inbound_worker_stopped", **self.metrics.snapshot())
+
+    async def _rebalance(self) -> None:
+        """Heartbeat, renew leases, then grow or shrink to a fair share."""
+        r = self._client()
+        now_ms = int(time.time() * 1000)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.zadd(WORKERS_KEY, {self.worker_id: now_ms})
+            pipe.zremrangebyscore(WORKERS_KEY, "-inf", now_ms - self._lease_ttl_ms)
+            pipe.zcard(WORKERS_KEY)
+            _, _, live_workers = await pipe.execute()
+
+        # Handed-over partitions keep their lease until their task has
+        # acked its last batch, so no new owner claims entries in flight
+        for partition in sorted(self._owned | self._tasks.keys()):
+            renewed = await r.eval(
+                _RENEW_SCRIPT, 1, _owner_key(partition), self.worker_id, self._lease_ttl_ms
+            )
+            if not renewed and partition in self._owned:
+                logger.warning("inbound_partition_lost", partition=partition)
+                self._owned.discard(partition)
+
+        share = math.ceil(self._stream.partitions / max(live_workers, 1))
+        while len(self._owned) > share:
+            # Hand over; the task releases the lease once its batch is acked
+            self._owned.discard(max(self._owned))
+            self.metrics.incr("rebalances")
+
+        if len(self._owned) < share:
+            # Start probing at a per-worker offset to spread first picks
+            offset = zlib.crc32(self.worker_id.encode())
+            for i in range(self._stream.partitions):
+                if len(self._owned) >= share:
+                    break
+                partition = (offset + i) % self._stream.partitions
+                if partition in self._owned or partition in self._tasks:
+                    continue
+                acquired = await r.set(
+                    _owner_key(partition), self.worker_id, nx=True, px=self._lease_ttl_ms
+                )
+                if acquired:
+                    self._owned.add(partition)
+                    self._tasks[partition] = asyncio.create_task(self._consume(partition))
+
+        self.metrics.partitions_owned = len(self._owned)
+        logger.debug(
+            "inbound_rebalanced",
+            live_workers=live_workers,
+            share=share,
+            owned=sorted(self._owned),
+        )
+
+    async def _consume(self, partition: int) -> None:
+        try:
+            await self._stream.ensure_group(partition)
+            # Entries the previous owner read but never acked come first
+            await self._claim(partition)
+
+            while partition in self._owned:
+                try:
+                    entries = await self._stream.read(
+                        partition, self.worker_id, self._batch_size, self._block_ms
+                    )
+                except (redis.RedisError, OSError) as e:
+                    logger.warning("inbound_read_failed", partition=partition, error=str(e))
+                    await asyncio.sleep(RETRY_DELAY_SECONDS)
+                    continue
+                if not entries:
+                    # Idle: pick up entries a failed or lapsed owner left
+                    await self._claim(partition)
+                    continue
+                await self._process(partition, entries)
+        except Exception as e:
+            logger.exception("inbound_partition_failed", partition=partition, error=str(e))
+            self._owned.discard(partition)
+        finally:
+            self._tasks.pop(partition, None)
+            # The lease expires on its own if this fails
+            with contextlib.suppress(redis.RedisError, OSError):
+                await self._client().eval(_RELEASE_SCRIPT, 1, _owner_key(partition), self.worker_id)
+
+    async def _claim(self, partition: int) -> None:
+        """Process unacked entries idle for at least a lease TTL.
+
+        A live owner renews its lease for as long as it works on a batch,
+        so entries idle that long belong to an owner that is gone; newer
+        ones may still be in flight elsewhere.
+        """
+        claimed = await self._stream.claim_pending(
+            partition, self.worker_id, min_idle_ms=self._lease_ttl_ms
+        )
+        if claimed:
+            self.metrics.incr("claimed", len(claimed))
+            logger.info("inbound_pending_claimed", partition=partition, count=len(claimed))
+            await self._process(partition, claimed)
+
+    async def _process(self, partition: int, entries: list[StreamEntry]) -> None:
+        """Handle entries strictly in order, then ack them together."""
+        if not entries:
+            return
+        for entry in entries:
+            await self._handle_entry(partition, entry)
+        await self._stream.ack(partition, [entry_id for entry_id, _ in entries])
+
+    async def _handle_entry(self, partition: int, entry: StreamEntry) -> None:
+        """Run the handler, retrying; dead-letter the entry once out of retries.
+
+        Failures count against max_attempts. A busy conversation (a
+        synchronous /ai/message run holds it) is retried separately, up
+        to max_busy_retries, so one stuck conversation cannot stall the
+        partition forever.
+        """
+        entry_id, message = entry
+        attempt = 0
+        busy_retries = 0
+        while True:
+            try:
+                await self._handler(message)
+                break
+            except ConversationBusyError as e:
+                busy_retries += 1
+                if busy_retries > self._max_busy_retries:
+                    await self._dead_letter(partition, entry, e)
+                    return
+                delay = RETRY_DELAY_SECONDS
+            except Exception as e:
+                attempt += 1
+                if attempt >= self._max_attempts:
+                    await self._dead_letter(partition, entry, e)
+                    return
+                logger.warning(
+                    "inbound_message_retry",
+                    partition=partition,
+                    entry_id=entry_id,
+                    attempt=attempt,
+                    error=str(e),
+                )
+                delay = RETRY_DELAY_SECONDS * attempt
+            self.metrics.incr("retries")
+            await asyncio.sleep(delay)
+
+        self.metrics.incr("processed")
+        self.metrics.latency.observe(max(0.0, time.time() - message.received_at) * 1000)
+
+    async def _dead_letter(self, partition: int, entry: StreamEntry, error: Exception) -> None:
+        entry_id, message = entry
+        logger.error(
+            "inbound_message_dead_lettered",
+            partition=partition,
+            entry_id=entry_id,
+            conversation_id=message.conversation_id,
+            error=str(error),
+        )
+        await self._stream.dead_letter(partition, entry, str(error))
+        self.metrics.incr("dead_lettered")
+
+
+def _owner_key(partition: int) -> str:
+    return f"{OWNER_PREFIX}{partition}"
+
+
+def _worker_id() -> str:
+    """Identify this worker process as a stream consumer."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def reply_via_outbox(message: InboundMessage) -> None:
+    """Run the message's turn and queue the reply for delivery.
+
+    A message redelivered (or retried) after its turn was committed does
+    not run the graph again: only the outbox step is repeated, and the
+    reply's idempotency key keeps the contact from getting it twice.
+    """
+    from app.infrastructure.db.session import async_session_factory
+
+    turn = await process_message(
+        get_conversation_store(),
+        tenant_id=message.tenant_id,
+        text=message.text,
+        conversation_id=message.conversation_id,
+        message_id=message.message_id,
+    )
+    state = turn.state
+    if turn.replayed and (
+        state.message_ids[-1] != message.message_id or state.user_input != message.text
+    ):
+        # A later message already ran, so this reply was queued before it
+        return
+
+    async with async_session_factory() as session:
+        use_case = QueueMessageUseCase(
+            outbox_repository=OutboxRepository(session),
+            contact_repository=ContactRepository(session),
+            tenant_repository=TenantRepository(session),
+        )
+        try:
+            await use_case.execute(
+                QueueMessageInput(
+                    tenant_id=message.tenant_id,
+                    contact_id=message.contact_id,
+                    message_type=MessageType.NOTIFICATION.value,
+                    payload={
+                        "text": state.response or "Não consegui processar sua mensagem.",
+                        "conversation_id": state.conversation_id,
+                        "requires_confirmation": turn.requires_confirmation,
+                        "intent": state.intent.value if state.intent else None,
+                    },
+                    idempotency_key=f"ai-reply:{message.message_id}",
+                )
+            )
+        except DuplicateMessageError:
+            return
+        await session.commit()
+
+
+async def run_worker(settings: Settings | None = None) -> None:
+    """Run a graph worker until SIGINT/SIGTERM."""
+    settings = settings or get_settings()
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    init_redis(settings)
+    store = get_conversation_store()
+    store.start_invalidation_listener()
+    init_gemini_client(settings)
+    if settings.gemini_api_key:
+        configure_llm_provider(create_llm_provider(settings))
+    get_graph()
+    worker = InboundWorker(
+        stream=get_message_stream(),
+        handler=reply_via_outbox,
+        worker_id=_worker_id(),
+        lease_ttl_ms=settings.ai_stream_lease_ttl_ms,
+        batch_size=settings.ai_stream_batch_size,
+        block_ms=settings.ai_stream_block_ms,
+        max_attempts=settings.ai_stream_max_attempts,
+        max_busy_retries=settings.ai_stream_max_busy_retries,
+    )
+    logger.info("inbound_worker_started", worker_id=worker.worker_id)
+    try:
+        await worker.run(stop)
+    finally:
+        await close_gemini_client()
+        await store.stop_invalidation_listener()
+        await close_redis()
+        await dispose_engine()
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Redis Streams ingestion for inbound AI messages.
+
+Inbound messages are appended to one of N partition streams
+(ai:inbound:<p>, p = crc32(conversation_id) mod N) and acknowledged to
+the caller right away. Graph workers (see inbound_worker) consume the
+partitions through one consumer group. Each partition is processed by
+one worker at a time, in stream order, so a conversation's messages run
+in the order they arrived.
+
+Delivery is at least once: an entry is XACKed only after its turn has
+been committed and its reply queued in the outbox, and a worker taking
+over a partition first re-claims entries its previous owner never acked.
+"""
+
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import Any
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.infrastructure.redis.client import get_redis
+
+logger = get_logger("redis.message_stream")
+
+STREAM_PREFIX = "ai:inbound:"
+DEAD_LETTER_STREAM = "ai:inbound:dead"
+
+
+@dataclass(frozen=True)
+class InboundMessage:
+    """One user message waiting for a graph worker."""
+
+    conversation_id: str
+    tenant_id: str
+    contact_id: str
+    text: str
+    message_id: str = field(default_factory=lambda: uuid4().hex)
+    received_at: float = field(default_factory=time.time)
+
+    def to_fields(self) -> dict[str, str]:
+        return {name: str(value) for name, value in asdict(self).items()}
+
+    @classmethod
+    def from_fields(cls, fields: dict[bytes, bytes]) -> "InboundMessage":
+        values = {key.decode(): value.decode() for key, value in fields.items()}
+        return cls(
+            conversation_id=values["conversation_id"],
+            tenant_id=values["tenant_id"],
+            contact_id=values["contact_id"],
+            text=values["text"],
+            message_id=values["message_id"],
+            received_at=float(values["received_at"]),
+        )
+
+
+# (stream entry id, message)
+StreamEntry = tuple[str, InboundMessage]
+
+
+class MessageStream:
+    """Partitioned inbound stream with one consumer group."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis | None = None,
+        partitions: int = 16,
+        group: str = "ai-graph-workers",
+        maxlen: int = 100000,
+    ) -> None:
+        self._redis = redis_client
+        self.partitions = partitions
+        self.group = group
+        self._maxlen = maxlen
+
+    def _client(self) -> redis.Redis:
+        return self._redis or get_redis()
+
+    def partition_for(self, conversation_id: str) -> int:
+        """Stable partition of a conversation (same on every replica)."""
+        return zlib.crc32(conversation_id.encode()) % self.partitions
+
+    def stream_key(self, partition: int) -> str:
+        return f"{STREAM_PREFIX}{partition}"
+
+    async def append(self, message: InboundMessage) -> str:
+        """Append a message to its conversation's partition.
+
+        Returns:
+            Stream entry id
+        """
+        partition = self.partition_for(message.conversation_id)
+        entry_id = await self._client().xadd(
+            self.stream_key(partition),
+            message.to_fields(),  # type: ignore[arg-type]
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+        return _text(entry_id)
+
+    async def ensure_group(self, partition: int) -> None:
+        """Create the consumer group (and stream) if missing."""
+        try:
+            await self._client().xgroup_create(
+                self.stream_key(partition), self.group, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(
+        self, partition: int, consumer: str, count: int, block_ms: int
+    ) -> list[StreamEntry]:
+        """Entries never delivered to the group, oldest first."""
+        response = await self._client().xreadgroup(
+            self.group,
+            consumer,
+            {self.stream_key(partition): ">"},
+            count=count,
+            block=block_ms,
+        )
+        entries: list[StreamEntry] = []
+        for _, stream_entries in response or []:
+            entries.extend(_decode_entries(stream_entries))
+        return entries
+
+    async def claim_pending(
+        self, partition: int, consumer: str, min_idle_ms: int, count: int = 100
+    ) -> list[StreamEntry]:
+        """Take over entries delivered to other consumers but never acked."""
+        claimed: list[StreamEntry] = []
+        start = "0-0"
+        while True:
+            response = await self._client().xautoclaim(
+                self.stream_key(partition),
+                self.group,
+                consumer,
+                min_idle_time=min_idle_ms,
+                start_id=start,
+                count=count,
+            )
+            next_start, entries = _text(response[0]), response[1]
+            claimed.extend(_decode_entries(entries))
+            if next_start == "0-0":
+                break
+            start = next_start
+        # Claims come back in id order per page; keep stream order overall
+        claimed.sort(key=lambda entry: _entry_order(entry[0]))
+        return claimed
+
+    async def ack(self, partition: int, entry_ids: list[str]) -> None:
+        if entry_ids:
+            await self._client().xack(self.stream_key(partition), self.group, *entry_ids)
+
+    async def dead_letter(self, partition: int, entry: StreamEntry, error: str) -> None:
+        """Park a message whose turn keeps failing, for manual replay."""
+        entry_id, message = entry
+        await self._client().xadd(
+            DEAD_LETTER_STREAM,
+            {
+                **message.to_fields(),
+                "partition": str(partition),
+                "entry_id": entry_id,
+                "error": error[:500],
+            },
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+
+    async def lag(self) -> dict[str, Any]:
+        """Backlog per partition, read from Redis (same on every replica).
+
+        lag: entries not yet delivered to any worker
+        pending: delivered but not yet acked (in flight or orphaned)
+        oldest_unacked_age_ms: age of the oldest pending entry
+        """
+        r = self._client()
+        async with r.pipeline(transaction=False) as pipe:
+            for partition in range(self.partitions):
+                pipe.xinfo_groups(self.stream_key(partition))
+                pipe.xpending_range(
+                    self.stream_key(partition), self.group, min="-", max="+", count=1
+                )
+            results = await pipe.execute(raise_on_error=False)
+
+        now_ms = time.time() * 1000
+        partitions: dict[str, dict[str, Any]] = {}
+        totals = {"lag": 0, "pending": 0}
+        for partition in range(self.partitions):
+            groups, oldest = results[2 * partition], results[2 * partition + 1]
+            info = _group_info(groups, self.group)
+            if info is None:
+                continue
+            lag = info.get("lag") or 0
+            pending = info.get("pending") or 0
+            age_ms = 0.0
+            if not isinstance(oldest, Exception) and oldest:
+                age_ms = max(0.0, now_ms - _entry_order(_text(oldest[0]["message_id"]))[0])
+            partitions[str(partition)] = {
+                "lag": lag,
+                "pending": pending,
+                "oldest_unacked_age_ms": round(age_ms, 1),
+            }
+            totals["lag"] += lag
+            totals["pending"] += pending
+
+        return {"partitions": partitions, **totals}
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _entry_order(entry_id: str) -> tuple[int, int]:
+    millis, _, seq = entry_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def _decode_entries(entries: list[Any]) -> list[StreamEntry]:
+    decoded: list[StreamEntry] = []
+    for entry_id, fields in entries:
+        if fields is None:  # trimmed away while pending
+            continue
+        decoded.append((_text(entry_id), InboundMessage.from_fields(fields)))
+    return decoded
+
+
+def _group_info(groups: Any, group: str) -> dict[str, Any] | None:
+    if isinstance(groups, Exception):  # stream not created yet
+        return None
+    for info in groups:
+        if _text(info.get("name", b"")) == group:
+            return info
+    return None
+
+
+# Singleton instance
+_stream: MessageStream | None = None
+
+
+def get_message_stream() -> MessageStream:
+    """Get singleton inbound message stream."""
+    global _stream
+    if _stream is None:
+        settings = get_settings()
+        _stream = MessageStream(
+            partitions=settings.ai_stream_partitions,
+            group=settings.ai_stream_group,
+            maxlen=settings.ai_stream_maxlen,
+        )
+    return _stream
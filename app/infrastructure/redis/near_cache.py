@@ -0,0 +1,170 @@
+"""In-process near cache for conversation state.
+
+Keeps recently written/read AIGraphState objects (immutable, so safe to
+share) in a bounded LRU, so a worker that handled a conversation's
+previous message skips the Redis read.
+
+Coherence across replicas: every write publishes "<node>:<conversation>"
+on a pub/sub channel, and each process's listener evicts conversations
+written by other nodes. The cache is only used while the listener is
+subscribed; on disconnect it is cleared and bypassed until resubscribed,
+since invalidations may have been missed.
+
+Invalidations arrive asynchronously, so right after taking a
+conversation's lock an entry may predate another replica's commit.
+Entries therefore remember the fencing token they were written (or
+read) under, and a lookup under a lease is a hit only if that lease
+directly follows it (token == cached token + 1): no other run can have
+held the lock in between.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.ai.state import AIGraphState
+from app.config.logging import get_logger
+
+logger = get_logger("redis.near_cache")
+
+INVALIDATION_CHANNEL = "ai:state:invalidate"
+
+
+class NearCache:
+    """Bounded LRU of conversation_id → state with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 1800) -> None:
+        self.node_id = uuid.uuid4().hex[:12]
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        # conversation_id → (expires at, state, fencing token or None)
+        self._entries: OrderedDict[str, tuple[float, AIGraphState, int | None]] = OrderedDict()
+        self._enabled = False
+        # Bumped on every invalidation; fills started before a bump are dropped
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ("hits", "misses", "fence_misses", "invalidations", "evictions", "resets"), 0
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def enable(self) -> None:
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Stop serving and drop everything (invalidations may be missed)."""
+        self._enabled = False
+        self._entries.clear()
+        self._epoch += 1
+        self._incr("resets")
+
+    def get(self, conversation_id: str, token: int | None = None) -> AIGraphState | None:
+        """Cached state; with a lease `token`, only if the lease directly follows it."""
+        if not self._enabled:
+            return None
+        entry = self._entries.get(conversation_id)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[conversation_id]
+            self._incr("misses")
+            return None
+        if token is not None and (entry[2] is None or entry[2] + 1 != token):
+            # Another run may have held the lock since: read from Redis
+            self._incr("misses")
+            self._incr("fence_misses")
+            return None
+        self._entries.move_to_end(conversation_id)
+        self._incr("hits")
+        return entry[1]
+
+    def put(
+        self,
+        conversation_id: str,
+        state: AIGraphState,
+        epoch: int | None = None,
+        token: int | None = None,
+    ) -> None:
+        """Cache state; with `epoch`, only if nothing was invalidated since.
+
+        token is the fencing token of the lease the state was committed or
+        read under (None: no fenced lease).
+        """
+        if not self._enabled or (epoch is not None and epoch != self._epoch):
+            return
+        self._entries[conversation_id] = (time.monotonic() + self._ttl, state, token)
+        self._entries.move_to_end(conversation_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._incr("evictions")
+
+    def invalidate(self, conversation_id: str) -> None:
+        self._epoch += 1
+        if self._entries.pop(conversation_id, None) is not None:
+            self._incr("invalidations")
+
+    def message_for(self, conversation_id: str) -> str:
+        """Invalidation message announcing a write by this node."""
+        return f"{self.node_id}:{conversation_id}"
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            "enabled": self._enabled,
+            "entries": len(self._entries),
+            **counts,
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+
+async def listen_for_invalidations(
+    cache: NearCache,
+    redis_client: redis.Redis,
+    channel: str = INVALIDATION_CHANNEL,
+    reconnect_delay_seconds: float = 1.0,
+) -> None:
+    """Evict conversations written by other nodes; runs until cancelled."""
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            cache.enable()
+            logger.info("near_cache_listening", channel=channel, node=cache.node_id)
+
+            async for message in pubsub.listen():
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+                if not isinstance(data, str):
+                    continue
+                node_id, _, conversation_id = data.partition(":")
+                if node_id != cache.node_id:
+                    cache.invalidate(conversation_id)
+        except asyncio.CancelledError:
+            raise
+        except (redis.RedisError, OSError) as e:
+            logger.warning("near_cache_listener_error", error=str(e))
+        finally:
+            cache.disable()
+            with contextlib.suppress(redis.RedisError, OSError):
+                await pubsub.aclose()
+
+        await asyncio.sleep(reconnect_delay_seconds)
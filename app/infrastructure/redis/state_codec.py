@@ -0,0 +1,295 @@
+"""Binary codec for conversation state.
+
+Two layouts:
+- Hash fields (what the store writes): one field per persisted state
+  field, each value a format byte followed by the msgpack/JSON value,
+  plus a schema version field. Lets the store write only changed fields.
+- Blob: one schema version byte, one flags byte, then the state as a
+  positional array (field order fixed by the schema version, enums as
+  their values), encoded with msgpack or JSON and zlib-compressed above
+  a size threshold.
+
+Blobs and legacy JSON blobs (a JSON object with every key spelled out)
+are still decoded, so existing conversations survive a deploy; the
+store rewrites them as hashes on their next save.
+"""
+
+import json
+import zlib
+from datetime import UTC, datetime
+from typing import Any
+
+from app.ai.state import (
+    AIGraphState,
+    ConfirmationStatus,
+    ExtractedEntities,
+    Intent,
+    ValidationResult,
+)
+from app.config.logging import get_logger
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = get_logger("redis.state_codec")
+
+SCHEMA_VERSION = 1
+
+# Flags byte: low nibble = payload format, bit 4 = zlib-compressed
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_COMPRESSED = 0x10
+
+_FORMATS = {"json": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+
+# Hash field holding the schema version (see encode_fields)
+VERSION_FIELD = "_v"
+
+
+class StateCodec:
+    """Encodes AIGraphState to compact versioned blobs and back.
+
+    Not persisted (per-turn only): intent_source, correlation_id, timings.
+    """
+
+    def __init__(self, payload_format: str = "msgpack", compress_min_bytes: int = 1024) -> None:
+        if payload_format not in _FORMATS:
+            raise ValueError(f"Unknown state codec format: {payload_format}")
+        if payload_format == "msgpack" and msgpack is None:
+            logger.warning("state_codec_msgpack_unavailable")
+            payload_format = "json"
+        self.payload_format = payload_format
+        self._format = _FORMATS[payload_format]
+        self._compress_min_bytes = compress_min_bytes
+
+    def encode(self, state: AIGraphState) -> bytes:
+        """Encode state as header + (optionally compressed) payload."""
+        payload = _dumps(self._format, _pack(state))
+        flags = self._format
+        if self._compress_min_bytes and len(payload) >= self._compress_min_bytes:
+            payload = zlib.compress(payload, 1)
+            flags |= FLAG_COMPRESSED
+        return bytes((SCHEMA_VERSION, flags)) + payload
+
+    def decode(self, blob: bytes | str) -> AIGraphState:
+        """Decode a blob written by encode() or a legacy JSON blob.
+
+        Raises:
+            ValueError: Unknown schema version or payload format
+        """
+        if isinstance(blob, str):
+            blob = blob.encode()
+        if blob[:1] == b"{":
+            return state_from_dict(json.loads(blob))
+
+        version, flags = blob[0], blob[1]
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported state schema version: {version}")
+
+        payload = blob[2:]
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return _unpack(_loads(flags & 0x0F, payload))
+
+    def encode_fields(
+        self, state: AIGraphState, names: list[str] | None = None
+    ) -> dict[str, bytes]:
+        """Encode fields for a Redis hash: one format byte + value each.
+
+        names=None encodes every persisted field plus the schema version
+        marker; a hash without the marker holds only deltas (e.g. written
+        after the key expired) and is not a usable state.
+        """
+        prefix = bytes((self._format,))
+        mapping = {
+            name: prefix + _dumps(self._format, _to_primitive(name, getattr(state, name)))
+            for name in (PERSISTED_FIELDS if names is None else names)
+        }
+        if names is None:
+            mapping[VERSION_FIELD] = str(SCHEMA_VERSION).encode()
+        return mapping
+
+    def decode_fields(self, mapping: dict[bytes, bytes]) -> AIGraphState | None:
+        """Decode a Redis hash written by encode_fields().
+
+        Returns None for an empty or partial hash (no version marker).
+
+        Raises:
+            ValueError: Unknown schema version or payload format
+        """
+        version = mapping.get(VERSION_FIELD.encode())
+        if version is None:
+            return None
+        if int(version) != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported state schema version: {int(version)}")
+
+        values: dict[str, Any] = {}
+        for raw_name, raw_value in mapping.items():
+            name = raw_name.decode()
+            if name in _PERSISTED_NAMES:
+                values[name] = _from_primitive(name, _loads(raw_value[0], raw_value[1:]))
+        return AIGraphState(**values)
+
+
+def _dumps(payload_format: int, value: Any) -> bytes:
+    if payload_format == FORMAT_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads(payload_format: int, payload: bytes) -> Any:
+    if payload_format == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("State blob is msgpack but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    if payload_format == FORMAT_JSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    raise ValueError(f"Unknown state payload format: {payload_format}")
+
+
+# Schema v1: persisted fields in positional order (append only; bump
+# SCHEMA_VERSION to reorder or remove fields)
+PERSISTED_FIELDS: tuple[str, ...] = (
+    "conversation_id",
+    "tenant_id",
+    "user_id",
+    "user_input",
+    "input_type",
+    "normalized_input",
+    "intent",
+    "intent_confidence",
+    "entities",
+    "validation_result",
+    "validation_errors",
+    "confirmation_status",
+    "confirmation_message",
+    "tool_name",
+    "tool_result",
+    "tool_error",
+    "response",
+    "created_at",
+    "step_count",
+    "last_completed_node",
+    "message_ids",
+)
+
+
+def _entities_to_list(entities: ExtractedEntities) -> list[Any]:
+    return [
+        entities.contact_name,
+        entities.contact_phone,
+        entities.amount_cents,
+        entities.due_date,
+        entities.boleto_id,
+        entities.message_content,
+        entities.raw or None,
+    ]
+
+
+def _entities_from_list(values: list[Any]) -> ExtractedEntities:
+    contact_name, contact_phone, amount_cents, due_date, boleto_id, message_content, raw = values
+    return ExtractedEntities(
+        contact_name=contact_name,
+        contact_phone=contact_phone,
+        amount_cents=amount_cents,
+        due_date=due_date,
+        boleto_id=boleto_id,
+        message_content=message_content,
+        raw=raw or {},
+    )
+
+
+def _intent(value: str | None) -> Intent | None:
+    if not value:
+        return None
+    try:
+        return Intent(value)
+    except ValueError:
+        return Intent.UNKNOWN
+
+
+# Fields that are not stored as-is: (to primitive, from primitive)
+_CONVERTERS: dict[str, tuple[Any, Any]] = {
+    "intent": (lambda v: v.value if v else None, _intent),
+    "entities": (_entities_to_list, _entities_from_list),
+    "validation_result": (lambda v: v.value, ValidationResult),
+    "confirmation_status": (lambda v: v.value, ConfirmationStatus),
+    "message_ids": (list, tuple),
+    "created_at": (
+        lambda v: v.timestamp(),
+        lambda v: datetime.fromtimestamp(v, UTC),
+    ),
+}
+
+
+def _to_primitive(name: str, value: Any) -> Any:
+    converter = _CONVERTERS.get(name)
+    return converter[0](value) if converter else value
+
+
+def _from_primitive(name: str, value: Any) -> Any:
+    converter = _CONVERTERS.get(name)
+    return converter[1](value) if converter else value
+
+
+_PERSISTED_NAMES = frozenset(PERSISTED_FIELDS)
+
+
+def _pack(state: AIGraphState) -> list[Any]:
+    return [_to_primitive(name, getattr(state, name)) for name in PERSISTED_FIELDS]
+
+
+def _unpack(values: list[Any]) -> AIGraphState:
+    return AIGraphState(
+        **{
+            name: _from_primitive(name, value)
+            # Payloads written before a field was appended lack it (default)
+            for name, value in zip(PERSISTED_FIELDS, values, strict=False)
+        }
+    )
+
+
+def state_from_dict(data: dict[str, Any]) -> AIGraphState:
+    """Decode a legacy JSON state blob (every key spelled out)."""
+    entities_data = data.get("entities", {})
+    entities = ExtractedEntities(
+        contact_name=entities_data.get("contact_name"),
+        contact_phone=entities_data.get("contact_phone"),
+        amount_cents=entities_data.get("amount_cents"),
+        due_date=entities_data.get("due_date"),
+        boleto_id=entities_data.get("boleto_id"),
+        message_content=entities_data.get("message_content"),
+        raw=entities_data.get("raw", {}),
+    )
+
+    return AIGraphState(
+        conversation_id=data["conversation_id"],
+        tenant_id=data.get("tenant_id"),
+        user_id=data.get("user_id"),
+        user_input=data.get("user_input", ""),
+        input_type=data.get("input_type", "text"),
+        normalized_input=data.get("normalized_input"),
+        intent=_intent(data.get("intent")),
+        intent_confidence=data.get("intent_confidence", 0.0),
+        entities=entities,
+        validation_result=ValidationResult(data.get("validation_result", "fail")),
+        validation_errors=data.get("validation_errors", []),
+        confirmation_status=ConfirmationStatus(data.get("confirmation_status", "not_required")),
+        confirmation_message=data.get("confirmation_message"),
+        tool_name=data.get("tool_name"),
+        tool_result=data.get("tool_result"),
+        tool_error=data.get("tool_error"),
+        response=data.get("response"),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        step_count=data.get("step_count", 0),
+        last_completed_node=data.get("last_completed_node"),
+    )
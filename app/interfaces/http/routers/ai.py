@@ -8,17 +8,40 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.ai.graph import create_graph
-from app.ai.state import AIGraphState, ConfirmationStatus
+from app.ai.conversation import (
+    BatchMessage,
+    MessageTurn,
+    process_message,
+    process_messages,
+    resume_graph,
+)
+from app.ai.graph import NotResumableError
+from app.ai.state import ConfirmationStatus
+from app.ai.timing import timed
 from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.infrastructure.redis.conversation_lock import (
+    ConversationBusyError,
+    StaleConversationWriteError,
+)
 from app.infrastructure.redis.conversation_state import (
     ConversationStateStore,
     get_conversation_store,
 )
+from app.infrastructure.redis.message_stream import (
+    InboundMessage,
+    MessageStream,
+    get_message_stream,
+)
 from app.interfaces.http.schemas.ai import (
+    AIBatchItemResult,
+    AIBatchMessageRequest,
+    AIBatchMessageResponse,
     AIConfirmRequest,
     AIConfirmResponse,
     AIErrorResponse,
+    AIMessageAcceptedResponse,
+    AIMessageEnqueueRequest,
     AIMessageRequest,
     AIMessageResponse,
 )
@@ -32,11 +55,54 @@ def get_state_store() -> ConversationStateStore:
     return get_conversation_store()
 
 
+def get_inbound_stream() -> MessageStream:
+    """Dependency for the inbound message stream."""
+    return get_message_stream()
+
+
+def _conflict(
+    error: ConversationBusyError | StaleConversationWriteError, correlation_id: str
+) -> HTTPException:
+    """409 for a message that lost the race for its conversation."""
+    code = (
+        "conversation_busy"
+        if isinstance(error, ConversationBusyError)
+        else "conversation_superseded"
+    )
+    logger.warning(
+        "ai_conversation_conflict",
+        correlation_id=correlation_id,
+        conversation_id=error.conversation_id,
+        code=code,
+    )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "error": "Ainda processando a mensagem anterior. Tente novamente.",
+            "code": code,
+            "conversation_id": error.conversation_id,
+        },
+    )
+
+
+def _message_response(turn: MessageTurn) -> AIMessageResponse:
+    final_state = turn.state
+    return AIMessageResponse(
+        conversation_id=final_state.conversation_id,
+        response=final_state.response or "Não consegui processar sua mensagem.",
+        requires_confirmation=turn.requires_confirmation,
+        suggested_action=(final_state.intent.value if final_state.intent else None),
+        intent=final_state.intent.value if final_state.intent else None,
+        timings=final_state.timings if get_settings().debug else None,
+    )
+
+
 @router.post(
     "/message",
     response_model=AIMessageResponse,
     responses={
         400: {"model": AIErrorResponse, "description": "Invalid request"},
+        409: {"model": AIErrorResponse, "description": "Conversation busy"},
         500: {"model": AIErrorResponse, "description": "Internal error"},
     },
 )
@@ -47,6 +113,7 @@ async def handle_message(
     """Process a user message through the AI graph.
 
     - Creates new conversation or continues existing one
+    - Waits for any in-flight message of the same conversation
     - Runs full AI graph flow
     - Saves state to Redis
     - Returns response with confirmation status
@@ -62,72 +129,28 @@ async def handle_message(
     )
 
     try:
-        # Load existing state or create new
-        if request.conversation_id:
-            state = await store.load_state(request.conversation_id)
-            if state is None:
-                # Expired or not found - create new
-                state = AIGraphState(
-                    conversation_id=request.conversation_id,
-                    tenant_id=request.tenant_id,
-                    user_input=request.text,
-                )
-            else:
-                # Update with new input
-                state = state.with_updates(
-                    user_input=request.text,
-                    response=None,
-                    tool_result=None,
-                    tool_error=None,
-                )
-        else:
-            conversation_id = str(uuid4())
-            state = AIGraphState(
-                conversation_id=conversation_id,
-                tenant_id=request.tenant_id,
-                user_input=request.text,
-            )
-
-        # Run AI graph
-        graph = create_graph()
-        final_state = await graph.run(state)
-
-        # Check if confirmation is pending
-        requires_confirmation = (
-            final_state.confirmation_status == ConfirmationStatus.PENDING
+        # Runs of one conversation are serialized; later messages wait
+        turn = await process_message(
+            store,
+            tenant_id=request.tenant_id,
+            text=request.text,
+            conversation_id=request.conversation_id,
         )
-
-        # Save pending confirmation data if needed
-        if requires_confirmation:
-            await store.save_pending_confirmation(
-                final_state.conversation_id,
-                {
-                    "intent": final_state.intent.value if final_state.intent else None,
-                    "entities": final_state.entities.to_dict(),
-                    "tenant_id": request.tenant_id,
-                },
-            )
-
-        # Save state
-        await store.save_state(final_state.conversation_id, final_state)
+        final_state = turn.state
 
         logger.info(
             "ai_message_complete",
             correlation_id=correlation_id,
             conversation_id=final_state.conversation_id,
             intent=final_state.intent.value if final_state.intent else None,
-            requires_confirmation=requires_confirmation,
+            requires_confirmation=turn.requires_confirmation,
+            timings=final_state.timings,
         )
 
-        return AIMessageResponse(
-            conversation_id=final_state.conversation_id,
-            response=final_state.response or "Não consegui processar sua mensagem.",
-            requires_confirmation=requires_confirmation,
-            suggested_action=(
-                final_state.intent.value if final_state.intent else None
-            ),
-            intent=final_state.intent.value if final_state.intent else None,
-        )
+        return _message_response(turn)
+
+    except (ConversationBusyError, StaleConversationWriteError) as e:
+        raise _conflict(e, correlation_id) from e
 
     except Exception as e:
         logger.error(
@@ -138,8 +161,169 @@ async def handle_message(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": str(e), "code": "internal_error"},
+        ) from e
+
+
+@router.post(
+    "/messages:batch",
+    response_model=AIBatchMessageResponse,
+    responses={
+        400: {"model": AIErrorResponse, "description": "Invalid request"},
+        500: {"model": AIErrorResponse, "description": "Internal error"},
+    },
+)
+async def handle_messages_batch(
+    request: AIBatchMessageRequest,
+    store: ConversationStateStore = Depends(get_state_store),
+) -> AIBatchMessageResponse:
+    """Process several user messages through the AI graph.
+
+    - Holds all named conversations and loads their states in one round trip
+    - Runs graphs concurrently (bounded); one conversation's messages in order
+    - Saves all states in one round trip
+    - Returns one result per message; a failed message or busy conversation
+      does not fail the batch
+    """
+    correlation_id = str(uuid4())[:8]
+    settings = get_settings()
+
+    if len(request.messages) > settings.ai_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": f"No máximo {settings.ai_batch_max_items} mensagens por lote.",
+                "code": "batch_too_large",
+            },
+        )
+
+    logger.info(
+        "ai_batch_start",
+        correlation_id=correlation_id,
+        messages=len(request.messages),
+    )
+
+    try:
+        outcomes = await process_messages(
+            store,
+            [
+                BatchMessage(
+                    tenant_id=message.tenant_id,
+                    text=message.text,
+                    conversation_id=message.conversation_id,
+                )
+                for message in request.messages
+            ],
+            concurrency=settings.ai_batch_concurrency,
         )
 
+    except Exception as e:
+        logger.error(
+            "ai_batch_error",
+            correlation_id=correlation_id,
+            error=str(e),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": str(e), "code": "internal_error"},
+        ) from e
+
+    results = []
+    for index, (message, outcome) in enumerate(zip(request.messages, outcomes, strict=True)):
+        if isinstance(outcome, MessageTurn):
+            results.append(
+                AIBatchItemResult(index=index, ok=True, result=_message_response(outcome))
+            )
+            continue
+        if isinstance(outcome, ConversationBusyError):
+            code = "conversation_busy"
+        elif isinstance(outcome, StaleConversationWriteError):
+            code = "conversation_superseded"
+        else:
+            code = "internal_error"
+        logger.error(
+            "ai_batch_item_error",
+            correlation_id=correlation_id,
+            index=index,
+            conversation_id=message.conversation_id,
+            code=code,
+            error=str(outcome),
+        )
+        results.append(
+            AIBatchItemResult(
+                index=index,
+                ok=False,
+                error=AIErrorResponse(
+                    error=str(outcome),
+                    code=code,
+                    conversation_id=message.conversation_id,
+                ),
+            )
+        )
+
+    logger.info(
+        "ai_batch_complete",
+        correlation_id=correlation_id,
+        messages=len(results),
+        failed=sum(not item.ok for item in results),
+    )
+
+    return AIBatchMessageResponse(results=results)
+
+
+@router.post(
+    "/message/async",
+    response_model=AIMessageAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"model": AIErrorResponse, "description": "Invalid request"},
+        500: {"model": AIErrorResponse, "description": "Internal error"},
+    },
+)
+async def enqueue_message(
+    request: AIMessageEnqueueRequest,
+    stream: MessageStream = Depends(get_inbound_stream),
+) -> AIMessageAcceptedResponse:
+    """Accept a user message for asynchronous processing.
+
+    - Appends it to the inbound stream partition of its conversation
+    - Returns immediately; graph workers run it in arrival order
+    - The reply is delivered to the contact via the outbox
+    """
+    message = InboundMessage(
+        conversation_id=request.conversation_id or str(uuid4()),
+        tenant_id=request.tenant_id,
+        contact_id=request.contact_id,
+        text=request.text,
+        **({"message_id": request.message_id} if request.message_id else {}),
+    )
+
+    try:
+        entry_id = await stream.append(message)
+    except Exception as e:
+        logger.error(
+            "ai_message_enqueue_error",
+            conversation_id=message.conversation_id,
+            error=str(e),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": str(e), "code": "internal_error"},
+        ) from e
+
+    logger.info(
+        "ai_message_enqueued",
+        tenant_id=request.tenant_id,
+        conversation_id=message.conversation_id,
+        stream_entry_id=entry_id,
+        text_length=len(request.text),
+    )
+
+    return AIMessageAcceptedResponse(
+        conversation_id=message.conversation_id,
+        message_id=message.message_id,
+        stream_entry_id=entry_id,
+    )
+
 
 @router.post(
     "/confirm",
@@ -147,6 +331,7 @@ async def handle_message(
     responses={
         400: {"model": AIErrorResponse, "description": "Invalid request"},
         404: {"model": AIErrorResponse, "description": "Conversation not found"},
+        409: {"model": AIErrorResponse, "description": "Conversation busy"},
         410: {"model": AIErrorResponse, "description": "Confirmation expired"},
         500: {"model": AIErrorResponse, "description": "Internal error"},
     },
@@ -158,7 +343,7 @@ async def handle_confirm(
     """Handle user confirmation for pending action.
 
     - Loads pending confirmation from Redis
-    - Executes action if confirmed
+    - Executes action if confirmed, resuming the graph at execute_tool
     - Returns result
     """
     correlation_id = str(uuid4())[:8]
@@ -172,73 +357,104 @@ async def handle_confirm(
     )
 
     try:
-        # Load pending confirmation
-        pending = await store.load_pending_confirmation(request.conversation_id)
+        async with store.conversation_lock(request.conversation_id) as lease:
+            # Load pending confirmation and state in one round trip
+            with timed("redis.load_conversation"):
+                conversation = await store.load_conversation(request.conversation_id, lease)
+
+            if conversation.pending_confirmation is None:
+                logger.warning(
+                    "ai_confirm_expired",
+                    correlation_id=correlation_id,
+                    conversation_id=request.conversation_id,
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail={
+                        "error": "Confirmação expirada. Por favor, tente novamente.",
+                        "code": "confirmation_expired",
+                        "conversation_id": request.conversation_id,
+                    },
+                )
 
-        if pending is None:
-            logger.warning(
-                "ai_confirm_expired",
-                correlation_id=correlation_id,
-                conversation_id=request.conversation_id,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_410_GONE,
-                detail={
-                    "error": "Confirmação expirada. Por favor, tente novamente.",
-                    "code": "confirmation_expired",
-                    "conversation_id": request.conversation_id,
-                },
-            )
+            state = conversation.state
+            if state is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail={
+                        "error": "Conversa não encontrada.",
+                        "code": "conversation_not_found",
+                        "conversation_id": request.conversation_id,
+                    },
+                )
 
-        # Load state
-        state = await store.load_state(request.conversation_id)
-
-        if state is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={
-                    "error": "Conversa não encontrada.",
-                    "code": "conversation_not_found",
-                    "conversation_id": request.conversation_id,
-                },
-            )
+            # Handle confirmation/rejection
+            if not request.confirmed:
+                # User rejected
+                final_state = state.with_updates(
+                    confirmation_status=ConfirmationStatus.REJECTED,
+                    response="Operação cancelada.",
+                )
+                with timed("redis.commit_conversation"):
+                    await store.commit_conversation(
+                        request.conversation_id,
+                        final_state,
+                        clear_confirmation=True,
+                        lease=lease,
+                    )
+
+                logger.info(
+                    "ai_confirm_rejected",
+                    correlation_id=correlation_id,
+                    conversation_id=request.conversation_id,
+                )
 
-        # Handle confirmation/rejection
-        if not request.confirmed:
-            # User rejected
-            await store.delete_pending_confirmation(request.conversation_id)
+                return AIConfirmResponse(
+                    conversation_id=request.conversation_id,
+                    response="Operação cancelada.",
+                    action_executed=False,
+                )
 
-            final_state = state.with_updates(
-                confirmation_status=ConfirmationStatus.REJECTED,
-                response="Operação cancelada.",
+            # User confirmed - update state and run execution
+            state = state.with_updates(
+                confirmation_status=ConfirmationStatus.CONFIRMED,
+                response=None,
             )
-            await store.save_state(request.conversation_id, final_state)
 
+            # Resume after the checkpoint (the confirmation gate): intent,
+            # entities and validation were settled when it was requested
             logger.info(
-                "ai_confirm_rejected",
+                "ai_confirm_resume",
                 correlation_id=correlation_id,
                 conversation_id=request.conversation_id,
+                checkpoint=state.last_completed_node,
             )
-
-            return AIConfirmResponse(
-                conversation_id=request.conversation_id,
-                response="Operação cancelada.",
-                action_executed=False,
-            )
-
-        # User confirmed - update state and run execution
-        state = state.with_updates(
-            confirmation_status=ConfirmationStatus.CONFIRMED,
-            response=None,
-        )
-
-        # Run graph to execute tool
-        graph = create_graph()
-        final_state = await graph.run(state)
-
-        # Cleanup confirmation
-        await store.delete_pending_confirmation(request.conversation_id)
-        await store.save_state(request.conversation_id, final_state)
+            try:
+                final_state = await resume_graph(state)
+            except NotResumableError as e:
+                logger.warning(
+                    "ai_confirm_not_resumable",
+                    correlation_id=correlation_id,
+                    conversation_id=request.conversation_id,
+                    error=str(e),
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "error": "Não foi possível retomar a operação. Por favor, tente novamente.",
+                        "code": "confirmation_not_resumable",
+                        "conversation_id": request.conversation_id,
+                    },
+                ) from e
+
+            # Save state and clean up the confirmation
+            with timed("redis.commit_conversation"):
+                await store.commit_conversation(
+                    request.conversation_id,
+                    final_state,
+                    clear_confirmation=True,
+                    lease=lease,
+                )
 
         logger.info(
             "ai_confirm_executed",
@@ -258,6 +474,9 @@ async def handle_confirm(
     except HTTPException:
         raise
 
+    except (ConversationBusyError, StaleConversationWriteError) as e:
+        raise _conflict(e, correlation_id) from e
+
     except Exception as e:
         logger.error(
             "ai_confirm_error",
@@ -267,4 +486,4 @@ async def handle_confirm(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": str(e), "code": "internal_error"},
-        )
+        ) from e
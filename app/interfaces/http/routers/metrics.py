@@ -0,0 +1,257 @@
+"""Metrics endpoints.
+
+Process-local runtime statistics for capacity planning.
+Internal use only - values are per replica.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, status
+from pydantic import BaseModel
+
+from app.ai.rules import rule_classifier
+from app.ai.timing import graph_latency
+from app.infrastructure.db.session import get_pool_stats
+from app.infrastructure.providers.gemini_llm import gemini_latency
+from app.infrastructure.providers.llm_cache import llm_cache_metrics
+from app.infrastructure.providers.llm_resilience import breaker_snapshots, hedge_metrics
+from app.infrastructure.providers.singleflight import singleflight_metrics
+from app.infrastructure.redis.client import get_redis_pool_stats
+from app.infrastructure.redis.conversation_lock import conversation_lock_metrics
+from app.infrastructure.redis.conversation_state import get_conversation_store
+from app.infrastructure.redis.message_stream import get_message_stream
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+class DbPoolStatsResponse(BaseModel):
+    """Database connection pool statistics."""
+
+    initialized: bool
+    pool_size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_time_total_ms: float
+    wait_time_max_ms: float
+
+
+@router.get(
+    "/db-pool",
+    response_model=DbPoolStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Database pool statistics",
+)
+async def db_pool_stats() -> DbPoolStatsResponse:
+    """Connection pool usage for this process.
+
+    Use checked_out/overflow and wait times to size pools per replica.
+    """
+    return DbPoolStatsResponse(**get_pool_stats())
+
+
+class RedisPoolStatsResponse(BaseModel):
+    """Redis connection pool statistics."""
+
+    initialized: bool
+    max_connections: int
+    in_use: int
+    idle: int
+    checkouts: int
+    timeouts: int
+    wait_time_total_ms: float
+    wait_time_max_ms: float
+
+
+@router.get(
+    "/redis-pool",
+    response_model=RedisPoolStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Redis pool statistics",
+)
+async def redis_pool_stats() -> RedisPoolStatsResponse:
+    """Shared Redis connection pool usage for this process.
+
+    Sustained waits or timeouts mean redis_max_connections is too low.
+    """
+    return RedisPoolStatsResponse(**get_redis_pool_stats())
+
+
+class StateNearCacheResponse(BaseModel):
+    """Conversation state near-cache counters."""
+
+    enabled: bool
+    entries: int
+    hits: int
+    misses: int
+    fence_misses: int  # entry may predate another replica's commit
+    invalidations: int
+    evictions: int
+    resets: int
+    hit_rate: float
+
+
+@router.get(
+    "/ai-state-cache",
+    response_model=StateNearCacheResponse | None,
+    status_code=status.HTTP_200_OK,
+    summary="Conversation state near-cache hit rate",
+)
+async def state_near_cache_stats() -> StateNearCacheResponse | None:
+    """In-process conversation state cache; null when not configured.
+
+    enabled is false while the invalidation listener is disconnected.
+    """
+    near_cache = get_conversation_store().near_cache
+    if near_cache is None:
+        return None
+    return StateNearCacheResponse(**near_cache.stats())
+
+
+class ConversationLockResponse(BaseModel):
+    """Per-conversation lock contention counters."""
+
+    held: int
+    waiting: int
+    acquired: int
+    contended: int
+    local_waits: int
+    remote_waits: int
+    timeouts: int
+    stale_writes: int
+    redis_errors: int
+    contention_rate: float
+    wait_ms: dict[str, Any]
+
+
+@router.get(
+    "/ai-conversation-locks",
+    response_model=ConversationLockResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Conversation lock contention",
+)
+async def conversation_lock_stats() -> ConversationLockResponse:
+    """How often messages waited for an earlier run of their conversation.
+
+    timeouts are messages answered 409; stale_writes are commits dropped
+    because the lock expired under them (raise ai_conversation_lock_ttl_ms).
+    """
+    return ConversationLockResponse(**conversation_lock_metrics.snapshot())
+
+
+class InboundStreamLagResponse(BaseModel):
+    """Inbound AI message stream backlog."""
+
+    lag: int
+    pending: int
+    partitions: dict[str, dict[str, Any]]
+
+
+@router.get(
+    "/ai-inbound",
+    response_model=InboundStreamLagResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Inbound AI message stream lag",
+)
+async def inbound_stream_lag() -> InboundStreamLagResponse:
+    """Backlog of the inbound stream, shared by all replicas.
+
+    lag is waiting for a worker; pending is being processed or was
+    orphaned by a dead worker (re-claimed when its partitions move).
+    """
+    return InboundStreamLagResponse(**await get_message_stream().lag())
+
+
+class LLMLatencyResponse(BaseModel):
+    """LLM provider latency, cache, coalescing and resilience counters."""
+
+    gemini: dict[str, dict[str, Any]]
+    cache: dict[str, dict[str, Any]]
+    singleflight: dict[str, int]
+    hedging: dict[str, int]
+    breakers: dict[str, dict[str, Any]]
+
+
+@router.get(
+    "/llm",
+    response_model=LLMLatencyResponse,
+    status_code=status.HTTP_200_OK,
+    summary="LLM call latency, cache and circuit breaker state",
+)
+async def llm_latency() -> LLMLatencyResponse:
+    """Latency histograms (ms) and cache hits/misses per LLM call type."""
+    return LLMLatencyResponse(
+        gemini=gemini_latency.snapshot(),
+        cache=llm_cache_metrics.snapshot(),
+        singleflight=singleflight_metrics.snapshot(),
+        hedging=hedge_metrics.snapshot(),
+        breakers=breaker_snapshots(),
+    )
+
+
+class RuleHitsResponse(BaseModel):
+    """Rule-based fast path hit counters."""
+
+    evaluated: int
+    hits: int
+    hit_rate: float
+    rules: dict[str, dict[str, float]]
+
+
+@router.get(
+    "/ai-rules",
+    response_model=RuleHitsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="AI rule fast path hit rates",
+)
+async def ai_rule_hits() -> RuleHitsResponse:
+    """Per-rule hit counts and rates of the deterministic classifier.
+
+    Messages that miss every rule go to the LLM.
+    """
+    return RuleHitsResponse(**rule_classifier.stats())
+
+
+class AIGraphLatencyResponse(BaseModel):
+    """AI graph latency histograms, grouped by kind."""
+
+    nodes: dict[str, dict[str, Any]]
+    llm: dict[str, dict[str, Any]]
+    redis: dict[str, dict[str, Any]]
+    intents: dict[str, dict[str, Any]]
+    outcomes: dict[str, dict[str, Any]]
+
+
+@router.get(
+    "/ai-graph",
+    response_model=AIGraphLatencyResponse,
+    status_code=status.HTTP_200_OK,
+    summary="AI graph latency per node, provider call, intent and outcome",
+)
+async def ai_graph_latency() -> AIGraphLatencyResponse:
+    """Latency histograms (ms) of graph nodes, provider calls and whole runs.
+
+    Runs are bucketed by final intent and by outcome (executed,
+    confirmation_pending, clarify, rejected, tool_error).
+    """
+    groups: dict[str, dict[str, dict[str, Any]]] = {
+        "node": {},
+        "llm": {},
+        "redis": {},
+        "intent": {},
+        "outcome": {},
+    }
+    for name, snapshot in graph_latency.snapshot().items():
+        kind, _, key = name.partition(".")
+        if kind in groups:
+            groups[kind][key] = snapshot
+
+    return AIGraphLatencyResponse(
+        nodes=groups["node"],
+        llm=groups["llm"],
+        redis=groups["redis"],
+        intents=groups["intent"],
+        outcomes=groups["outcome"],
+    )
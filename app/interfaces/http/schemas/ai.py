@@ -28,6 +28,27 @@ class AIMessageResponse(BaseModel):
         description="Suggested action (e.g., 'create_boleto')",
     )
     intent: str | None = Field(None, description="Detected intent")
+    timings: dict[str, float] | None = Field(
+        None, description="Per-node/provider timings in ms (debug mode only)"
+    )
+
+
+class AIMessageEnqueueRequest(AIMessageRequest):
+    """Request for /ai/message/async endpoint."""
+
+    contact_id: str = Field(..., description="Contact that receives the reply via outbox")
+    message_id: str | None = Field(
+        None,
+        description="Gateway message ID; makes the reply idempotent on retries",
+    )
+
+
+class AIMessageAcceptedResponse(BaseModel):
+    """Response from /ai/message/async endpoint."""
+
+    conversation_id: str = Field(..., description="Conversation identifier")
+    message_id: str = Field(..., description="Message ID (reply idempotency key)")
+    stream_entry_id: str = Field(..., description="Position in the inbound stream")
 
 
 class AIConfirmRequest(BaseModel):
@@ -56,3 +77,28 @@ class AIErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
     code: str = Field(..., description="Error code")
     conversation_id: str | None = Field(None, description="Conversation ID if available")
+
+
+class AIBatchMessageRequest(BaseModel):
+    """Request for /ai/messages:batch endpoint."""
+
+    messages: list[AIMessageRequest] = Field(
+        ...,
+        min_length=1,
+        description="Messages to process; same-conversation messages run in order",
+    )
+
+
+class AIBatchItemResult(BaseModel):
+    """Outcome of one message of a batch."""
+
+    index: int = Field(..., description="Position of the message in the request")
+    ok: bool = Field(..., description="Whether the message was processed and saved")
+    result: AIMessageResponse | None = Field(None, description="Response if ok")
+    error: AIErrorResponse | None = Field(None, description="Error if not ok")
+
+
+class AIBatchMessageResponse(BaseModel):
+    """Response from /ai/messages:batch endpoint."""
+
+    results: list[AIBatchItemResult] = Field(..., description="One result per message, in order")
@@ -1,18 +1,28 @@
 """FastAPI application entrypoint."""
 
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from app.ai.graph import get_graph
+from app.ai.nodes import configure_llm_provider
 from app.config.logging import configure_logging, get_logger
 from app.config.settings import get_settings
-from app.interfaces.http.routers import ai, boletos, contacts, health, outbox, tenants
+from app.infrastructure.db.session import dispose_engine, init_engine
+from app.infrastructure.providers.gemini_llm import (
+    close_gemini_client,
+    init_gemini_client,
+)
+from app.infrastructure.providers.llm_factory import create_llm_provider
+from app.infrastructure.redis.client import close_redis, init_redis
+from app.infrastructure.redis.conversation_state import get_conversation_store
+from app.interfaces.http.routers import ai, boletos, contacts, health, metrics, outbox, tenants
 from app.interfaces.http.webhooks import paytime as paytime_webhook
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan manager."""
     logger = get_logger("lifespan")
     settings = get_settings()
@@ -23,8 +33,22 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         environment=settings.app_env,
     )
 
+    init_engine(settings)
+    init_redis(settings)
+    conversation_store = get_conversation_store()
+    conversation_store.start_invalidation_listener()
+    init_gemini_client(settings)
+    if settings.gemini_api_key:
+        configure_llm_provider(create_llm_provider(settings))
+    get_graph()  # compile once, before the first request
+
     yield
 
+    await close_gemini_client()
+    await conversation_store.stop_invalidation_listener()
+    await close_redis()
+    await dispose_engine()
+
     logger.info("application_shutdown")
 
 
@@ -43,6 +67,7 @@ def create_app() -> FastAPI:
 
     # Register routers
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(tenants.router)
     app.include_router(contacts.router)
     app.include_router(boletos.router)
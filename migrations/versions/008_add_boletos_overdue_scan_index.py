@@ -0,0 +1,38 @@
+"""Add partial index for the overdue marking scan.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+Purpose:
+- Set-based overdue marking selects SENT boletos ordered by due_date
+- Partial index keeps the scan proportional to SENT rows only
+
+Schema:
+- ix_boletos_sent_due_date: boletos(due_date) WHERE status = 'sent'
+
+Rollback: Safe, drops index
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_boletos_sent_due_date",
+        "boletos",
+        ["due_date"],
+        postgresql_where=sa.text("status = 'sent'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_boletos_sent_due_date", table_name="boletos")
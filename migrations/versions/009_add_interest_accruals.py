@@ -0,0 +1,76 @@
+"""Add interest_accruals ledger table for Collections.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+Purpose:
+- Persist interest computed by the nightly accrual job
+- Make accrual idempotent per boleto and day
+
+Schema:
+- interest_accruals: Total interest owed per boleto as of accrual_date
+
+Invariants enforced:
+- One entry per boleto per day (uq_interest_accruals_boleto_date)
+- FK RESTRICT on tenant, boleto and policy references
+
+Rollback: Safe, drops table
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interest_accruals",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("boleto_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("policy_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("accrual_date", sa.Date(), nullable=False),
+        sa.Column("days_overdue", sa.Integer(), nullable=False),
+        sa.Column("principal_cents", sa.Integer(), nullable=False),
+        sa.Column("interest_cents", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenants.id"],
+            name="fk_interest_accruals_tenant_id",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["boleto_id"],
+            ["boletos.id"],
+            name="fk_interest_accruals_boleto_id",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["policy_id"],
+            ["interest_policies.id"],
+            name="fk_interest_accruals_policy_id",
+            ondelete="RESTRICT",
+        ),
+        sa.UniqueConstraint("boleto_id", "accrual_date", name="uq_interest_accruals_boleto_date"),
+    )
+
+    op.create_index("ix_interest_accruals_tenant_id", "interest_accruals", ["tenant_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_interest_accruals_tenant_id", table_name="interest_accruals")
+    op.drop_table("interest_accruals")
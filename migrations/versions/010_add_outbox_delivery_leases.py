@@ -0,0 +1,51 @@
+"""Add delivery lease columns to message_outbox.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+Purpose:
+- Let multiple delivery workers claim disjoint outbox rows
+- Reclaim rows whose worker died before finishing (expired lease)
+
+Schema:
+- message_outbox.lease_owner: Worker id holding the row
+- message_outbox.lease_expires_at: When the claim lapses
+- ix_message_outbox_deliverable: scheduled_at WHERE status IN (pending, retrying)
+
+Rollback: Safe, drops index and columns
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "message_outbox",
+        sa.Column("lease_owner", sa.String(255), nullable=True),
+    )
+    op.add_column(
+        "message_outbox",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_index(
+        "ix_message_outbox_deliverable",
+        "message_outbox",
+        ["scheduled_at"],
+        postgresql_where=sa.text("status IN ('pending', 'retrying')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_message_outbox_deliverable", table_name="message_outbox")
+    op.drop_column("message_outbox", "lease_expires_at")
+    op.drop_column("message_outbox", "lease_owner")
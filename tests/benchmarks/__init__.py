@@ -0,0 +1 @@
+"""Micro-benchmarks (run as modules, not collected by pytest)."""
@@ -0,0 +1,121 @@
+"""Micro-benchmark: AIGraphState transitions per graph run.
+
+Replays the state updates of a create_boleto run (normalize → rules →
+validate → confirmation → ...) and compares the slotted, frozen state
+against the previous dict-rebuild implementation.
+
+    python -m tests.benchmarks.bench_ai_state
+"""
+
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import fields, make_dataclass, replace
+from typing import Any
+
+from app.ai.state import (
+    AIGraphState,
+    ConfirmationStatus,
+    ExtractedEntities,
+    Intent,
+    ValidationResult,
+)
+
+RUNS = 20_000
+
+# (node, updates) as applied by the graph for one run
+NODE_UPDATES: tuple[tuple[str, dict[str, Any]], ...] = (
+    (
+        "normalize_input",
+        {
+            "normalized_input": "cobrar r$ 150 do joão dia 10",
+            "intent_source": None,
+            "confirmation_status": ConfirmationStatus.NOT_REQUIRED,
+            "confirmation_message": None,
+        },
+    ),
+    (
+        "classify_by_rules",
+        {
+            "intent": Intent.CREATE_BOLETO,
+            "intent_confidence": 1.0,
+            "intent_source": "rules",
+            "entities": ExtractedEntities(
+                contact_name="João", amount_cents=15000, due_date="2026-11-10"
+            ),
+        },
+    ),
+    ("validate_request", {"validation_result": ValidationResult.PASS, "validation_errors": []}),
+    (
+        "check_confirmation",
+        {
+            "confirmation_status": ConfirmationStatus.PENDING,
+            "confirmation_message": "Confirma?",
+            "response": "Confirma?",
+        },
+    ),
+)
+
+
+def _legacy_state_class() -> type:
+    """The previous AIGraphState: mutable, __dict__-backed, full rebuild."""
+    legacy = make_dataclass(
+        "LegacyAIGraphState",
+        [(f.name, f.type, f) for f in fields(AIGraphState)],
+    )
+
+    def with_updates(self: Any, **kwargs: Any) -> Any:
+        current = {f.name: getattr(self, f.name) for f in fields(legacy)}
+        current["step_count"] = self.step_count + 1
+        current.update(kwargs)
+        return legacy(**current)
+
+    legacy.with_updates = with_updates
+    return legacy
+
+
+def run_legacy(state: Any) -> Any:
+    for node, updates in NODE_UPDATES:
+        state = state.with_updates(**updates)
+        state = replace(state, last_completed_node=node)
+    return replace(state, timings={"total": 1.0})
+
+
+def run_current(state: AIGraphState) -> AIGraphState:
+    for node, updates in NODE_UPDATES:
+        state = state.with_updates(**updates)
+        state = state.with_field("last_completed_node", node, count_step=False)
+    return state.with_field("timings", {"total": 1.0}, count_step=False)
+
+
+def measure(name: str, run: Callable[[Any], Any], initial: Any) -> None:
+    run(initial)  # warm up
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        run(initial)
+    per_run_us = (time.perf_counter() - start) / RUNS * 1e6
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    final = run(initial)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = sys.getsizeof(final)
+    if hasattr(final, "__dict__"):
+        size += sys.getsizeof(final.__dict__)
+
+    print(f"{name:8} {per_run_us:8.2f} us/run  peak {peak - before:6d} B/run  state {size:4d} B")
+
+
+def main() -> None:
+    legacy = _legacy_state_class()
+    print(f"{len(NODE_UPDATES)} node transitions, {RUNS} runs")
+    measure("legacy", run_legacy, legacy(user_input="cobrar R$ 150 do João dia 10"))
+    measure("current", run_current, AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+
+
+if __name__ == "__main__":
+    main()
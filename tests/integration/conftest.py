@@ -0,0 +1,66 @@
+"""Fixtures for integration tests that need Postgres.
+
+Point IRIS_DATABASE_URL at a disposable database (e.g. the compose
+postgres service); tests using `db_session` are skipped when it cannot
+be reached. Each test runs in one transaction that is rolled back, so
+the schema created here and every row written disappear afterwards.
+"""
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config.settings import get_settings
+from app.infrastructure.db.models import Base, ContactModel, TenantModel
+
+ContactFactory = Callable[[], Awaitable[tuple[UUID, UUID]]]
+
+
+@pytest.fixture
+async def db_session() -> AsyncIterator[AsyncSession]:
+    """Session bound to a rolled-back transaction on a real database."""
+    engine = create_async_engine(get_settings().database_url, poolclass=NullPool)
+    try:
+        connection = await engine.connect()
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Postgres not available: {e}")
+
+    transaction = await connection.begin()
+    try:
+        await connection.run_sync(Base.metadata.create_all)
+        # Repository commits become savepoints inside the outer transaction
+        async with AsyncSession(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+def make_contact(db_session: AsyncSession) -> ContactFactory:
+    """Insert a tenant with one contact; returns (tenant_id, contact_id)."""
+
+    async def make() -> tuple[UUID, UUID]:
+        tenant = TenantModel(id=uuid4(), name="Tenant")
+        contact = ContactModel(
+            id=uuid4(),
+            tenant_id=tenant.id,
+            phone_number="+5511999990000",
+            name="Contato",
+        )
+        db_session.add(tenant)
+        await db_session.flush()
+        db_session.add(contact)
+        await db_session.flush()
+        return tenant.id, contact.id
+
+    return make
@@ -0,0 +1,84 @@
+"""Integration tests for the set-based overdue marking."""
+
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.billing.value_objects.boleto_status import BoletoStatus
+from app.infrastructure.db.models import BoletoModel
+from app.infrastructure.db.repositories.billing import BoletoRepository
+from tests.integration.conftest import ContactFactory
+
+NOW = datetime.now(UTC)
+
+
+async def _boleto(
+    session: AsyncSession,
+    tenant_id: UUID,
+    contact_id: UUID,
+    days_overdue: int,
+    status: BoletoStatus = BoletoStatus.SENT,
+) -> BoletoModel:
+    model = BoletoModel(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        contact_id=contact_id,
+        amount_cents=10_000,
+        due_date=NOW - timedelta(days=days_overdue),
+        status=status.value,
+        idempotency_key=str(uuid4()),
+    )
+    session.add(model)
+    await session.flush()
+    return model
+
+
+async def _status(session: AsyncSession, boleto: BoletoModel) -> str:
+    result = await session.execute(select(BoletoModel.status).where(BoletoModel.id == boleto.id))
+    return result.scalar_one()
+
+
+class TestMarkOverdueBatch:
+    """Tests for BoletoRepository.mark_overdue_batch."""
+
+    async def test_marks_oldest_first_in_chunks(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        tenant_id, contact_id = await make_contact()
+        # Decades past due, so these sort ahead of anything else in the table
+        boletos = [await _boleto(db_session, tenant_id, contact_id, 20_000 - i) for i in range(5)]
+        repository = BoletoRepository(db_session)
+
+        chunks = [await repository.mark_overdue_batch(NOW, limit=2) for _ in range(3)]
+
+        # RETURNING order is unspecified; each chunk takes the next oldest rows
+        assert [{m.boleto_id.value for m in chunk} for chunk in chunks[:2]] == [
+            {boletos[0].id, boletos[1].id},
+            {boletos[2].id, boletos[3].id},
+        ]
+        assert boletos[4].id in {m.boleto_id.value for m in chunks[2]}
+        for boleto in boletos:
+            assert await _status(db_session, boleto) == BoletoStatus.OVERDUE.value
+
+    async def test_returns_marked_rows_only(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        tenant_id, contact_id = await make_contact()
+        overdue = await _boleto(db_session, tenant_id, contact_id, 20_000)
+        not_due = await _boleto(db_session, tenant_id, contact_id, -1)
+        paid = await _boleto(db_session, tenant_id, contact_id, 20_001, BoletoStatus.PAID)
+        repository = BoletoRepository(db_session)
+
+        marked = await repository.mark_overdue_batch(NOW, limit=1)
+
+        (marking,) = marked
+        assert marking.boleto_id.value == overdue.id
+        assert marking.tenant_id.value == tenant_id
+        assert marking.due_date == overdue.due_date
+        assert await _status(db_session, not_due) == BoletoStatus.SENT.value
+        assert await _status(db_session, paid) == BoletoStatus.PAID.value
+        # Already OVERDUE, so a second run does not return it again
+        again = await repository.mark_overdue_batch(NOW, limit=1)
+        assert overdue.id not in {m.boleto_id.value for m in again}
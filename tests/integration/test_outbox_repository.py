@@ -0,0 +1,133 @@
+"""Integration tests for outbox claiming and fenced bulk saves."""
+
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.contacts.value_objects.contact_id import ContactId
+from app.domain.identity.value_objects.tenant_id import TenantId
+from app.domain.messaging.entities.outbox_item import MessageOutboxItem
+from app.domain.messaging.value_objects.delivery_status import DeliveryStatus
+from app.domain.messaging.value_objects.message_type import MessageType
+from app.infrastructure.db.models import MessageOutboxModel
+from app.infrastructure.db.repositories.messaging import OutboxRepository
+from tests.integration.conftest import ContactFactory
+
+NOW = datetime.now(UTC)
+
+
+async def _queue(
+    session: AsyncSession, tenant_id: UUID, contact_id: UUID, count: int
+) -> list[MessageOutboxItem]:
+    """Queue `count` due items, oldest first."""
+    items = [
+        MessageOutboxItem.create(
+            tenant_id=TenantId(value=tenant_id),
+            contact_id=ContactId(value=contact_id),
+            message_type=MessageType.NOTIFICATION,
+            payload={"text": f"msg {i}"},
+            idempotency_key=f"{tenant_id}-{i}",
+            scheduled_at=NOW - timedelta(minutes=count - i),
+        )
+        for i in range(count)
+    ]
+    await OutboxRepository(session).add_many(items)
+    return items
+
+
+async def _lease(
+    session: AsyncSession, item: MessageOutboxItem, owner: str, expires_at: datetime
+) -> None:
+    await session.execute(
+        update(MessageOutboxModel)
+        .where(MessageOutboxModel.id == item.id.value)
+        .values(lease_owner=owner, lease_expires_at=expires_at)
+    )
+
+
+async def _row(session: AsyncSession, item: MessageOutboxItem) -> MessageOutboxModel:
+    result = await session.execute(
+        select(MessageOutboxModel)
+        .where(MessageOutboxModel.id == item.id.value)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+class TestClaimPending:
+    """Tests for OutboxRepository.claim_pending."""
+
+    async def test_rows_leased_elsewhere_do_not_use_up_tenant_share(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        busy_tenant, busy_contact = await make_contact()
+        other_tenant, other_contact = await make_contact()
+        busy = await _queue(db_session, busy_tenant, busy_contact, 3)
+        other = await _queue(db_session, other_tenant, other_contact, 3)
+        for item in busy[:2]:
+            await _lease(db_session, item, "other-claim", NOW + timedelta(minutes=5))
+
+        claimed = await OutboxRepository(db_session).claim_pending(
+            worker_id="claim-1", lease_seconds=60, per_tenant_limit=2
+        )
+
+        assert {item.id for item in claimed} == {busy[2].id, other[0].id, other[1].id}
+
+    async def test_expired_lease_is_reclaimed(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        tenant_id, contact_id = await make_contact()
+        expired, held = await _queue(db_session, tenant_id, contact_id, 2)
+        await _lease(db_session, expired, "lapsed-claim", NOW - timedelta(seconds=1))
+        await _lease(db_session, held, "live-claim", NOW + timedelta(minutes=5))
+
+        claimed = await OutboxRepository(db_session).claim_pending(
+            worker_id="claim-2", lease_seconds=60
+        )
+
+        assert [item.id for item in claimed] == [expired.id]
+        assert (await _row(db_session, expired)).lease_owner == "claim-2"
+        assert (await _row(db_session, held)).lease_owner == "live-claim"
+
+
+class TestSaveMany:
+    """Tests for OutboxRepository.save_many fencing."""
+
+    async def test_saves_and_releases_own_lease(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        tenant_id, contact_id = await make_contact()
+        await _queue(db_session, tenant_id, contact_id, 2)
+        repository = OutboxRepository(db_session)
+        claimed = await repository.claim_pending(worker_id="claim-1", lease_seconds=60)
+        for item in claimed:
+            item.mark_as_sent()
+
+        assert await repository.save_many(claimed, "claim-1") == 2
+
+        row = await _row(db_session, claimed[0])
+        assert row.status == DeliveryStatus.SENT.value
+        assert row.sent_at is not None
+        assert row.lease_owner is None
+        assert row.lease_expires_at is None
+
+    async def test_stale_claim_updates_no_rows(
+        self, db_session: AsyncSession, make_contact: ContactFactory
+    ) -> None:
+        tenant_id, contact_id = await make_contact()
+        (item,) = await _queue(db_session, tenant_id, contact_id, 1)
+        repository = OutboxRepository(db_session)
+        (stale,) = await repository.claim_pending(worker_id="claim-1", lease_seconds=60)
+        # The lease lapses and another claim takes the row over
+        await _lease(db_session, item, "claim-1", NOW - timedelta(seconds=1))
+        await repository.claim_pending(worker_id="claim-2", lease_seconds=60)
+        stale.mark_for_retry("provider timeout")
+
+        assert await repository.save_many([stale], "claim-1") == 0
+
+        row = await _row(db_session, item)
+        assert row.status == DeliveryStatus.PENDING.value
+        assert row.attempt_count == 0
+        assert row.lease_owner == "claim-2"
@@ -0,0 +1,133 @@
+"""Unit tests for the combined intent + entity node."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from app.ai.nodes import combined_extraction, entity_extraction, intent_classification
+from app.ai.state import AIGraphState, Intent
+from app.application.ports.providers.llm import (
+    ExtractedEntitiesResult,
+    IntentClassificationResult,
+    IntentWithEntitiesResult,
+    LLMErrorCode,
+    LLMProviderPort,
+)
+
+
+class FakeLLMProvider(LLMProviderPort):
+    """Counts calls; combined confidence and errors are configurable."""
+
+    def __init__(
+        self,
+        combined_confidence: float,
+        combined_error: LLMErrorCode | None = None,
+        intent: str = "create_boleto",
+    ) -> None:
+        self.combined_confidence = combined_confidence
+        self.combined_error = combined_error
+        self.intent = intent
+        self.calls: list[str] = []
+
+    async def classify_intent(self, text: str) -> IntentClassificationResult:
+        self.calls.append("classify_intent")
+        return IntentClassificationResult(success=True, intent=self.intent, confidence=0.9)
+
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
+        self.calls.append("extract_entities")
+        return ExtractedEntitiesResult(success=True, amount_cents=5000)
+
+    async def classify_and_extract(self, text: str) -> IntentWithEntitiesResult:
+        self.calls.append("classify_and_extract")
+        if self.combined_error is not None:
+            return IntentWithEntitiesResult(success=False, error_code=self.combined_error)
+        return IntentWithEntitiesResult(
+            success=True,
+            intent="create_boleto",
+            confidence=self.combined_confidence,
+            entities=ExtractedEntitiesResult(success=True, amount_cents=10000),
+        )
+
+
+NODE_MODULES = (intent_classification, entity_extraction)
+
+
+@pytest.fixture(autouse=True)
+def reset_providers() -> Iterator[None]:
+    yield
+    for module in NODE_MODULES:
+        module._llm_provider = None
+
+
+def _install(provider: FakeLLMProvider) -> None:
+    for module in NODE_MODULES:
+        module.set_llm_provider(provider)
+
+
+class TestClassifyAndExtract:
+    """Tests for classify_and_extract."""
+
+    async def test_confident_result_uses_one_call(self) -> None:
+        provider = FakeLLMProvider(combined_confidence=0.95)
+        _install(provider)
+
+        state = await combined_extraction.classify_and_extract(
+            AIGraphState(normalized_input="cobrar 100 reais")
+        )
+
+        assert provider.calls == ["classify_and_extract"]
+        assert state.intent == Intent.CREATE_BOLETO
+        assert state.entities.amount_cents == 10000
+
+    async def test_low_confidence_falls_back_to_two_step(self) -> None:
+        provider = FakeLLMProvider(combined_confidence=0.4)
+        _install(provider)
+
+        state = await combined_extraction.classify_and_extract(
+            AIGraphState(normalized_input="cobrar 50 reais")
+        )
+
+        assert provider.calls == [
+            "classify_and_extract",
+            "classify_intent",
+            "extract_entities",
+        ]
+        assert state.intent == Intent.CREATE_BOLETO
+        assert state.entities.amount_cents == 5000
+
+    async def test_api_error_falls_back_to_two_step(self) -> None:
+        provider = FakeLLMProvider(combined_confidence=0.0, combined_error=LLMErrorCode.API_ERROR)
+        _install(provider)
+
+        state = await combined_extraction.classify_and_extract(
+            AIGraphState(normalized_input="cobrar 50 reais")
+        )
+
+        assert provider.calls[1:] == ["classify_intent", "extract_entities"]
+        assert state.intent == Intent.CREATE_BOLETO
+
+    @pytest.mark.parametrize(
+        "error_code", [LLMErrorCode.CIRCUIT_OPEN, LLMErrorCode.BUDGET_EXHAUSTED]
+    )
+    async def test_unavailable_llm_does_not_fall_back(self, error_code: LLMErrorCode) -> None:
+        provider = FakeLLMProvider(combined_confidence=0.0, combined_error=error_code)
+        _install(provider)
+
+        state = await combined_extraction.classify_and_extract(
+            AIGraphState(normalized_input="cobrar 50 reais")
+        )
+
+        assert provider.calls == ["classify_and_extract"]
+        assert state.intent == Intent.UNKNOWN
+        assert state.should_stop()
+
+    async def test_fallback_skips_extraction_for_entity_free_intent(self) -> None:
+        provider = FakeLLMProvider(combined_confidence=0.4, intent="list_boletos")
+        _install(provider)
+
+        state = await combined_extraction.classify_and_extract(
+            AIGraphState(normalized_input="meus boletos")
+        )
+
+        assert provider.calls == ["classify_and_extract", "classify_intent"]
+        assert state.intent == Intent.LIST_BOLETOS
@@ -0,0 +1,185 @@
+"""Unit tests for conversation turns (single, redelivered and batched)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from app.ai import conversation
+from app.ai.conversation import (
+    BatchMessage,
+    MessageTurn,
+    process_message,
+    process_messages,
+)
+from app.ai.state import AIGraphState
+from app.infrastructure.redis.conversation_lock import ConversationBusyError, ConversationLease
+
+
+class FakeGraph:
+    """Echoes the input, tracking how many runs overlap."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self.seen: list[tuple[str, str]] = []
+
+    async def run(self, state: AIGraphState, start_at: str | None = None) -> AIGraphState:
+        self.seen.append((state.conversation_id, state.user_input))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0)
+        self.running -= 1
+        if state.user_input == "boom":
+            raise RuntimeError("graph failed")
+        return state.with_updates(response=state.user_input.upper())
+
+
+class FakeStore:
+    """Records batch calls; every conversation starts empty."""
+
+    def __init__(self, busy: frozenset[str] = frozenset()) -> None:
+        self.busy = busy
+        self.attempts: list[list[str]] = []
+        self.locked: list[str] = []
+        self.loaded: list[str] = []
+        self.commits: list[Any] = []
+
+    @asynccontextmanager
+    async def conversation_locks(self, conversation_ids: list[str]):  # type: ignore[no-untyped-def]
+        self.attempts.append(list(conversation_ids))
+        for conversation_id in conversation_ids:
+            if conversation_id in self.busy:
+                raise ConversationBusyError(conversation_id, 100)
+        self.locked = list(conversation_ids)
+        yield {}
+
+    async def load_states(self, conversation_ids: list[str], leases: Any = None) -> dict[str, None]:
+        self.loaded = list(conversation_ids)
+        return dict.fromkeys(conversation_ids)
+
+    async def commit_conversations(self, commits: list[Any]) -> list[bool]:
+        self.commits = list(commits)
+        return [True] * len(commits)
+
+
+class FakeSingleStore:
+    """Keeps committed states in memory; leases are unfenced."""
+
+    def __init__(self) -> None:
+        self.states: dict[str, AIGraphState] = {}
+        self.commits = 0
+
+    @asynccontextmanager
+    async def conversation_lock(self, conversation_id: str):  # type: ignore[no-untyped-def]
+        yield ConversationLease(conversation_id, f"ai:lock:{conversation_id}", None, 0.0)
+
+    async def load_state(self, conversation_id: str, lease: Any = None) -> AIGraphState | None:
+        return self.states.get(conversation_id)
+
+    async def commit_conversation(
+        self, conversation_id: str, state: AIGraphState, **kwargs: Any
+    ) -> None:
+        self.commits += 1
+        self.states[conversation_id] = state
+
+
+@pytest.fixture
+def graph(monkeypatch: pytest.MonkeyPatch) -> FakeGraph:
+    fake = FakeGraph()
+    monkeypatch.setattr(conversation, "get_graph", lambda: fake)
+    return fake
+
+
+class TestProcessMessage:
+    """Tests for process_message."""
+
+    async def test_redelivered_message_does_not_run_the_graph_again(self, graph: FakeGraph) -> None:
+        store = FakeSingleStore()
+
+        first = await process_message(store, "t1", "oi", "c1", message_id="m1")  # type: ignore[arg-type]
+        again = await process_message(store, "t1", "oi", "c1", message_id="m1")  # type: ignore[arg-type]
+
+        assert len(graph.seen) == 1
+        assert store.commits == 1
+        assert not first.replayed
+        assert again.replayed
+        assert again.state.response == "OI"
+        assert again.state.message_ids == ("m1",)
+
+    @pytest.mark.usefixtures("graph")
+    async def test_message_ids_are_bounded(self) -> None:
+        store = FakeSingleStore()
+
+        for i in range(conversation.RECENT_MESSAGE_IDS + 5):
+            await process_message(store, "t1", "oi", "c1", message_id=f"m{i}")  # type: ignore[arg-type]
+
+        ids = store.states["c1"].message_ids
+        assert len(ids) == conversation.RECENT_MESSAGE_IDS
+        assert ids[-1] == f"m{conversation.RECENT_MESSAGE_IDS + 4}"
+
+
+class TestProcessMessages:
+    """Tests for process_messages."""
+
+    async def test_same_conversation_runs_in_order_and_commits_once(self, graph: FakeGraph) -> None:
+        store = FakeStore()
+
+        results = await process_messages(
+            store,  # type: ignore[arg-type]
+            [
+                BatchMessage("t1", "a", "c1"),
+                BatchMessage("t1", "x", "c2"),
+                BatchMessage("t1", "b", "c1"),
+            ],
+        )
+
+        assert store.locked == ["c1", "c2"]
+        assert store.loaded == ["c1", "c2"]
+        assert [c.conversation_id for c in store.commits] == ["c1", "c2"]
+        assert [text for cid, text in graph.seen if cid == "c1"] == ["a", "b"]
+        assert store.commits[0].state.response == "B"
+        assert all(isinstance(result, MessageTurn) for result in results)
+
+    @pytest.mark.usefixtures("graph")
+    async def test_failed_message_does_not_fail_the_batch(self) -> None:
+        store = FakeStore()
+
+        results = await process_messages(
+            store,  # type: ignore[arg-type]
+            [BatchMessage("t1", "boom", "c1"), BatchMessage("t1", "ok")],
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert isinstance(results[1], MessageTurn)
+        assert [c.conversation_id for c in store.commits] == [results[1].state.conversation_id]
+
+    async def test_concurrency_is_bounded(self, graph: FakeGraph) -> None:
+        await process_messages(
+            FakeStore(),  # type: ignore[arg-type]
+            [BatchMessage("t1", str(i)) for i in range(10)],
+            concurrency=3,
+        )
+
+        assert graph.peak == 3
+
+    async def test_busy_conversation_fails_only_its_messages(self, graph: FakeGraph) -> None:
+        store = FakeStore(busy=frozenset({"c1"}))
+
+        results = await process_messages(
+            store,  # type: ignore[arg-type]
+            [
+                BatchMessage("t1", "a", "c1"),
+                BatchMessage("t1", "x", "c2"),
+                BatchMessage("t1", "b", "c1"),
+            ],
+        )
+
+        assert store.attempts == [["c1", "c2"], ["c2"]]
+        assert store.loaded == ["c2"]
+        assert [c.conversation_id for c in store.commits] == ["c2"]
+        assert isinstance(results[0], ConversationBusyError)
+        assert isinstance(results[1], MessageTurn)
+        assert isinstance(results[2], ConversationBusyError)
+        assert graph.seen == [("c2", "x")]
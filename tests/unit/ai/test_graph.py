@@ -0,0 +1,119 @@
+"""Unit tests for AIGraph execution and resume."""
+
+import pytest
+
+from app.ai.graph import AIGraph, Edge, NotResumableError, get_graph
+from app.ai.state import AIGraphState, ConfirmationStatus, Intent
+from app.ai.timing import graph_latency
+
+
+class TestAIGraphResume:
+    """Tests for run(state, start_at=...)."""
+
+    async def test_confirmation_checkpoint_is_recorded(self) -> None:
+        graph = AIGraph()
+
+        state = await graph.run(AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+
+        assert state.intent == Intent.CREATE_BOLETO
+        assert state.confirmation_status == ConfirmationStatus.PENDING
+        assert state.last_completed_node == "check_confirmation"
+
+    async def test_resume_runs_only_remaining_nodes(self) -> None:
+        graph = AIGraph()
+        pending = await graph.run(AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+        confirmed = pending.with_updates(
+            confirmation_status=ConfirmationStatus.CONFIRMED,
+            response=None,
+        )
+
+        final = await graph.run(confirmed, start_at="execute_tool")
+
+        assert final.tool_name == "create_boleto"
+        assert final.response is not None
+        assert final.last_completed_node == "generate_response"
+        assert final.step_count - confirmed.step_count == 2
+
+    async def test_resume_point_follows_checkpoint(self) -> None:
+        graph = AIGraph()
+        pending = await graph.run(AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+
+        assert graph.resume_point(pending) == "execute_tool"
+
+    def test_resume_point_needs_checkpoint(self) -> None:
+        with pytest.raises(NotResumableError):
+            AIGraph().resume_point(AIGraphState(user_input="oi"))
+        with pytest.raises(NotResumableError):
+            AIGraph().resume_point(AIGraphState(last_completed_node="generate_response"))
+
+    async def test_legacy_pending_confirmation_resumes_at_tool(self) -> None:
+        graph = AIGraph()
+        pending = await graph.run(AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+        # Saved before checkpoints were recorded
+        legacy = pending.with_updates(last_completed_node=None)
+
+        assert graph.resume_point(legacy) == "execute_tool"
+
+        confirmed = legacy.with_updates(
+            confirmation_status=ConfirmationStatus.CONFIRMED, response=None
+        )
+        final = await graph.run(confirmed, start_at=graph.resume_point(confirmed))
+
+        assert final.tool_name == "create_boleto"
+        assert final.last_completed_node == "generate_response"
+
+    async def test_unknown_start_node_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            await AIGraph().run(AIGraphState(user_input="oi"), start_at="nope")
+
+
+class TestAIGraphEdges:
+    """Tests for conditional edges."""
+
+    async def test_rule_hit_goes_straight_to_validation(self) -> None:
+        graph = AIGraph()
+
+        state = await graph.run(AIGraphState(user_input="listar meus boletos"))
+
+        assert state.intent_source == "rules"
+        assert state.intent == Intent.LIST_BOLETOS
+        assert state.tool_name == "list_boletos"
+
+    async def test_non_monetary_intent_skips_confirmation(self) -> None:
+        graph = AIGraph()
+
+        state = await graph.run(AIGraphState(user_input="mostrar meus boletos"))
+
+        assert state.confirmation_status == ConfirmationStatus.NOT_REQUIRED
+        assert state.last_completed_node == "generate_response"
+
+    def test_compile_rejects_dangling_edge(self) -> None:
+        graph = AIGraph()
+
+        with pytest.raises(ValueError):
+            graph._compile({"a": graph._nodes["normalize_input"]}, {"a": (Edge("b"),)})
+
+
+class TestAIGraphTimings:
+    """Tests for per-run timing breakdown and histograms."""
+
+    async def test_breakdown_attached_to_final_state(self) -> None:
+        state = await AIGraph().run(AIGraphState(user_input="listar meus boletos"))
+
+        assert set(state.timings) >= {"node.normalize_input", "node.execute_tool", "total"}
+        assert "node.classify_intent" not in state.timings
+        assert state.timings["total"] >= state.timings["node.execute_tool"]
+
+    async def test_histograms_by_node_intent_and_outcome(self) -> None:
+        graph_latency.reset()
+
+        await AIGraph().run(AIGraphState(user_input="cobrar R$ 150 do João dia 10"))
+
+        snapshot = graph_latency.snapshot()
+        assert snapshot["node.check_confirmation"]["count"] == 1
+        assert snapshot["intent.create_boleto"]["count"] == 1
+        assert snapshot["outcome.confirmation_pending"]["count"] == 1
+
+
+def test_get_graph_is_singleton() -> None:
+    assert get_graph(combined_extraction=False) is get_graph(combined_extraction=False)
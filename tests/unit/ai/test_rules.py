@@ -0,0 +1,81 @@
+"""Unit tests for the rule-based fast path."""
+
+from datetime import date
+
+import pytest
+
+from app.ai.rules import RuleClassifier, parse_amount_cents, resolve_due_date
+from app.ai.state import Intent
+
+BOLETO_ID = "3f2b8c1e-9a4d-4e7b-8c2a-1d5e6f7a8b9c"
+TODAY = date(2026, 3, 15)
+
+
+class TestRuleClassifier:
+    """Tests for RuleClassifier.match."""
+
+    def test_status_by_id(self) -> None:
+        match = RuleClassifier().match(f"status do boleto {BOLETO_ID}", TODAY)
+
+        assert match is not None
+        assert match.intent == Intent.CHECK_STATUS
+        assert match.entities.boleto_id == BOLETO_ID
+
+    def test_cancel_by_id(self) -> None:
+        match = RuleClassifier().match(f"cancelar boleto {BOLETO_ID}", TODAY)
+
+        assert match is not None
+        assert match.intent == Intent.CANCEL_BOLETO
+
+    def test_create_boleto(self) -> None:
+        match = RuleClassifier().match("cobrar r$ 150 do joão dia 10", TODAY)
+
+        assert match is not None
+        assert match.intent == Intent.CREATE_BOLETO
+        assert match.entities.contact_name == "João"
+        assert match.entities.amount_cents == 15000
+        assert match.entities.due_date == "2026-04-10"
+        assert match.entities.raw == {"rule": "create_boleto_amount_name_day"}
+
+    def test_name_stops_at_due_date_keyword(self) -> None:
+        match = RuleClassifier().match("cobrar r$ 150 do joão vencimento em 10", date(2026, 2, 15))
+
+        assert match is not None
+        assert match.entities.contact_name == "João"
+        assert match.entities.due_date == "2026-03-10"
+
+    def test_two_word_name(self) -> None:
+        match = RuleClassifier().match("cobrar r$ 150 do joão silva dia 10", TODAY)
+
+        assert match is not None
+        assert match.entities.contact_name == "João Silva"
+
+    def test_free_form_text_misses(self) -> None:
+        assert RuleClassifier().match("oi, tudo bem? preciso de ajuda", TODAY) is None
+
+    def test_impossible_date_misses(self) -> None:
+        assert RuleClassifier().match("cobrar r$ 10 da ana dia 31/02", TODAY) is None
+
+    def test_counts_hits_per_rule(self) -> None:
+        classifier = RuleClassifier()
+        classifier.match(f"status do boleto {BOLETO_ID}", TODAY)
+        classifier.match("bom dia", TODAY)
+
+        stats = classifier.stats()
+
+        assert stats["evaluated"] == 2
+        assert stats["hit_rate"] == 0.5
+        assert stats["rules"]["check_status_by_id"]["hits"] == 1
+
+
+@pytest.mark.parametrize(
+    ("amount", "cents"),
+    [("150", 15000), ("150,5", 15050), ("1.500,50", 150050)],
+)
+def test_parse_amount_cents(amount: str, cents: int) -> None:
+    assert parse_amount_cents(amount) == cents
+
+
+def test_bare_day_resolves_to_next_occurrence() -> None:
+    assert resolve_due_date(20, None, None, TODAY) == date(2026, 3, 20)
+    assert resolve_due_date(10, None, None, TODAY) == date(2026, 4, 10)
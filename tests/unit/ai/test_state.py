@@ -0,0 +1,74 @@
+"""Unit tests for AIGraphState updates."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from app.ai.state import AIGraphState, ExtractedEntities, Intent
+
+
+class TestAIGraphStateUpdates:
+    """Tests for with_updates / with_field."""
+
+    def test_with_updates_shares_unchanged_fields(self) -> None:
+        entities = ExtractedEntities(amount_cents=100)
+        state = AIGraphState(user_input="oi", entities=entities)
+
+        updated = state.with_updates(intent=Intent.LIST_BOLETOS)
+
+        assert updated is not state
+        assert updated.intent == Intent.LIST_BOLETOS
+        assert updated.entities is entities
+        assert updated.step_count == state.step_count + 1
+        assert state.intent is None
+
+    def test_with_field_matches_with_updates(self) -> None:
+        state = AIGraphState(user_input="oi")
+
+        assert state.with_field("response", "ok") == state.with_updates(response="ok")
+
+    def test_with_field_without_step(self) -> None:
+        state = AIGraphState(user_input="oi")
+
+        updated = state.with_field("last_completed_node", "normalize_input", count_step=False)
+
+        assert updated.step_count == state.step_count
+        assert updated.last_completed_node == "normalize_input"
+
+    def test_unknown_field_rejected(self) -> None:
+        with pytest.raises(TypeError):
+            AIGraphState().with_updates(nope=1)
+        with pytest.raises(TypeError):
+            AIGraphState().with_field("nope", 1)
+
+    def test_state_and_entities_are_frozen(self) -> None:
+        with pytest.raises(FrozenInstanceError):
+            AIGraphState().response = "x"  # type: ignore[misc]
+        with pytest.raises(FrozenInstanceError):
+            ExtractedEntities().raw = {}  # type: ignore[misc]
+
+    def test_dirty_fields_tracked_after_clean(self) -> None:
+        state = AIGraphState(user_input="oi")
+        assert state.dirty_fields is None
+
+        clean = state.clean()
+        updated = clean.with_updates(response="ok").with_field(
+            "last_completed_node", "respond", count_step=False
+        )
+
+        assert clean.dirty_fields == frozenset()
+        assert updated.dirty_fields == {"response", "step_count", "last_completed_node"}
+        assert updated == state.with_updates(response="ok").with_field(
+            "last_completed_node", "respond", count_step=False
+        )
+
+
+class TestIntentFromLabel:
+    """Tests for Intent.from_label."""
+
+    def test_known_label_any_case(self) -> None:
+        assert Intent.from_label("CREATE_BOLETO") == Intent.CREATE_BOLETO
+
+    def test_missing_or_unknown_label(self) -> None:
+        assert Intent.from_label(None) == Intent.UNKNOWN
+        assert Intent.from_label("refund") == Intent.UNKNOWN
@@ -0,0 +1,42 @@
+"""Unit tests for outbox delivery ordering."""
+
+from app.application.messaging.use_cases.deliver_outbox import interleave_by_tenant
+from app.domain.contacts.value_objects.contact_id import ContactId
+from app.domain.identity.value_objects.tenant_id import TenantId
+from app.domain.messaging.entities.outbox_item import MessageOutboxItem
+from app.domain.messaging.value_objects.message_type import MessageType
+
+
+def _item(tenant_id: TenantId, key: str) -> MessageOutboxItem:
+    return MessageOutboxItem.create(
+        tenant_id=tenant_id,
+        contact_id=ContactId.generate(),
+        message_type=MessageType.REMINDER,
+        payload={},
+        idempotency_key=key,
+    )
+
+
+class TestInterleaveByTenant:
+    """Tests for per-tenant round-robin ordering."""
+
+    def test_bulk_tenant_does_not_starve_others(self) -> None:
+        bulk = TenantId.generate()
+        small = TenantId.generate()
+        items = [_item(bulk, f"b{i}") for i in range(4)] + [_item(small, "s0")]
+
+        ordered = interleave_by_tenant(items)
+
+        assert [i.idempotency_key for i in ordered] == ["b0", "s0", "b1", "b2", "b3"]
+
+    def test_preserves_order_within_tenant(self) -> None:
+        a = TenantId.generate()
+        b = TenantId.generate()
+        items = [_item(a, "a0"), _item(b, "b0"), _item(a, "a1"), _item(b, "b1")]
+
+        ordered = interleave_by_tenant(items)
+
+        assert [i.idempotency_key for i in ordered] == ["a0", "b0", "a1", "b1"]
+
+    def test_empty(self) -> None:
+        assert interleave_by_tenant([]) == []
@@ -0,0 +1,62 @@
+"""Unit tests for InterestPolicy and interest rules."""
+
+import pytest
+
+from app.domain.collections.entities.interest_policy import (
+    InterestPolicy,
+    compute_interest_batch,
+)
+from app.domain.identity.value_objects.tenant_id import TenantId
+
+
+def _policy(grace: int = 0, bps: int = 0, penalty: int = 0) -> InterestPolicy:
+    return InterestPolicy.create(
+        tenant_id=TenantId.generate(),
+        grace_period_days=grace,
+        daily_interest_rate_bps=bps,
+        fixed_penalty_cents=penalty,
+    )
+
+
+class TestCalculateInterest:
+    """Tests for InterestPolicy.calculate_interest."""
+
+    def test_within_grace_period_is_zero(self) -> None:
+        policy = _policy(grace=3, bps=100, penalty=200)
+        assert policy.calculate_interest(10000, 3) == 0
+
+    def test_daily_interest_plus_penalty(self) -> None:
+        policy = _policy(grace=2, bps=33, penalty=200)
+        # 10000 * 0.33% * 3 days = 99 + 200 penalty
+        assert policy.calculate_interest(10000, 5) == 299
+
+    def test_rounds_down_to_cent(self) -> None:
+        policy = _policy(bps=1)
+        assert policy.calculate_interest(9999, 1) == 0
+
+
+class TestComputeInterestBatch:
+    """Tests for batch interest calculation."""
+
+    def test_matches_single_calculation(self) -> None:
+        policies = [_policy(0, 33, 0), _policy(5, 100, 500), _policy(1, 7, 150)]
+        principals = [12345, 50000, 999]
+        days = [10, 4, 30]
+
+        batch = compute_interest_batch(
+            principals,
+            days,
+            [p.grace_period_days for p in policies],
+            [p.daily_interest_rate_bps for p in policies],
+            [p.fixed_penalty_cents for p in policies],
+        )
+
+        expected = [
+            policy.calculate_interest(principal, day)
+            for policy, principal, day in zip(policies, principals, days, strict=True)
+        ]
+        assert batch == expected
+
+    def test_mismatched_columns_raise(self) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            compute_interest_batch([1, 2], [1], [0], [0], [0])
@@ -0,0 +1,185 @@
+"""Unit tests for the reminder scheduling task."""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from app.domain.billing.entities.boleto import Boleto
+from app.domain.billing.value_objects.due_date import DueDate
+from app.domain.billing.value_objects.money import Money
+from app.domain.collections.entities.reminder_schedule import ReminderSchedule
+from app.domain.contacts.entities.contact import Contact
+from app.domain.identity.value_objects.phone_number import PhoneNumber
+from app.domain.identity.value_objects.tenant_id import TenantId
+from app.infrastructure.celery.tasks import collections as collections_tasks
+from app.infrastructure.db import session as db_session
+from app.infrastructure.db.repositories import billing as billing_repositories
+from app.infrastructure.db.repositories import contacts as contact_repositories
+
+TENANT = TenantId.generate()
+
+
+class FakeDatabase:
+    """In-memory rows plus a log of every repository round trip."""
+
+    def __init__(
+        self,
+        schedules: list[ReminderSchedule],
+        boletos: list[Boleto],
+        contacts: list[Contact],
+    ) -> None:
+        self.schedules = schedules
+        self.boletos = {boleto.id: boleto for boleto in boletos}
+        self.contacts = {contact.id: contact for contact in contacts}
+        self.calls: list[tuple[str, list[Any]]] = []
+        self.commits = 0
+
+    def session_factory(self) -> "FakeSession":
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, db: FakeDatabase) -> None:
+        self.db = db
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def commit(self) -> None:
+        self.db.commits += 1
+
+
+class _FakeRepository:
+    def __init__(self, session: FakeSession) -> None:
+        self.db = session.db
+
+    def _log(self, name: str, args: Sequence[Any]) -> None:
+        self.db.calls.append((name, list(args)))
+
+
+class FakeReminderRepository(_FakeRepository):
+    async def get_pending(self, limit: int = 100) -> list[ReminderSchedule]:
+        self._log("get_pending", [limit])
+        return self.db.schedules[:limit]
+
+    async def mark_sent_many(self, schedule_ids: Sequence[Any]) -> int:
+        self._log("mark_sent_many", schedule_ids)
+        return len(schedule_ids)
+
+    async def cancel_many(self, schedule_ids: Sequence[Any]) -> int:
+        self._log("cancel_many", schedule_ids)
+        return len(schedule_ids)
+
+
+class FakeOutboxRepository(_FakeRepository):
+    async def add_many(self, items: Sequence[Any]) -> int:
+        self._log("add_many", items)
+        return len(items)
+
+
+class FakeBoletoRepository(_FakeRepository):
+    async def get_by_ids(self, boleto_ids: Sequence[Any]) -> list[Boleto]:
+        self._log("boletos", boleto_ids)
+        return [self.db.boletos[i] for i in boleto_ids if i in self.db.boletos]
+
+
+class FakeContactRepository(_FakeRepository):
+    async def get_by_ids(self, contact_ids: Sequence[Any]) -> list[Contact]:
+        self._log("contacts", contact_ids)
+        return [self.db.contacts[i] for i in contact_ids if i in self.db.contacts]
+
+
+def _contact(opted_out: bool = False) -> Contact:
+    contact = Contact.create(
+        tenant_id=TENANT, phone_number=PhoneNumber("+5511999998888"), name="Maria"
+    )
+    if opted_out:
+        contact.opt_out()
+    return contact
+
+
+def _boleto(contact: Contact, key: str, paid: bool = False) -> Boleto:
+    boleto = Boleto.create(
+        tenant_id=TENANT,
+        contact_id=contact.id,
+        amount=Money(amount_cents=15_000),
+        due_date=DueDate.from_string("2026-11-10"),
+        idempotency_key=key,
+    )
+    boleto.mark_as_sent()
+    if paid:
+        boleto.mark_as_paid()
+    return boleto
+
+
+def _schedule(boleto: Boleto) -> ReminderSchedule:
+    return ReminderSchedule.create(
+        tenant_id=TENANT, boleto_id=boleto.id, scheduled_at=datetime.now(UTC)
+    )
+
+
+@pytest.fixture
+def install(monkeypatch: pytest.MonkeyPatch) -> Any:
+    def install(db: FakeDatabase) -> FakeDatabase:
+        monkeypatch.setattr(collections_tasks, "ReminderScheduleRepository", FakeReminderRepository)
+        monkeypatch.setattr(collections_tasks, "OutboxRepository", FakeOutboxRepository)
+        monkeypatch.setattr(billing_repositories, "BoletoRepository", FakeBoletoRepository)
+        monkeypatch.setattr(contact_repositories, "ContactRepository", FakeContactRepository)
+        monkeypatch.setattr(db_session, "async_session_factory", db.session_factory)
+        return db
+
+    return install
+
+
+class TestScheduleReminders:
+    """Tests for _schedule_reminders_async."""
+
+    async def test_prefetches_in_bulk_and_routes_each_schedule(self, install: Any) -> None:
+        maria, opted_out = _contact(), _contact(opted_out=True)
+        due = _boleto(maria, "due")
+        also_due = _boleto(maria, "also-due")
+        paid = _boleto(maria, "paid", paid=True)
+        unreachable = _boleto(opted_out, "opted-out")
+        missing = _boleto(maria, "missing")
+        schedules = [_schedule(boleto) for boleto in (due, paid, unreachable, missing, also_due)]
+        db = install(
+            FakeDatabase(schedules, [due, also_due, paid, unreachable], [maria, opted_out])
+        )
+
+        summary = await collections_tasks._schedule_reminders_async(batch_size=10)
+
+        calls = dict(db.calls)
+        assert [name for name, _ in db.calls] == [
+            "get_pending",
+            "boletos",
+            "contacts",
+            "add_many",
+            "mark_sent_many",
+            "cancel_many",
+        ]
+        assert calls["boletos"] == [s.boleto_id for s in schedules]
+        assert sorted(calls["contacts"], key=str) == sorted([maria.id, opted_out.id], key=str)
+        assert calls["mark_sent_many"] == [schedules[0].id, schedules[4].id]
+        assert calls["cancel_many"] == [schedules[1].id, schedules[2].id, schedules[3].id]
+        queued = calls["add_many"]
+        assert [item.payload["boleto_id"] for item in queued] == [str(due.id), str(also_due.id)]
+        assert queued[0].idempotency_key == f"reminder_{schedules[0].id}_0"
+        assert queued[0].payload["amount_cents"] == 15_000
+        assert queued[0].payload["due_date"] == "2026-11-10"
+        assert db.commits == 1
+        assert summary["processed"] == 5
+        assert summary["sent"] == summary["queued"] == 2
+        assert summary["skipped"] == 3
+
+    async def test_nothing_pending(self, install: Any) -> None:
+        db = install(FakeDatabase([], [], []))
+
+        summary = await collections_tasks._schedule_reminders_async(batch_size=10)
+
+        assert summary["processed"] == summary["sent"] == summary["skipped"] == 0
+        assert db.commits == 1
@@ -0,0 +1,178 @@
+"""Unit tests for per-conversation locking."""
+
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+
+from app.infrastructure.redis import conversation_lock
+from app.infrastructure.redis.conversation_lock import (
+    ConversationBusyError,
+    ConversationLocks,
+    conversation_lock_metrics,
+)
+
+
+class FakeRedis:
+    """Emulates the lock scripts on an in-memory dict (no expiry)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.counters: dict[str, int] = {}
+        self.renewals: list[tuple[str, int]] = []
+
+    async def eval(self, script: str, numkeys: int, *args: object) -> object:
+        keys, argv = [str(a) for a in args[:numkeys]], args[numkeys:]
+        if script == conversation_lock._ACQUIRE_SCRIPT:
+            n = numkeys // 2
+            for i, lock_key in enumerate(keys[:n]):
+                if lock_key in self.data:
+                    return i + 1
+            tokens = []
+            for lock_key, fence_key in zip(keys[:n], keys[n:], strict=True):
+                token = self.counters[fence_key] = self.counters.get(fence_key, 0) + 1
+                self.data[lock_key] = str(token).encode()
+                tokens.append(token)
+            return tokens
+        if script == conversation_lock._RENEW_SCRIPT:
+            ttl, tokens = argv[0], argv[1:]
+            renewed = 0
+            for lock_key, token in zip(keys, tokens, strict=True):
+                if self.data.get(lock_key) == str(token).encode():
+                    self.renewals.append((lock_key, int(ttl)))  # type: ignore[arg-type]
+                    renewed += 1
+            return renewed
+        released = 0
+        for lock_key, token in zip(keys, argv, strict=True):
+            if self.data.get(lock_key) == str(token).encode():
+                del self.data[lock_key]
+                released += 1
+        return released
+
+
+class BrokenRedis:
+    async def eval(self, *args: object) -> int:
+        raise redis.ConnectionError("down")
+
+
+def _locks(client: object = None, **kwargs: object) -> ConversationLocks:
+    return ConversationLocks(
+        redis_client=client,  # type: ignore[arg-type]
+        use_redis=client is not None,
+        poll_min_ms=1,
+        poll_max_ms=5,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    conversation_lock_metrics.reset()
+
+
+class TestConversationLocks:
+    """Tests for ConversationLocks."""
+
+    async def test_same_conversation_runs_one_at_a_time(self) -> None:
+        locks = _locks()
+        order: list[str] = []
+
+        async def run(name: str) -> None:
+            async with locks.hold("c1"):
+                order.append(f"{name}:start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name}:end")
+
+        await asyncio.gather(run("a"), run("b"), run("c"))
+
+        assert order == ["a:start", "a:end", "b:start", "b:end", "c:start", "c:end"]
+        stats = conversation_lock_metrics.snapshot()
+        assert stats["acquired"] == 3
+        assert stats["contended"] == 2
+        assert stats["held"] == 0
+        assert stats["waiting"] == 0
+
+    async def test_other_conversations_do_not_wait(self) -> None:
+        locks = _locks()
+
+        async with locks.hold("c1"), locks.hold("c2") as lease:
+            assert lease.conversation_id == "c2"
+
+        assert conversation_lock_metrics.snapshot()["contended"] == 0
+
+    async def test_replicas_exclude_each_other_with_increasing_tokens(self) -> None:
+        fake = FakeRedis()
+        first, second = _locks(fake), _locks(fake)
+        release = asyncio.Event()
+        tokens: list[int | None] = []
+
+        async def hold_first() -> None:
+            async with first.hold("c1") as lease:
+                tokens.append(lease.token)
+                await release.wait()
+
+        task = asyncio.create_task(hold_first())
+        await asyncio.sleep(0)
+
+        async def hold_second() -> None:
+            async with second.hold("c1") as lease:
+                tokens.append(lease.token)
+
+        waiter = asyncio.create_task(hold_second())
+        await asyncio.sleep(0.01)
+        assert tokens == [1]
+
+        release.set()
+        await asyncio.gather(task, waiter)
+
+        assert tokens == [1, 2]
+        assert fake.data == {}
+        assert conversation_lock_metrics.snapshot()["remote_waits"] == 1
+
+    async def test_wait_timeout_raises_busy(self) -> None:
+        fake = FakeRedis()
+        fake.data["ai:lock:c1"] = b"7"  # held by another replica
+
+        with pytest.raises(ConversationBusyError):
+            async with _locks(fake, wait_timeout_ms=20).hold("c1"):
+                pass
+
+        assert conversation_lock_metrics.snapshot()["timeouts"] == 1
+
+    async def test_redis_errors_fail_open(self) -> None:
+        async with _locks(BrokenRedis()).hold("c1") as lease:
+            assert lease.token is None
+
+        assert conversation_lock_metrics.snapshot()["redis_errors"] == 1
+
+    async def test_hold_many_takes_all_or_waits(self) -> None:
+        fake = FakeRedis()
+        fake.data["ai:lock:c2"] = b"9"  # held by another replica
+
+        with pytest.raises(ConversationBusyError) as exc_info:
+            async with _locks(fake, wait_timeout_ms=20).hold_many(["c1", "c2"]):
+                pass
+
+        assert exc_info.value.conversation_id == "c2"
+        assert "ai:lock:c1" not in fake.data  # nothing taken while waiting
+
+        del fake.data["ai:lock:c2"]
+        async with _locks(fake).hold_many(["c2", "c1", "c2"]) as leases:
+            assert sorted(leases) == ["c1", "c2"]
+            assert all(lease.token for lease in leases.values())
+
+        assert fake.data == {}
+
+    async def test_keep_alive_renews_until_released(self) -> None:
+        fake = FakeRedis()
+        locks = _locks(fake, lock_ttl_ms=30)
+
+        async with locks.hold_many(["c1", "c2"], keep_alive=True):
+            await asyncio.sleep(0.035)
+        renewals = len(fake.renewals)
+        await asyncio.sleep(0.02)
+
+        assert renewals >= 2
+        assert {key for key, _ in fake.renewals} == {"ai:lock:c1", "ai:lock:c2"}
+        assert len(fake.renewals) == renewals  # stopped on release
+        assert fake.data == {}
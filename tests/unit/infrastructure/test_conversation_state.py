@@ -0,0 +1,303 @@
+"""Unit tests for conversation load/commit round trips, batches and delta saves."""
+
+from typing import Any
+
+import pytest
+
+from app.ai.state import AIGraphState, Intent
+from app.infrastructure.redis.conversation_lock import (
+    ConversationLease,
+    StaleConversationWriteError,
+)
+from app.infrastructure.redis.conversation_state import (
+    ConversationCommit,
+    ConversationStateStore,
+)
+from app.infrastructure.redis.state_codec import StateCodec
+
+
+class FakePipeline:
+    """Buffers commands and applies them on execute()."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((name, args + tuple(kwargs.values())))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        self._redis.round_trips += 1
+        data = self._redis.data
+        results: list[Any] = []
+        for name, args in self._commands:
+            self._redis.commands.append(name)
+            if name == "get":
+                results.append(data.get(args[0]))
+            elif name == "hgetall":
+                results.append(dict(data.get(args[0], {})))
+            elif name == "setex":
+                key, ttl, value = args
+                data[key] = value
+                self._redis.ttls[key] = ttl
+                results.append(True)
+            elif name == "hset":
+                key, mapping = args
+                data.setdefault(key, {}).update(
+                    {field.encode(): value for field, value in mapping.items()}
+                )
+                self._redis.hset_fields.append(sorted(mapping))
+                results.append(len(mapping))
+            elif name == "expire":
+                self._redis.ttls[args[0]] = args[1]
+                results.append(args[0] in data)
+            elif name == "eval":
+                results.append(self._redis.fenced_commit(*args[2:]))
+            elif name == "delete":
+                results.append(sum(data.pop(key, None) is not None for key in args))
+            else:
+                results.append(None)
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in counting network round trips."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.ttls: dict[str, int] = {}
+        self.round_trips = 0
+        self.transactions: list[bool] = []
+        self.commands: list[str] = []
+        self.hset_fields: list[list[str]] = []
+
+    def fenced_commit(
+        self,
+        lock_key: str,
+        state_key: str,
+        blob_key: str,
+        confirmation_key: str,
+        token: int,
+        ttl: int,
+        drop_blob: int,
+        action: str,
+        payload: str,
+        confirmation_ttl: int,
+        *pairs: Any,
+    ) -> int:
+        """Python rendering of the fenced commit script."""
+        if self.data.get(lock_key) != str(token).encode():
+            return 0
+        if drop_blob:
+            self.data.pop(blob_key, None)
+        fields = self.data.setdefault(state_key, {})
+        for field, value in zip(pairs[::2], pairs[1::2], strict=True):
+            fields[field.encode()] = value
+        self.ttls[state_key] = ttl
+        if action == "set":
+            self.data[confirmation_key] = payload
+        elif action == "clear":
+            self.data.pop(confirmation_key, None)
+        return 1
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        self.transactions.append(transaction)
+        return FakePipeline(self)
+
+
+def _store() -> tuple[ConversationStateStore, FakeRedis]:
+    fake = FakeRedis()
+    store = ConversationStateStore(redis_client=fake)  # type: ignore[arg-type]
+    return store, fake
+
+
+class TestConversationRoundTrips:
+    """Tests for load_conversation / commit_conversation."""
+
+    async def test_commit_then_load_in_one_round_trip_each(self) -> None:
+        store, fake = _store()
+        state = AIGraphState(conversation_id="c1", intent=Intent.CREATE_BOLETO)
+
+        await store.commit_conversation(
+            "c1", state, pending_confirmation={"intent": "create_boleto"}
+        )
+        loaded = await store.load_conversation("c1")
+
+        assert fake.round_trips == 2
+        assert fake.transactions == [True, False]
+        assert loaded.state is not None
+        assert loaded.state.intent == Intent.CREATE_BOLETO
+        assert loaded.pending_confirmation == {"intent": "create_boleto"}
+
+    async def test_commit_clears_confirmation(self) -> None:
+        store, fake = _store()
+        state = AIGraphState(conversation_id="c1")
+        await store.commit_conversation("c1", state, pending_confirmation={"intent": "x"})
+
+        await store.commit_conversation("c1", state, clear_confirmation=True)
+        loaded = await store.load_conversation("c1")
+
+        assert loaded.state is not None
+        assert loaded.pending_confirmation is None
+
+    async def test_missing_conversation(self) -> None:
+        store, _ = _store()
+
+        loaded = await store.load_conversation("nope")
+
+        assert loaded.state is None
+        assert loaded.pending_confirmation is None
+
+
+class TestDeltaPersistence:
+    """Tests for hash-based, changed-fields-only saves."""
+
+    async def test_new_state_writes_every_field(self) -> None:
+        store, fake = _store()
+
+        await store.save_state("c1", AIGraphState(conversation_id="c1"))
+
+        assert "_v" in fake.hset_fields[0]
+        assert "conversation_id" in fake.hset_fields[0]
+
+    async def test_loaded_state_writes_only_changed_fields(self) -> None:
+        store, fake = _store()
+        await store.save_state("c1", AIGraphState(conversation_id="c1", user_input="oi"))
+
+        loaded = await store.load_state("c1")
+        assert loaded is not None
+        await store.save_state("c1", loaded.with_updates(response="olá"))
+        reloaded = await store.load_state("c1")
+
+        assert fake.hset_fields[-1] == ["response", "step_count"]
+        assert fake.commands[-4:-2] == ["hset", "expire"]
+        assert reloaded is not None
+        assert reloaded.response == "olá"
+        assert reloaded.user_input == "oi"
+
+    async def test_unchanged_state_only_refreshes_ttl(self) -> None:
+        store, fake = _store()
+        await store.save_state("c1", AIGraphState(conversation_id="c1"))
+        loaded = await store.load_state("c1")
+        assert loaded is not None
+        fake.commands.clear()
+
+        await store.save_state("c1", loaded, ttl_seconds=60)
+
+        assert fake.commands == ["expire"]
+        assert fake.ttls[f"{store.STATE_PREFIX}c1"] == 60
+
+    async def test_blob_state_is_read_and_rewritten_as_hash(self) -> None:
+        store, fake = _store()
+        state = AIGraphState(conversation_id="c1", intent=Intent.LIST_BOLETOS)
+        fake.data[f"{store.BLOB_STATE_PREFIX}c1"] = StateCodec().encode(state)
+
+        loaded = await store.load_state("c1")
+        assert loaded == state
+        assert loaded is not None
+        await store.save_state("c1", loaded.with_updates(response="ok"))
+
+        assert f"{store.BLOB_STATE_PREFIX}c1" not in fake.data
+        assert "_v" in fake.hset_fields[-1]
+
+    async def test_partial_hash_is_not_a_state(self) -> None:
+        store, fake = _store()
+        fake.data[f"{store.STATE_PREFIX}c1"] = {b"response": b"x"}
+
+        assert await store.load_state("c1") is None
+
+
+class TestFencedCommit:
+    """Tests for commits made under a conversation lease."""
+
+    async def test_commit_while_holding_lock(self) -> None:
+        store, fake = _store()
+        fake.data["ai:lock:c1"] = b"3"
+        lease = ConversationLease("c1", "ai:lock:c1", token=3, waited_ms=0.0)
+
+        await store.commit_conversation(
+            "c1",
+            AIGraphState(conversation_id="c1"),
+            pending_confirmation={"intent": "x"},
+            lease=lease,
+        )
+        loaded = await store.load_conversation("c1")
+
+        assert loaded.state is not None
+        assert loaded.pending_confirmation == {"intent": "x"}
+
+    async def test_commit_after_losing_lock_is_rejected(self) -> None:
+        store, fake = _store()
+        fake.data["ai:lock:c1"] = b"4"  # expired under us; a newer run holds it
+        lease = ConversationLease("c1", "ai:lock:c1", token=3, waited_ms=0.0)
+
+        with pytest.raises(StaleConversationWriteError):
+            await store.commit_conversation("c1", AIGraphState(conversation_id="c1"), lease=lease)
+
+        assert f"{store.STATE_PREFIX}c1" not in fake.data
+
+
+class TestBatch:
+    """Tests for load_states / commit_conversations."""
+
+    async def test_load_many_in_one_round_trip(self) -> None:
+        store, fake = _store()
+        await store.save_state("c1", AIGraphState(conversation_id="c1", user_input="a"))
+        await store.save_state("c2", AIGraphState(conversation_id="c2", user_input="b"))
+        fake.round_trips = 0
+
+        states = await store.load_states(["c1", "c2", "nope", "c1"])
+
+        assert fake.round_trips == 1
+        assert states["c1"] is not None and states["c1"].user_input == "a"
+        assert states["c2"] is not None and states["c2"].user_input == "b"
+        assert states["nope"] is None
+
+    async def test_commit_many_in_one_transaction(self) -> None:
+        store, fake = _store()
+        fake.data["ai:lock:c2"] = b"7"
+        lease = ConversationLease("c2", "ai:lock:c2", token=7, waited_ms=0.0)
+
+        committed = await store.commit_conversations(
+            [
+                ConversationCommit(
+                    "c1", AIGraphState(conversation_id="c1"), pending_confirmation={"intent": "x"}
+                ),
+                ConversationCommit("c2", AIGraphState(conversation_id="c2"), lease=lease),
+            ]
+        )
+
+        assert committed == [True, True]
+        assert fake.round_trips == 1
+        assert fake.transactions == [True]
+        assert (await store.load_conversation("c1")).pending_confirmation == {"intent": "x"}
+        assert await store.load_state("c2") is not None
+
+    async def test_stale_item_does_not_block_the_others(self) -> None:
+        store, fake = _store()
+        fake.data["ai:lock:c2"] = b"8"  # a newer run took c2 over
+        lease = ConversationLease("c2", "ai:lock:c2", token=7, waited_ms=0.0)
+
+        committed = await store.commit_conversations(
+            [
+                ConversationCommit("c1", AIGraphState(conversation_id="c1")),
+                ConversationCommit("c2", AIGraphState(conversation_id="c2"), lease=lease),
+            ]
+        )
+
+        assert committed == [True, False]
+        assert f"{store.STATE_PREFIX}c1" in fake.data
+        assert f"{store.STATE_PREFIX}c2" not in fake.data
@@ -0,0 +1,226 @@
+"""Unit tests for the inbound message stream and graph workers."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.infrastructure.redis import inbound_worker
+from app.infrastructure.redis.conversation_lock import ConversationBusyError
+from app.infrastructure.redis.inbound_worker import InboundWorker
+from app.infrastructure.redis.message_stream import (
+    InboundMessage,
+    MessageStream,
+    StreamEntry,
+)
+
+
+def _message(conversation_id: str = "c1", text: str = "oi") -> InboundMessage:
+    return InboundMessage(
+        conversation_id=conversation_id, tenant_id="t1", contact_id="ct1", text=text
+    )
+
+
+class FakeStream:
+    """Records acks and dead letters of one partition."""
+
+    partitions = 4
+
+    def __init__(self) -> None:
+        self.acked: list[str] = []
+        self.dead: list[tuple[str, str]] = []
+        self.claim_idle_ms: list[int] = []
+
+    async def ensure_group(self, partition: int) -> None:
+        pass
+
+    async def claim_pending(
+        self, partition: int, consumer: str, min_idle_ms: int, count: int = 100
+    ) -> list[StreamEntry]:
+        self.claim_idle_ms.append(min_idle_ms)
+        return []
+
+    async def ack(self, partition: int, entry_ids: list[str]) -> None:
+        self.acked.extend(entry_ids)
+
+    async def dead_letter(self, partition: int, entry: StreamEntry, error: str) -> None:
+        self.dead.append((entry[0], error))
+
+
+class FakeLeaseRedis:
+    """Owner leases plus the worker heartbeat set."""
+
+    def __init__(self, live_workers: int) -> None:
+        self.live_workers = live_workers
+        self.owners: dict[str, str] = {}
+        self.renewed: list[str] = []
+
+    def pipeline(self, transaction: bool = True) -> "FakeLeaseRedis":
+        return self
+
+    async def __aenter__(self) -> "FakeLeaseRedis":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        pass
+
+    def zadd(self, *args: Any) -> None:
+        pass
+
+    def zremrangebyscore(self, *args: Any) -> None:
+        pass
+
+    def zcard(self, *args: Any) -> None:
+        pass
+
+    async def execute(self) -> list[Any]:
+        return [1, 0, self.live_workers]
+
+    async def set(self, key: str, value: str, nx: bool, px: int) -> bool:
+        if key in self.owners:
+            return False
+        self.owners[key] = value
+        return True
+
+    async def eval(self, script: str, numkeys: int, key: str, owner: str, *args: Any) -> int:
+        if self.owners.get(key) != owner:
+            return 0
+        if args:  # renew
+            self.renewed.append(key)
+        else:  # release
+            del self.owners[key]
+        return 1
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(inbound_worker, "RETRY_DELAY_SECONDS", 0)
+
+
+def _worker(stream: FakeStream, handler: object, **kwargs: object) -> InboundWorker:
+    return InboundWorker(
+        stream=stream,  # type: ignore[arg-type]
+        handler=handler,  # type: ignore[arg-type]
+        worker_id="w1",
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+class TestInboundMessage:
+    """Tests for stream encoding and partitioning."""
+
+    def test_fields_round_trip(self) -> None:
+        message = _message(text="cobrar R$ 150 do João")
+        fields = {k.encode(): v.encode() for k, v in message.to_fields().items()}
+
+        assert InboundMessage.from_fields(fields) == message
+
+    def test_conversation_always_maps_to_same_partition(self) -> None:
+        stream = MessageStream(partitions=16)
+
+        partitions = {stream.partition_for("conversation-42") for _ in range(10)}
+
+        assert len(partitions) == 1
+        assert 0 <= partitions.pop() < 16
+
+
+class TestInboundWorker:
+    """Tests for in-order processing, acks and failure handling."""
+
+    async def test_batch_handled_in_order_then_acked(self) -> None:
+        stream = FakeStream()
+        seen: list[str] = []
+
+        async def handler(message: InboundMessage) -> None:
+            assert stream.acked == []  # nothing acked before the turn ran
+            seen.append(message.text)
+
+        entries = [("1-0", _message(text="a")), ("2-0", _message(text="b"))]
+        await _worker(stream, handler)._process(0, entries)
+
+        assert seen == ["a", "b"]
+        assert stream.acked == ["1-0", "2-0"]
+
+    async def test_failing_message_is_dead_lettered_after_retries(self) -> None:
+        stream = FakeStream()
+        calls = 0
+
+        async def handler(message: InboundMessage) -> None:
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("boom")
+
+        worker = _worker(stream, handler, max_attempts=3)
+        await worker._process(0, [("1-0", _message())])
+
+        assert calls == 3
+        assert stream.dead == [("1-0", "boom")]
+        assert stream.acked == ["1-0"]
+        assert worker.metrics.snapshot()["dead_lettered"] == 1
+
+    async def test_busy_conversation_is_retried(self) -> None:
+        stream = FakeStream()
+        attempts = 0
+
+        async def handler(message: InboundMessage) -> None:
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise ConversationBusyError(message.conversation_id, 0.0)
+
+        worker = _worker(stream, handler, max_attempts=1)
+        await worker._process(0, [("1-0", _message())])
+
+        assert attempts == 3
+        assert stream.dead == []
+        assert worker.metrics.snapshot()["processed"] == 1
+
+    async def test_busy_retries_are_capped(self) -> None:
+        stream = FakeStream()
+        attempts = 0
+
+        async def handler(message: InboundMessage) -> None:
+            nonlocal attempts
+            attempts += 1
+            raise ConversationBusyError(message.conversation_id, 0.0)
+
+        worker = _worker(stream, handler, max_attempts=1, max_busy_retries=2)
+        await worker._process(0, [("1-0", _message()), ("2-0", _message("c2"))])
+
+        assert attempts == 6
+        assert [entry_id for entry_id, _ in stream.dead] == ["1-0", "2-0"]
+        assert stream.acked == ["1-0", "2-0"]
+
+    async def test_handed_over_partition_keeps_lease_until_batch_done(self) -> None:
+        r = FakeLeaseRedis(live_workers=1)
+        worker = _worker(FakeStream(), None, redis_client=r)
+        batch_done = asyncio.Event()
+
+        async def busy() -> None:
+            await batch_done.wait()
+
+        for partition in range(4):
+            r.owners[inbound_worker._owner_key(partition)] = "w1"
+            worker._owned.add(partition)
+            worker._tasks[partition] = asyncio.create_task(busy())
+
+        r.live_workers = 4  # others joined: shrink to one partition
+        await worker._rebalance()
+        r.renewed.clear()
+        await worker._rebalance()
+
+        assert len(worker._owned) == 1
+        # Partitions mid-batch stay leased, so no other worker can claim them
+        assert len(r.renewed) == 4
+        assert not await r.set(inbound_worker._owner_key(3), "w2", nx=True, px=1)
+        batch_done.set()
+        await asyncio.gather(*worker._tasks.values())
+
+    async def test_new_owner_claims_only_entries_idle_for_a_lease(self) -> None:
+        stream = FakeStream()
+        r = FakeLeaseRedis(live_workers=1)
+        worker = _worker(stream, None, redis_client=r, lease_ttl_ms=15000)
+
+        await worker._consume(0)  # not owned: claims, then exits
+
+        assert stream.claim_idle_ms == [15000]
@@ -0,0 +1,47 @@
+"""Unit tests for latency histograms."""
+
+from app.infrastructure.observability import HistogramRegistry, LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_empty_snapshot(self) -> None:
+        snapshot = LatencyHistogram().snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["p95_ms"] == 0.0
+
+    def test_buckets_are_cumulative(self) -> None:
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        for value in (1, 5, 50, 500):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["buckets"] == {"le_10": 2, "le_100": 3, "le_inf": 4}
+        assert snapshot["max_ms"] == 500
+        assert snapshot["sum_ms"] == 556
+
+    def test_percentiles_use_bucket_bounds(self) -> None:
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        for _ in range(95):
+            histogram.observe(3)
+        for _ in range(5):
+            histogram.observe(80)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["p50_ms"] == 10
+        assert snapshot["p99_ms"] == 80
+
+
+class TestHistogramRegistry:
+    """Tests for HistogramRegistry."""
+
+    def test_histograms_created_on_first_use(self) -> None:
+        registry = HistogramRegistry()
+        registry.observe("b", 1)
+        registry.observe("a", 2)
+
+        assert list(registry.snapshot()) == ["a", "b"]
@@ -0,0 +1,93 @@
+"""Unit tests for the LLM result cache (in-process tier)."""
+
+from app.application.ports.providers.llm import (
+    ExtractedEntitiesResult,
+    IntentClassificationResult,
+    LLMErrorCode,
+    LLMProviderPort,
+)
+from app.infrastructure.providers.llm_cache import CachingLLMProvider
+
+
+class CountingProvider(LLMProviderPort):
+    """Returns a fixed classification and counts upstream calls."""
+
+    def __init__(self, result: IntentClassificationResult) -> None:
+        self.result = result
+        self.calls = 0
+
+    async def classify_intent(self, text: str) -> IntentClassificationResult:
+        self.calls += 1
+        return self.result
+
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
+        self.calls += 1
+        return ExtractedEntitiesResult(success=True, boleto_id="abc")
+
+
+def _cached(inner: LLMProviderPort, prompt_version: str = "v1") -> CachingLLMProvider:
+    return CachingLLMProvider(
+        inner=inner,
+        redis_client=None,
+        prompt_version=prompt_version,
+        model_name="test-model",
+    )
+
+
+class TestCachingLLMProvider:
+    """Tests for CachingLLMProvider."""
+
+    async def test_repeated_input_hits_cache(self) -> None:
+        inner = CountingProvider(
+            IntentClassificationResult(success=True, intent="list_boletos", confidence=0.9)
+        )
+        provider = _cached(inner)
+
+        first = await provider.classify_intent("meus boletos")
+        second = await provider.classify_intent("meus boletos")
+
+        assert inner.calls == 1
+        assert second == first
+
+    async def test_low_confidence_is_not_cached(self) -> None:
+        inner = CountingProvider(
+            IntentClassificationResult(success=True, intent="unknown", confidence=0.3)
+        )
+        provider = _cached(inner)
+
+        await provider.classify_intent("hmm")
+        await provider.classify_intent("hmm")
+
+        assert inner.calls == 2
+
+    async def test_failures_are_not_cached(self) -> None:
+        inner = CountingProvider(
+            IntentClassificationResult(success=False, error_code=LLMErrorCode.TIMEOUT)
+        )
+        provider = _cached(inner)
+
+        await provider.classify_intent("status")
+        await provider.classify_intent("status")
+
+        assert inner.calls == 2
+
+    async def test_entities_keyed_by_intent(self) -> None:
+        inner = CountingProvider(IntentClassificationResult(success=True))
+        provider = _cached(inner)
+
+        await provider.extract_entities("boleto abc", "check_status")
+        await provider.extract_entities("boleto abc", "cancel_boleto")
+        await provider.extract_entities("boleto abc", "check_status")
+
+        assert inner.calls == 2
+
+    async def test_entities_keyed_by_local_day(self) -> None:
+        inner = CountingProvider(IntentClassificationResult(success=True))
+        provider = _cached(inner)
+
+        await provider.extract_entities("vence amanhã", "create_boleto")
+        provider._today = lambda: "2099-01-02"  # type: ignore[method-assign]
+        await provider.extract_entities("vence amanhã", "create_boleto")
+        await provider.extract_entities("vence amanhã", "create_boleto")
+
+        assert inner.calls == 2
@@ -0,0 +1,146 @@
+"""Unit tests for the LLM resilience layer."""
+
+import asyncio
+
+import httpx
+
+from app.application.ports.providers.llm import (
+    ExtractedEntitiesResult,
+    IntentClassificationResult,
+    LLMErrorCode,
+    LLMProviderPort,
+)
+from app.infrastructure.providers.gemini_llm import GeminiLLMProvider
+from app.infrastructure.providers.llm_resilience import (
+    BreakerState,
+    CircuitBreaker,
+    ResilientLLMProvider,
+    hedged,
+    latency_budget,
+)
+
+
+class FailingProvider(LLMProviderPort):
+    """Always times out; counts upstream calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def classify_intent(self, text: str) -> IntentClassificationResult:
+        self.calls += 1
+        return IntentClassificationResult(success=False, error_code=LLMErrorCode.TIMEOUT)
+
+    async def extract_entities(self, text: str, intent: str) -> ExtractedEntitiesResult:
+        self.calls += 1
+        return ExtractedEntitiesResult(success=True)
+
+
+class TimingOutClient:
+    """httpx client stand-in whose requests always time out."""
+
+    async def post(self, url: str, **kwargs: object) -> httpx.Response:
+        raise httpx.ReadTimeout("timed out")
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        breaker = CircuitBreaker("test-open", failure_threshold=2)
+
+        breaker.record_failure()
+        assert breaker.state == BreakerState.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == BreakerState.OPEN
+        assert breaker.allow() is False
+
+    def test_half_open_allows_single_probe(self) -> None:
+        breaker = CircuitBreaker("test-probe", failure_threshold=1, reset_timeout_seconds=0)
+        breaker.record_failure()
+
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == BreakerState.CLOSED
+
+
+class TestResilientLLMProvider:
+    """Tests for ResilientLLMProvider."""
+
+    async def test_fails_fast_when_open(self) -> None:
+        inner = FailingProvider()
+        provider = ResilientLLMProvider(inner, CircuitBreaker("test-fast", failure_threshold=2))
+
+        for _ in range(4):
+            result = await provider.classify_intent("status")
+
+        assert inner.calls == 2
+        assert result.error_code == LLMErrorCode.CIRCUIT_OPEN
+
+    async def test_exhausted_budget_skips_upstream(self) -> None:
+        inner = FailingProvider()
+        provider = ResilientLLMProvider(inner, CircuitBreaker("test-budget"))
+
+        with latency_budget(0):
+            result = await provider.extract_entities("x", "check_status")
+
+        assert inner.calls == 0
+        assert result.error_code == LLMErrorCode.BUDGET_EXHAUSTED
+
+    async def test_budget_exhaustion_does_not_open_breaker(self) -> None:
+        breaker = CircuitBreaker("test-budget-breaker", failure_threshold=2)
+        provider = ResilientLLMProvider(
+            GeminiLLMProvider(api_key="k", timeout_seconds=5, client=TimingOutClient()),  # type: ignore[arg-type]
+            breaker,
+        )
+
+        for _ in range(3):
+            with latency_budget(1):
+                result = await provider.classify_intent("status")
+
+        assert result.error_code == LLMErrorCode.BUDGET_EXHAUSTED
+        assert breaker.state == BreakerState.CLOSED
+
+    async def test_upstream_timeout_opens_breaker(self) -> None:
+        breaker = CircuitBreaker("test-timeout-breaker", failure_threshold=2)
+        provider = ResilientLLMProvider(
+            GeminiLLMProvider(api_key="k", timeout_seconds=5, client=TimingOutClient()),  # type: ignore[arg-type]
+            breaker,
+        )
+
+        for _ in range(2):
+            result = await provider.classify_intent("status")
+
+        assert result.error_code == LLMErrorCode.TIMEOUT
+        assert breaker.state == BreakerState.OPEN
+
+
+class TestHedged:
+    """Tests for hedged requests."""
+
+    async def test_fast_call_is_not_hedged(self) -> None:
+        calls = 0
+
+        async def fn() -> str:
+            nonlocal calls
+            calls += 1
+            return "ok"
+
+        assert await hedged(fn, delay_seconds=1.0) == "ok"
+        assert calls == 1
+
+    async def test_slow_first_attempt_loses_to_hedge(self) -> None:
+        calls = 0
+
+        async def fn() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+                return "slow"
+            return "fast"
+
+        assert await hedged(fn, delay_seconds=0.01) == "fast"
+        assert calls == 2
@@ -0,0 +1,81 @@
+"""Unit tests for the conversation state near cache."""
+
+from app.ai.state import AIGraphState
+from app.infrastructure.redis.near_cache import NearCache
+
+
+def _cache(**kwargs: object) -> NearCache:
+    cache = NearCache(**kwargs)  # type: ignore[arg-type]
+    cache.enable()
+    return cache
+
+
+class TestNearCache:
+    """Tests for NearCache."""
+
+    def test_hit_returns_same_state(self) -> None:
+        cache = _cache()
+        state = AIGraphState(conversation_id="c1")
+
+        cache.put("c1", state)
+
+        assert cache.get("c1") is state
+        assert cache.stats()["hits"] == 1
+
+    def test_bypassed_until_enabled(self) -> None:
+        cache = NearCache()
+
+        cache.put("c1", AIGraphState(conversation_id="c1"))
+
+        assert cache.get("c1") is None
+
+    def test_invalidation_during_read_drops_fill(self) -> None:
+        cache = _cache()
+        epoch = cache.epoch
+
+        cache.invalidate("c1")  # another replica wrote while we read Redis
+        cache.put("c1", AIGraphState(conversation_id="c1"), epoch)
+
+        assert cache.get("c1") is None
+
+    def test_hit_under_lease_only_if_it_directly_follows_the_entry(self) -> None:
+        cache = _cache()
+        state = AIGraphState(conversation_id="c1")
+
+        cache.put("c1", state, token=4)  # committed under token 4
+
+        assert cache.get("c1", token=5) is state
+        # Token 6: another replica held the lock (token 5) after our commit
+        assert cache.get("c1", token=6) is None
+        assert cache.stats()["fence_misses"] == 1
+
+    def test_unfenced_entry_is_a_miss_under_lease(self) -> None:
+        cache = _cache()
+        cache.put("c1", AIGraphState(conversation_id="c1"))
+
+        assert cache.get("c1", token=1) is None
+        assert cache.get("c1") is not None
+
+    def test_disconnect_clears_cache(self) -> None:
+        cache = _cache()
+        cache.put("c1", AIGraphState(conversation_id="c1"))
+
+        cache.disable()
+        cache.enable()
+
+        assert cache.get("c1") is None
+
+    def test_lru_bound(self) -> None:
+        cache = _cache(max_entries=2)
+        for cid in ("a", "b", "c"):
+            cache.put(cid, AIGraphState(conversation_id=cid))
+
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entry_is_a_miss(self) -> None:
+        cache = _cache(ttl_seconds=0)
+        cache.put("c1", AIGraphState(conversation_id="c1"))
+
+        assert cache.get("c1") is None
@@ -0,0 +1,157 @@
+"""Unit tests for the outbox LISTEN/NOTIFY dispatcher."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from app.infrastructure.celery import outbox_dispatcher
+from app.infrastructure.celery.outbox_dispatcher import OutboxDispatcher
+
+
+class FakeConnection:
+    """asyncpg connection stand-in; health checks can be made to fail."""
+
+    def __init__(self, healthy: bool = True) -> None:
+        self.healthy = healthy
+        self.listeners: dict[str, Callable[..., None]] = {}
+        self.queries: list[str] = []
+        self.closed = False
+
+    async def add_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self.listeners[channel] = callback
+
+    @property
+    def health_checks(self) -> int:
+        return len(self.queries)
+
+    async def execute(self, query: str) -> None:
+        self.queries.append(query)
+        if not self.healthy:
+            raise ConnectionResetError("connection lost")
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def notify(self) -> None:
+        for callback in self.listeners.values():
+            callback(self, 1, "message_outbox_due", "")
+
+
+class FakeConnect:
+    """Hands out the queued connections (or raises queued errors)."""
+
+    def __init__(self, *outcomes: FakeConnection | Exception) -> None:
+        self.outcomes = list(outcomes)
+        self.attempts = 0
+
+    async def __call__(self, _dsn: str) -> FakeConnection:
+        self.attempts += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def _fast_timers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(outbox_dispatcher, "HEALTH_CHECK_SECONDS", 0.01)
+    monkeypatch.setattr(outbox_dispatcher, "RECONNECT_DELAY_SECONDS", 0)
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+    async with asyncio.timeout(1):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+async def _run(
+    monkeypatch: pytest.MonkeyPatch, connect: FakeConnect, scenario: Callable[..., Any]
+) -> OutboxDispatcher:
+    """Run a dispatcher against `connect` while `scenario` drives it."""
+    monkeypatch.setattr(outbox_dispatcher.asyncpg, "connect", connect)
+    triggers: list[None] = []
+    dispatcher = OutboxDispatcher(
+        dsn="postgresql://test", trigger=lambda: triggers.append(None), debounce_seconds=0.01
+    )
+    stop = asyncio.Event()
+    task = asyncio.create_task(dispatcher.run(stop))
+    try:
+        await scenario(dispatcher)
+    finally:
+        stop.set()
+        await asyncio.wait_for(task, timeout=1)
+    assert len(triggers) == dispatcher.dispatches
+    return dispatcher
+
+
+class TestOutboxDispatcher:
+    """Tests for OutboxDispatcher.run."""
+
+    async def test_notification_burst_triggers_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        conn = FakeConnection()
+
+        async def scenario(dispatcher: OutboxDispatcher) -> None:
+            # Catch-up trigger on connect
+            await _until(lambda: dispatcher.dispatches == 1)
+            for _ in range(3):
+                conn.notify()
+            await _until(lambda: dispatcher.dispatches == 2)
+            await asyncio.sleep(0.05)
+
+        dispatcher = await _run(monkeypatch, FakeConnect(conn), scenario)
+
+        assert dispatcher.notifications == 3
+        assert dispatcher.dispatches == 2
+
+    async def test_idle_listener_is_health_checked(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        conn = FakeConnection()
+
+        async def scenario(_dispatcher: OutboxDispatcher) -> None:
+            await _until(lambda: conn.health_checks >= 2)
+
+        dispatcher = await _run(monkeypatch, FakeConnect(conn), scenario)
+
+        assert dispatcher.dispatches == 1
+        assert set(conn.queries) == {"SELECT 1"}
+        assert conn.closed
+
+    async def test_lost_connection_reconnects_and_catches_up(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        lost, fresh = FakeConnection(healthy=False), FakeConnection()
+        connect = FakeConnect(OSError("refused"), lost, fresh)
+
+        async def scenario(_dispatcher: OutboxDispatcher) -> None:
+            await _until(lambda: fresh.health_checks >= 1)
+
+        dispatcher = await _run(monkeypatch, connect, scenario)
+
+        assert connect.attempts == 3
+        assert lost.closed
+        # One catch-up trigger per successful connect
+        assert dispatcher.dispatches == 2
+
+    async def test_failed_trigger_does_not_stop_listener(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(outbox_dispatcher.asyncpg, "connect", FakeConnect(FakeConnection()))
+        calls = 0
+
+        def trigger() -> None:
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("broker down")
+
+        dispatcher = OutboxDispatcher(dsn="postgresql://test", trigger=trigger, debounce_seconds=0)
+        stop = asyncio.Event()
+        task = asyncio.create_task(dispatcher.run(stop))
+        await _until(lambda: calls == 1)
+        stop.set()
+        await asyncio.wait_for(task, timeout=1)
+
+        assert dispatcher.dispatches == 0
@@ -0,0 +1,97 @@
+"""Unit tests for the process-wide Redis pool and its checkout metrics."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+import redis.asyncio as redis
+
+from app.config.settings import Settings
+from app.infrastructure.redis import client
+from app.infrastructure.redis.client import (
+    InstrumentedBlockingPool,
+    close_redis,
+    get_redis_pool_stats,
+    init_redis,
+)
+
+
+async def _connected(_connection: object) -> None:
+    """Stand-in for ensure_connection; pooled connections never dial out."""
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_pool() -> AsyncIterator[None]:
+    await close_redis()
+    yield
+    await close_redis()
+
+
+def _pool(max_connections: int = 1, timeout: float = 1.0) -> InstrumentedBlockingPool:
+    settings = Settings(redis_max_connections=max_connections, redis_pool_timeout_seconds=timeout)
+    pool = init_redis(settings).connection_pool
+    pool.ensure_connection = _connected  # type: ignore[method-assign]
+    return pool
+
+
+class TestInstrumentedBlockingPool:
+    """Tests for pool checkout wait metrics."""
+
+    async def test_waiting_checkout_is_recorded(self) -> None:
+        pool = _pool()
+        held = await pool.get_connection()
+        waiter = asyncio.create_task(pool.get_connection())
+        await asyncio.sleep(0.05)
+
+        await pool.release(held)
+        await waiter
+
+        stats = get_redis_pool_stats()
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 0
+        assert stats["wait_time_max_ms"] >= 40
+        assert stats["wait_time_total_ms"] >= stats["wait_time_max_ms"]
+        assert stats["in_use"] == 1
+
+    async def test_exhausted_pool_counts_timeout(self) -> None:
+        pool = _pool(timeout=0.01)
+        await pool.get_connection()
+
+        with pytest.raises(redis.ConnectionError):
+            await pool.get_connection()
+
+        stats = get_redis_pool_stats()
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["in_use"] == 1
+
+
+class TestRedisLifecycle:
+    """Tests for init_redis / close_redis."""
+
+    async def test_init_is_idempotent(self) -> None:
+        first = init_redis(Settings(redis_max_connections=3))
+
+        assert init_redis() is first
+        assert client.get_redis() is first
+        stats = get_redis_pool_stats()
+        assert stats["initialized"]
+        assert stats["max_connections"] == 3
+
+    async def test_close_is_idempotent_and_resets_metrics(self) -> None:
+        pool = _pool()
+        await pool.get_connection()
+
+        await close_redis()
+        await close_redis()
+
+        stats = get_redis_pool_stats()
+        assert not stats["initialized"]
+        assert stats["checkouts"] == 0
+        assert stats["max_connections"] == 0
+
+    async def test_init_after_close_creates_new_client(self) -> None:
+        first = init_redis(Settings())
+        await close_redis()
+
+        assert init_redis(Settings()) is not first
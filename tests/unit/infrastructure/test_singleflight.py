@@ -0,0 +1,76 @@
+"""Unit tests for in-process request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.infrastructure.providers.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight without Redis."""
+
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        singleflight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def upstream() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "ok"
+
+        waiters = [asyncio.create_task(singleflight.do("same-prompt", upstream)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["ok"] * 5
+        assert calls == 1
+
+    async def test_sequential_calls_are_not_coalesced(self) -> None:
+        singleflight = SingleFlight()
+        calls = 0
+
+        async def upstream() -> str:
+            nonlocal calls
+            calls += 1
+            return "ok"
+
+        await singleflight.do("k", upstream)
+        await singleflight.do("k", upstream)
+
+        assert calls == 2
+
+    async def test_errors_propagate_to_all_waiters(self) -> None:
+        singleflight = SingleFlight()
+
+        async def upstream() -> str:
+            await asyncio.sleep(0)
+            raise TimeoutError("slow")
+
+        results = await asyncio.gather(
+            singleflight.do("k", upstream),
+            singleflight.do("k", upstream),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, TimeoutError) for r in results)
+
+    async def test_cancelled_waiter_does_not_cancel_others(self) -> None:
+        singleflight = SingleFlight()
+        release = asyncio.Event()
+
+        async def upstream() -> str:
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(singleflight.do("k", upstream))
+        second = asyncio.create_task(singleflight.do("k", upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first
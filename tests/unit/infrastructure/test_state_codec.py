@@ -0,0 +1,91 @@
+"""Unit tests for the conversation state codec."""
+
+import json
+
+import pytest
+
+from app.ai.state import AIGraphState, ConfirmationStatus, ExtractedEntities, Intent
+from app.infrastructure.redis.state_codec import FLAG_COMPRESSED, SCHEMA_VERSION, StateCodec
+
+
+def _state(**overrides: object) -> AIGraphState:
+    return AIGraphState(
+        conversation_id="c1",
+        tenant_id="t1",
+        user_input="cobrar R$ 150 do João dia 10",
+        intent=Intent.CREATE_BOLETO,
+        intent_confidence=1.0,
+        entities=ExtractedEntities(
+            contact_name="João", amount_cents=15000, raw={"rule": "create_boleto"}
+        ),
+        confirmation_status=ConfirmationStatus.PENDING,
+        step_count=5,
+        last_completed_node="check_confirmation",
+    ).with_updates(**overrides)
+
+
+class TestStateCodec:
+    """Tests for StateCodec round trips and legacy reads."""
+
+    def test_json_round_trip(self) -> None:
+        codec = StateCodec(payload_format="json")
+        state = _state()
+
+        blob = codec.encode(state)
+
+        assert blob[0] == SCHEMA_VERSION
+        assert codec.decode(blob) == state
+
+    def test_msgpack_round_trip(self) -> None:
+        pytest.importorskip("msgpack")
+        codec = StateCodec(payload_format="msgpack")
+        state = _state()
+
+        assert codec.decode(codec.encode(state)) == state
+
+    def test_large_state_is_compressed(self) -> None:
+        codec = StateCodec(payload_format="json", compress_min_bytes=256)
+        state = _state(response="x" * 2000)
+
+        blob = codec.encode(state)
+
+        assert blob[1] & FLAG_COMPRESSED
+        assert len(blob) < 1000
+        assert codec.decode(blob).response == state.response
+
+    def test_reads_legacy_json(self) -> None:
+        legacy = json.dumps(
+            {
+                "conversation_id": "c1",
+                "intent": "cancel_boleto",
+                "entities": {"boleto_id": "abc", "raw": {}},
+                "confirmation_status": "pending",
+                "created_at": "2026-03-15T10:00:00+00:00",
+                "step_count": 3,
+            }
+        )
+
+        state = StateCodec().decode(legacy.encode())
+
+        assert state.intent == Intent.CANCEL_BOLETO
+        assert state.entities.boleto_id == "abc"
+        assert state.confirmation_status == ConfirmationStatus.PENDING
+
+    def test_unknown_version_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            StateCodec().decode(bytes((99, 1)) + b"[]")
+
+    def test_hash_fields_round_trip(self) -> None:
+        codec = StateCodec(payload_format="json")
+        state = _state()
+
+        mapping = codec.encode_fields(state)
+        decoded = codec.decode_fields({name.encode(): value for name, value in mapping.items()})
+
+        assert decoded == state
+
+    def test_delta_fields_only(self) -> None:
+        mapping = StateCodec().encode_fields(_state(), ["response"])
+
+        assert list(mapping) == ["response"]
+        assert StateCodec().decode_fields({b"response": mapping["response"]}) is None